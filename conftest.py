@@ -1,53 +1,528 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import pytest
-import platform
-import os
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from page_objects.base_page import BasePage
+from page_objects.router import PageRouter
+from utilities import metrics
+from utilities.asset_registry import assets as asset_registry
+from utilities.browser_matrix import BrowserMatrixReport, parse_browsers, parse_worker_limits
+from utilities.budgets import BudgetBaseline, BudgetPlugin
+from utilities.command_timing import CommandTimingReport, instrument
+from utilities.driver_factory import create_driver
+from utilities.driver_pool import DriverPool
+from utilities.failure_artifacts import FailureArtifacts
+from utilities.lazy_driver import LazyDriver
+from utilities.launch_profiles import LaunchStats, default_profile_name, get_profile, load_config
+from utilities.driver_resolver import DriverResolutionError, ResolvedDriver, browser_installed, resolve_drivers
+from utilities.network_proxy import FilteringProxy, load_policy
+from utilities.reruns import RECYCLE_SESSION, FlakeHistory, TransientReruns
+from utilities.result_stream import DEFAULT_STREAM, ResultStream
+from utilities.scheduling import DurationHistory, WorkerUtilisation
+from utilities.session_broker import BrokerClient, BrokerError, BrokerProcess, BrokerReport
+from utilities.site_archive import DEFAULT_ARCHIVE, SITE_HOST, SiteArchive, SiteServer
+from utilities.startup_timing import LAZY_DRIVER, StartupTiming
+from utilities.test_impact import ImpactError, ImpactMap, ImpactTracker
+from utilities.upload_benchmark import RESULTS_DIR as UPLOAD_BENCHMARK_DIR, UploadBenchmarkReport
 
-# WebDriver Manager config for Mac ARM 64
-os.environ["WDM_ARCHITECTURE"] = "arm64" if platform.processor() == "arm" else "x64"
+CONFIG = load_config()
 
-@pytest.fixture()
-def driver(request):
-    browser = request.config.getoption("--browser")
-    print(f"Creating driver for {browser}")
-    
-    if browser == "edge":
-        options = webdriver.EdgeOptions()
-        driver = webdriver.Edge(
-            service=EdgeService(EdgeChromiumDriverManager().install()),
-            options=options
-        )
-    elif browser == "firefox":
-        options = webdriver.FirefoxOptions()
-        driver = webdriver.Firefox(
-            service=FirefoxService(GeckoDriverManager().install()),
-            options=options
-        )
-    elif browser == "chrome":
-        options = webdriver.ChromeOptions()
-        driver = webdriver.Chrome(
-            service=ChromeService(ChromeDriverManager().install()),
-            options=options
+# pytester runs small throwaway test suites for the unit tests of the framework's own plugins
+pytest_plugins = ["pytester"]
+
+try:
+    from pytest_html import extras as html_extras
+except ImportError:
+    html_extras = None
+
+# Browser backends and webdriver_manager are imported on first use, see utilities.driver_factory
+CONFTEST_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+
+def pytest_configure(config):
+    base_url = config.getoption("--base-url")
+    BasePage.base_url = base_url if base_url.endswith("/") else base_url + "/"
+    try:
+        config.launch_profile = get_profile(config.getoption("--launch-profile") or default_profile_name(CONFIG))
+    except ValueError as error:
+        raise pytest.UsageError(str(error))
+    config.launch_stats = LaunchStats()
+    config.network_policy = None
+    policy_name, throttle_name = config.getoption("--network-policy"), config.getoption("--network-throttle")
+    if policy_name or throttle_name:
+        # In record/replay mode the browser reaches the site on the local SiteServer, which is $BASE_HOST then
+        site_url = BasePage.base_url if config.getoption("--site-mode") == "live" else f"http://{SITE_HOST}/"
+        try:
+            config.network_policy = load_policy(policy_name or "open", CONFIG, site_url, throttle_name)
+        except ValueError as error:
+            raise pytest.UsageError(str(error))
+    try:
+        config.browsers = parse_browsers(config.getoption("--browser"))
+        worker_limits = parse_worker_limits(config.getoption("--browser-workers"), config.browsers)
+    except ValueError as error:
+        raise pytest.UsageError(str(error))
+
+    baseline_path = config.getoption("--budget-baseline")
+    if config.getoption("--budget-record") and not baseline_path:
+        raise pytest.UsageError("--budget-record needs --budget-baseline FILE")
+    config.budgets = BudgetPlugin(
+        soft=config.getoption("--budget-mode") == "soft",
+        baseline=BudgetBaseline(baseline_path, config.getoption("--budget-drift")) if baseline_path else None,
+        record=config.getoption("--budget-record"),
+    )
+    config.pluginmanager.register(config.budgets, "budgets")
+    try:
+        # Workers select their own tests, so they work out the impacted ones as well
+        config.pluginmanager.register(ImpactTracker(
+            ImpactMap(config.getoption("--impact-map")), config.getoption("--impacted-since")
+        ), "test_impact")
+    except ImpactError as error:
+        raise pytest.UsageError(f"--impacted-since: {error}")
+    config.pluginmanager.register(TransientReruns(
+        config, config.getoption("--reruns"), config.getoption("--rerun-budget"),
+        FlakeHistory(config.getoption("--flake-history")),
+    ), "transient_reruns")
+    if not config.getoption("--no-results-stream"):
+        config.pluginmanager.register(ResultStream(config, config.getoption("--results-jsonl")), "result_stream")
+    if not config.getoption("--no-failure-artifacts"):
+        # Captured on whichever process runs the test, xdist workers included
+        config.pluginmanager.register(FailureArtifacts(
+            config.getoption("--artifacts-dir"), config.getoption("htmlpath", None)
+        ), "failure_artifacts")
+    config.pluginmanager.register(StartupTiming(CONFTEST_IMPORT_SECONDS), "startup_timing")
+
+    if hasattr(config, "workerinput"):
+        # xdist workers reuse what the controller resolved instead of querying webdriver_manager again
+        config.resolved_drivers = {
+            browser: ResolvedDriver.from_dict(data)
+            for browser, data in config.workerinput["resolved_drivers"].items()
+        }
+        config.driver_resolution_errors = config.workerinput["driver_resolution_errors"]
+        config.missing_browsers = config.workerinput["missing_browsers"]
+        config.session_broker = config.workerinput["session_broker"]
+        return
+
+    if config.getoption("--instrument-commands"):
+        config.pluginmanager.register(CommandTimingReport(config.getoption("--commands-json")), "command_timing")
+    config.pluginmanager.register(WorkerUtilisation(
+        DurationHistory(config.getoption("--durations-history")),
+        config.browsers,
+        longest_first=config.getoption("--scheduler") == "lpt",
+        limits=worker_limits,
+    ), "worker_utilisation")
+    if config.getoption("--upload-benchmark"):
+        config.pluginmanager.register(UploadBenchmarkReport(
+            config.getoption("--upload-benchmark-dir"), config.browsers, config.launch_profile.name
+        ), "upload_benchmark")
+
+    # A single --browser always runs, a browser missing from a matrix only has its tests skipped
+    config.missing_browsers = [
+        browser for browser in config.browsers if len(config.browsers) > 1 and not browser_installed(browser)
+    ]
+    if len(config.browsers) > 1:
+        config.pluginmanager.register(BrowserMatrixReport(config.browsers, config.missing_browsers), "browser_matrix")
+
+    config.resolved_drivers = {}
+    config.driver_resolution_errors = {}
+    config.session_broker = config.getoption("--session-broker")
+    if (config.session_broker or config.getoption("--broker-sessions")) and (
+            config.getoption("--network-policy") or config.getoption("--network-throttle")):
+        raise pytest.UsageError("Brokered sessions cannot go through the --network-policy/--network-throttle proxy")
+    if config.option.collectonly:
+        return
+    pool_size = config.getoption("--broker-sessions")
+    # xdist workers and the broker need the driver paths up front, a plain run resolves them
+    # once collection shows a selected test uses a browser (-m unit runs never touch webdriver_manager)
+    if getattr(config.option, "dist", "no") != "no" or (pool_size and not config.session_broker):
+        _resolve_browsers(config)
+
+    if pool_size and not config.session_broker:
+        browsers = [browser for browser in config.resolved_drivers if browser not in config.missing_browsers]
+        browsers += ["fake"] if "fake" in config.browsers else []
+        try:
+            # Started before collection so the first sessions warm up while tests are collected
+            broker = BrokerProcess(
+                dict.fromkeys(browsers, pool_size),
+                {browser: config.resolved_drivers[browser].path for browser in browsers if browser != "fake"},
+                config.launch_profile.name,
+            )
+        except BrokerError as error:
+            raise pytest.UsageError(error.msg)
+        config.pluginmanager.register(broker, "session_broker_process")
+        config.session_broker = broker.url
+    if config.session_broker:
+        config.pluginmanager.register(BrokerReport(config.session_broker), "session_broker")
+
+
+def _resolve_browsers(config):
+    config.drivers_resolved = True
+    for browser in config.browsers:
+        if browser in config.missing_browsers:
+            continue
+        try:
+            config.resolved_drivers.update(resolve_drivers(
+                [browser],
+                offline=config.getoption("--offline"),
+                update_lock=config.getoption("--update-driver-lock"),
+            ))
+        except DriverResolutionError as error:
+            # Only tests that actually launch this browser should fail on this
+            config.driver_resolution_errors[browser] = str(error)
+
+
+def pytest_collection_finish(session):
+    config = session.config
+    if hasattr(config, "workerinput") or config.option.collectonly or getattr(config, "drivers_resolved", False):
+        return
+    if any("driver_pool" in getattr(item, "fixturenames", ()) for item in session.items):
+        _resolve_browsers(config)
+
+
+def pytest_generate_tests(metafunc):
+    """Run every browser test once per --browser value when more than one is given"""
+    browsers = metafunc.config.browsers
+    if len(browsers) > 1 and "browser" in metafunc.fixturenames:
+        metafunc.parametrize("browser", browsers, indirect=True)
+
+
+def pytest_collection_modifyitems(config, items):
+    skips = {}
+    if not config.getoption("--upload-benchmark"):
+        skips["benchmark"] = pytest.mark.skip(reason="upload benchmarks only run with --upload-benchmark")
+    if config.getoption("--locator-max-ms") is None:
+        skips["locator_latency"] = pytest.mark.skip(reason="the locator latency check only runs with --locator-max-ms")
+    for item in items:
+        for marker, skip in skips.items():
+            if item.get_closest_marker(marker) is not None:
+                item.add_marker(skip)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["resolved_drivers"] = {
+        browser: resolved.to_dict() for browser, resolved in node.config.resolved_drivers.items()
+    }
+    node.workerinput["driver_resolution_errors"] = node.config.driver_resolution_errors
+    node.workerinput["missing_browsers"] = node.config.missing_browsers
+    node.workerinput["session_broker"] = node.config.session_broker
+
+
+def pytest_sessionfinish(session):
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput["launch_startups"] = session.config.launch_stats.startups
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    for profile, samples in getattr(node, "workeroutput", {}).get("launch_startups", {}).items():
+        for seconds in samples:
+            node.config.launch_stats.record_startup(profile, seconds)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    metrics.start(item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if call.when != "call":
+        return
+    test_metrics = metrics.current()
+    report.user_properties.extend(test_metrics.to_properties())
+    if html_extras is not None and (test_metrics.waits or test_metrics.commands or test_metrics.requests
+                                    or test_metrics.cache_hits or test_metrics.cache_misses):
+        report.extra = getattr(report, "extra", []) + [html_extras.html(test_metrics.to_html())]
+
+
+def _call_reports(terminalreporter):
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            if getattr(report, "when", None) == "call":
+                yield report
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if hasattr(config, "workerinput"):
+        return
+    slowest_waits = [
+        (wait["seconds"], report.nodeid, wait["wait"])
+        for report in _call_reports(terminalreporter)
+        for wait in dict(report.user_properties).get("slowest_waits", [])
+    ]
+    if slowest_waits:
+        terminalreporter.section("slowest waits")
+        for seconds, nodeid, wait in sorted(slowest_waits, reverse=True)[:5]:
+            terminalreporter.write_line(f"{seconds:.3f}s {nodeid} {wait}")
+    network = [dict(report.user_properties) for report in _call_reports(terminalreporter)]
+    blocked = sum(sum(properties.get("blocked_requests", {}).values()) for properties in network)
+    if any(properties.get("network_requests") for properties in network):
+        terminalreporter.section("network")
+        terminalreporter.write_line(
+            f"{sum(properties.get('network_requests', 0) for properties in network)} requests, "
+            f"{sum(properties.get('network_bytes', 0) for properties in network) / 1048576:.2f} MiB transferred, "
+            f"{blocked} blocked by --network-policy"
         )
-    else:
-        raise TypeError(f"Automation does not support browser {browser}")
-    
-    driver.implicitly_wait(10)
-    
+    lines = [
+        f"{resolved.browser}: {resolved.seconds:.3f}s to resolve driver {resolved.version} ({resolved.source})"
+        for resolved in config.resolved_drivers.values()
+    ]
+    lines.extend(config.launch_stats.summary_lines())
+    if not lines and not config.driver_resolution_errors:
+        return
+    terminalreporter.section("webdriver startup")
+    for error in config.driver_resolution_errors.values():
+        terminalreporter.write_line(error, red=True)
+    for line in lines:
+        terminalreporter.write_line(line)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def site(request):
+    """Serve the target site from the local archive when --site-mode is record or replay"""
+    mode = request.config.getoption("--site-mode")
+    if mode == "live":
+        yield BasePage.base_url
+        return
+
+    archive = SiteArchive(request.config.getoption("--site-archive"))
+    server = SiteServer(mode, archive, upstream=BasePage.base_url).start()
+    live_base_url, BasePage.base_url = BasePage.base_url, server.base_url
+    print(f"Serving {live_base_url} from {archive.directory} at {server.base_url} ({mode})")
+
+    yield server.base_url
+
+    BasePage.base_url = live_base_url
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def network_proxy(request, site):
+    """Filtering proxy for --network-policy/--network-throttle, None when neither is given"""
+    if request.config.network_policy is None:
+        yield None
+        return
+
+    proxy = FilteringProxy(request.config.network_policy).start()
+
+    yield proxy
+
+    proxy.stop()
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request, network_proxy):
+    config = request.config
+    proxy = network_proxy.address if network_proxy else None
+    broker = BrokerClient(config.session_broker) if config.session_broker else None
+
+    def launch(browser):
+        if browser in config.driver_resolution_errors:
+            raise DriverResolutionError(config.driver_resolution_errors[browser])
+        resolved = config.resolved_drivers.get(browser)
+        started = time.perf_counter()
+        if broker is not None:
+            # Attach to a session the broker already started, quitting it hands it back
+            driver = broker.checkout(browser)
+        else:
+            driver = create_driver(browser, resolved.path if resolved else None, config.launch_profile, proxy)
+        config.launch_stats.record_startup(config.launch_profile.name, time.perf_counter() - started)
+        return driver
+
+    # Session scope is per worker under pytest-xdist, so every worker keeps its own warm browsers
+    pool = DriverPool(launch, max_uses=request.config.getoption("--session-reuse"))
+
+    yield pool
+
+    pool.close()
+
+
+@pytest.fixture()
+def browser(request):
+    """Browser the test runs on: its matrix parameter, or the only --browser value"""
+    browser = getattr(request, "param", request.config.browsers[0])
+    if browser in request.config.missing_browsers:
+        pytest.skip(f"{browser} is not installed")
+    return browser
+
+
+@pytest.fixture()
+def driver(request, driver_pool, browser):
+    """The test's browser session, only acquired from the pool when the test first uses it"""
+    def start():
+        started = time.perf_counter()
+        session = driver_pool.acquire(browser)
+        # Kept out of the test's wall time budget, see utilities.budgets.measure
+        metrics.current().record_driver_start(time.perf_counter() - started)
+        # Round trip budgets need the command count even when full instrumentation is off
+        if request.config.getoption("--instrument-commands") or request.config.budgets.wants_roundtrips(request.node):
+            instrument(session)
+        return session
+
+    driver = request.node.stash[LAZY_DRIVER] = LazyDriver(start)
+
     yield driver
-    
-    print(f"Closing driver for {browser}")
-    driver.quit()
+
+    if driver.started:
+        # Sessions that hit a transient WebDriver error are quit rather than reset
+        driver_pool.release(driver.wrapped_driver, recycle=request.node.stash.get(RECYCLE_SESSION, False))
+
+@pytest.fixture()
+def router(request, driver):
+    """Page router for the test, clicking through the landing page for tests marked navigation"""
+    return PageRouter(driver, click_through=request.node.get_closest_marker("navigation") is not None)
+
+
+@pytest.fixture(scope="session")
+def assets():
+    """Upload asset registry from test_assets/manifest.json, FileUploadPage.upload_file takes its keys"""
+    return asset_registry.load()
 
 def pytest_addoption(parser):
     parser.addoption(
-        "--browser", action="store", default="firefox", help="browser for testing (edge,chrome,firefox)"
+        "--browser", action="store", default=CONFIG.get("browser", "firefox"),
+        help="browser for testing (edge,chrome,firefox,fake), or a comma separated list to run every test on each "
+             "e.g. firefox,chrome"
+    )
+    parser.addoption(
+        "--browser-workers", action="store", default=None,
+        help="most pytest-xdist workers a browser of a --browser list may use at once e.g. firefox=2,chrome=1"
+    )
+    parser.addoption(
+        "--launch-profile", action="store", default=None,
+        help="browser launch profile from config/config.json (default: launch_profile, or ci_launch_profile when CI is set)"
+    )
+    parser.addoption(
+        "--session-reuse", action="store", type=int, default=20,
+        help="number of tests a browser session is reused for before it is recycled (1 = new browser per test)"
+    )
+    parser.addoption(
+        "--base-url", action="store", default="https://the-internet.herokuapp.com/",
+        help="root url of the site under test that all page objects navigate relative to"
+    )
+    parser.addoption(
+        "--site-mode", action="store", default="live", choices=("live", "record", "replay"),
+        help="live: use --base-url directly, record: proxy it into the site archive, replay: serve the archive locally"
+    )
+    parser.addoption(
+        "--site-archive", action="store", default=DEFAULT_ARCHIVE,
+        help="directory of the recorded site used by --site-mode record/replay"
+    )
+    parser.addoption(
+        "--network-policy", action="store", default=None,
+        help="send browser traffic through a local proxy that applies a block/allow list from config/config.json"
+    )
+    parser.addoption(
+        "--network-throttle", action="store", default=None,
+        help="simulate a network profile from config/config.json (throttle_profiles) e.g. slow-3g"
+    )
+    parser.addoption(
+        "--instrument-commands", action="store_true", default=False,
+        help="time every WebDriver command and report round trips and p50/p95 per command"
+    )
+    parser.addoption(
+        "--commands-json", action="store", default="reports/commands.json",
+        help="where --instrument-commands writes its machine readable results"
+    )
+    parser.addoption(
+        "--budget-mode", action="store", default="strict", choices=("strict", "soft"),
+        help="strict: tests over their performance budget fail, soft: they only warn"
+    )
+    parser.addoption(
+        "--budget-baseline", action="store", default=None,
+        help="JSON file of recorded per-test numbers that every test is checked against"
+    )
+    parser.addoption(
+        "--budget-drift", action="store", type=float, default=0.25,
+        help="how far above the --budget-baseline numbers a test may go, as a fraction (0.25 = 25%%)"
+    )
+    parser.addoption(
+        "--budget-record", action="store_true", default=False,
+        help="write the numbers of this run to --budget-baseline instead of checking them"
+    )
+    parser.addoption(
+        "--scheduler", action="store", default="lpt", choices=("lpt", "xdist"),
+        help="lpt: with -n and the default --dist load, run the longest tests first and keep workers on one browser, "
+             "xdist: use the pytest-xdist scheduler"
+    )
+    parser.addoption(
+        "--durations-history", action="store", default="reports/test_durations.json",
+        help="per-test durations recorded by every run and used by --scheduler lpt to order tests"
+    )
+    parser.addoption(
+        "--upload-benchmark", action="store_true", default=False,
+        help="run the upload throughput benchmarks (marked benchmark), they are skipped otherwise"
+    )
+    parser.addoption(
+        "--upload-benchmark-dir", action="store", default=UPLOAD_BENCHMARK_DIR,
+        help="directory the upload benchmark results of every run are stored in"
+    )
+    parser.addoption(
+        "--locator-max-ms", action="store", type=float, default=None,
+        help="run the locator latency check (marked locator_latency), failing when a page object locator's "
+             "median lookup takes longer than this"
+    )
+    parser.addoption(
+        "--locator-samples", action="store", type=int, default=10,
+        help="lookups timed per locator by the locator latency check"
+    )
+    parser.addoption(
+        "--reruns", action="store", type=int, default=1,
+        help="times a test that failed on a transient WebDriver error (timeout, stale element, lost session) is rerun "
+             "on a new session, 0 to never rerun; assertion failures are never rerun"
+    )
+    parser.addoption(
+        "--rerun-budget", action="store", type=int, default=5,
+        help="most reruns in the whole run, split evenly over pytest-xdist workers"
+    )
+    parser.addoption(
+        "--flake-history", action="store", default="reports/flake_history.json",
+        help="per-test counts of runs and reruns that the flake rates in the rerun summary come from"
+    )
+    parser.addoption(
+        "--results-jsonl", action="store", default=DEFAULT_STREAM,
+        help="JSON lines file every test result is streamed to as it finishes, with a viewer next to it (.html)"
+    )
+    parser.addoption(
+        "--no-results-stream", action="store_true", default=False,
+        help="do not stream the results to --results-jsonl"
+    )
+    parser.addoption(
+        "--artifacts-dir", action="store", default="reports/artifacts",
+        help="where the screenshot, page source, url and console log of failing tests are written"
+    )
+    parser.addoption(
+        "--no-failure-artifacts", action="store_true", default=False,
+        help="do not capture artifacts of failing tests"
+    )
+    parser.addoption(
+        "--impacted-since", action="store", default=None,
+        help="only run the tests the changes since this git ref can affect e.g. --impacted-since origin/main "
+             "(the full suite when conftest.py, BasePage or other shared code changed)"
+    )
+    parser.addoption(
+        "--impact-map", action="store", default="reports/test_impact.json",
+        help="page objects, classes and locators each test used, recorded by every run for --impacted-since"
+    )
+    parser.addoption(
+        "--broker-sessions", action="store", type=int, default=0,
+        help="start a session broker that keeps this many browser sessions ready per browser, workers attach to "
+             "them instead of launching their own (0 = off)"
+    )
+    parser.addoption(
+        "--session-broker", action="store", default=None,
+        help="attach to the sessions of a broker that is already running e.g. http://127.0.0.1:4445 "
+             "(python -m utilities.session_broker serve)"
+    )
+    parser.addoption(
+        "--offline", action="store_true", default=False,
+        help="use the webdriver binaries pinned in config/webdriver.lock.json without touching the network"
+    )
+    parser.addoption(
+        "--update-driver-lock", action="store_true", default=False,
+        help="resolve the latest webdriver binaries and re-pin them in config/webdriver.lock.json"
     )
-    
\ No newline at end of file
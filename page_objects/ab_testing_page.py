@@ -5,7 +5,7 @@ from page_objects.base_page import BasePage
 
 
 class AbTestingPage(BasePage):
-    __url = "https://the-internet.herokuapp.com/abtest"
+    path = "abtest"
     __ab_test_header = (By.TAG_NAME, "h3")
 
     def __init__(self, driver: WebDriver):
@@ -15,6 +15,11 @@ class AbTestingPage(BasePage):
     def current_url(self) -> str:
         return super()._driver.current_url
 
+    def open(self):
+        """Navigate directly to the A/B testing page"""
+        self.open_url(self.path)
+        return self
+
     def ab_landing_page_loaded_successfully(self):
-        assert super().is_displayed(self.__ab_test_header), "The header is not displayed"
+        assert super().is_displayed(self.__ab_test_header, time=2), "The header is not displayed"
         
\ No newline at end of file
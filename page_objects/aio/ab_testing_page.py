@@ -0,0 +1,24 @@
+from selenium.webdriver.common.by import By
+
+from page_objects.aio.base_page import AsyncBasePage
+from utilities.async_webdriver import AsyncWebDriver
+
+
+class AbTestingPage(AsyncBasePage):
+    path = "abtest"
+    __ab_test_header = (By.TAG_NAME, "h3")
+
+    def __init__(self, driver: AsyncWebDriver):
+        super().__init__(driver)
+
+    async def current_url(self) -> str:
+        return await self._driver.current_url()
+
+    async def open(self):
+        """Navigate directly to the A/B testing page"""
+        await self.open_url(self.path)
+        return self
+
+    async def ab_landing_page_loaded_successfully(self):
+        assert await self.is_displayed(self.__ab_test_header, time=2), "The header is not displayed"
+        return self
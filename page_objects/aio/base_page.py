@@ -0,0 +1,194 @@
+import asyncio
+from time import perf_counter
+from urllib.parse import urljoin
+
+from selenium.common import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+from page_objects.base_page import QUERY_ELEMENTS_JS, BasePage
+from utilities import metrics
+from utilities.metrics import TestMetrics
+from utilities.async_webdriver import AsyncWebDriver, AsyncWebElement
+from utilities.script_registry import scripts
+
+
+class AsyncBasePage:
+    """BasePage for utilities.async_webdriver sessions: the same helpers as coroutines
+
+    Waits poll with asyncio.sleep, so while one session waits for its page the
+    event loop drives the others. There is no element cache, a single session
+    has little to gain from it when the loop is busy with other sessions anyway.
+    Metrics go to the session's own ``driver.metrics`` when it has them, so sessions
+    sharing a loop are not all counted against the test that happens to be running.
+    """
+
+    base_url = BasePage.base_url
+    path = None
+    poll_interval = BasePage.poll_interval
+
+    def __init__(self, driver: AsyncWebDriver):
+        self._driver = driver
+        self._metrics.record_page(
+            f"{cls.__module__}.{cls.__qualname__}" for cls in type(self).__mro__
+            if issubclass(cls, AsyncBasePage) and cls is not AsyncBasePage
+        )
+
+    @property
+    def _metrics(self) -> TestMetrics:
+        return self._driver.metrics if self._driver.metrics is not None else metrics.current()
+
+    async def open_url(self, url: str):
+        await self._driver.get(urljoin(self.base_url, url))
+
+    async def _find(self, locator: tuple) -> AsyncWebElement:
+        self._metrics.record_locator(locator)
+        return await self._driver.find_element(*locator)
+
+    async def _find_all(self, locator: tuple) -> list:
+        self._metrics.record_locator(locator)
+        return await self._driver.find_elements(*locator)
+
+    async def _type(self, locator: tuple, text: str):
+        await self._retry_stale(lambda: self._visible_then(locator, lambda element: element.send_keys(text)))
+
+    async def _click(self, locator: tuple, time: float = 2):
+        await self._retry_stale(lambda: self._visible_then(locator, lambda element: element.click(), time))
+
+    async def _visible_then(self, locator: tuple, action, time: float = 2):
+        return await action(await self._wait_until_element_is_visible(locator, time))
+
+    async def _retry_stale(self, action):
+        """Await action(), once more if the element went stale in between"""
+        try:
+            return await action()
+        except StaleElementReferenceException:
+            self._metrics.record_stale()
+            return await action()
+
+    async def _query_elements(self, queries: dict) -> dict:
+        """Read element state for several locators with a single execute_script call, see BasePage._query_elements"""
+        for locator, _ in queries.values():
+            self._metrics.record_locator(locator)
+        return await self._driver.execute_script(QUERY_ELEMENTS_JS, [
+            [name, locator[0], locator[1], list(fields)] for name, (locator, fields) in queries.items()
+        ])
+
+    async def _call_script(self, name: str, *args):
+        """Invoke a helper registered with utilities.script_registry.scripts by name"""
+        return await scripts.call_async(self._driver, name, *args)
+
+    async def _wait_for_text(self, locator: tuple, time: float = 2, poll: float = None) -> str:
+        """Wait until the first element matching locator is displayed and return its text"""
+        async def displayed_text(driver):
+            states = (await self._query_elements({"element": (locator, ("displayed", "text"))}))["element"]
+            return states and states[0]["displayed"] and states[0]
+        return (await self._wait_for(displayed_text, f"text of {locator}", time, poll))["text"]
+
+    async def _wait_for(self, condition, description: str, time: float = 2, poll: float = None):
+        """Wait until ``await condition(driver)`` is truthy and record how long it took
+
+        Raises TimeoutException after ``time`` seconds, polling every ``poll`` seconds.
+        NoSuchElementException counts as not yet, like WebDriverWait.
+        """
+        loop = asyncio.get_running_loop()
+        started = perf_counter()
+        deadline = loop.time() + time
+        timed_out = False
+        try:
+            while True:
+                try:
+                    value = await condition(self._driver)
+                    if value:
+                        return value
+                except NoSuchElementException:
+                    pass
+                if loop.time() >= deadline:
+                    timed_out = True
+                    raise TimeoutException(f"Timed out after {time}s waiting for {description}")
+                await asyncio.sleep(poll or self.poll_interval)
+        finally:
+            self._metrics.record_wait(
+                f"{type(self).__name__}: {description}", perf_counter() - started, timed_out
+            )
+
+    async def _wait_until_url_contains(self, url: str, time: float = 1, poll: float = None):
+        async def url_contains(driver):
+            return url in await driver.current_url()
+        await self._wait_for(url_contains, f"url contains {url!r}", time, poll)
+
+    async def _wait_until_element_is_visible(self, locator: tuple, time: float = 2, poll: float = None) -> AsyncWebElement:
+        self._metrics.record_locator(locator)
+
+        async def visible_element(driver):
+            try:
+                element = await driver.find_element(*locator)
+                return element if await element.is_displayed() else None
+            except StaleElementReferenceException:
+                return None
+        return await self._wait_for(visible_element, f"visibility of {locator}", time, poll)
+
+    async def _wait_until_element_is_not_visible(self, locator: tuple, time: float = 1, poll: float = None):
+        self._metrics.record_locator(locator)
+
+        async def invisible(driver):
+            try:
+                return not await (await driver.find_element(*locator)).is_displayed()
+            except (NoSuchElementException, StaleElementReferenceException):
+                return True
+        await self._wait_for(invisible, f"invisibility of {locator}", time, poll)
+
+    async def is_displayed(self, locator: tuple, time: float = 0) -> bool:
+        """Whether the element is visible, waiting up to ``time`` seconds for it to become so"""
+        if time:
+            try:
+                await self._wait_until_element_is_visible(locator, time)
+                return True
+            except TimeoutException:
+                return False
+        try:
+            return await self._retry_stale(lambda: self._displayed(locator))
+        except NoSuchElementException:
+            return False
+
+    async def _displayed(self, locator: tuple) -> bool:
+        return await (await self._find(locator)).is_displayed()
+
+    async def is_selected(self, locator: tuple) -> bool:
+        try:
+            return await (await self._find(locator)).is_selected()
+        except NoSuchElementException:
+            return False
+
+    async def is_absent(self, locator: tuple, time: float = 0) -> bool:
+        """Whether no element matches the locator, in a single round trip unless ``time`` is given"""
+        self._metrics.record_locator(locator)
+        if not time:
+            return not await self._driver.find_elements(*locator)
+
+        async def absent(driver):
+            return not await driver.find_elements(*locator)
+        try:
+            await self._wait_for(absent, f"absence of {locator}", time)
+        except TimeoutException:
+            return False
+        return True
+
+    async def _switch_tab(self, tab: str):
+        match tab:
+            case "child":
+                window = (await self._driver.window_handles())[1]
+            case "parent":
+                window = (await self._driver.window_handles())[0]
+            case "original":
+                window = await self._driver.current_window_handle()
+            case _:
+                raise ValueError(f"Unknown tab {tab}, expected child, parent or original")
+        await self._driver.switch_to_window(window)
+
+    async def get_window_size(self) -> dict:
+        return await self._driver.get_window_size()
+
+    async def set_window_size(self, width: int, height: int):
+        return await self._driver.set_window_size(width=int(width), height=int(height))
+
+    async def _refresh_page(self):
+        return await self._driver.refresh()
@@ -0,0 +1,74 @@
+from selenium.webdriver.common.by import By
+
+from page_objects.aio.base_page import AsyncBasePage
+from utilities.async_webdriver import AsyncWebDriver
+
+
+class CheckboxesPage(AsyncBasePage):
+    path = "checkboxes"
+    __checkboxes_test_header = (By.TAG_NAME, "h3")
+    __checkboxes = (By.CSS_SELECTOR, "input[type='checkbox']")
+
+    def __init__(self, driver: AsyncWebDriver):
+        super().__init__(driver)
+
+    async def current_url(self) -> str:
+        return await self._driver.current_url()
+
+    async def open(self):
+        """Navigate directly to the checkboxes page"""
+        await self.open_url(self.path)
+        return self
+
+    async def checkboxes_page_loaded_successfully(self):
+        """Verify that the checkboxes page is loaded correctly"""
+        assert await self.is_displayed(self.__checkboxes_test_header, time=2), "The header is not displayed"
+        return self
+
+    async def get_checkbox(self, checkbox_number):
+        """Get a specific checkbox element (1 or 2)"""
+        index = checkbox_number - 1
+        checkboxes = await self._find_all(self.__checkboxes)
+        if not checkboxes:
+            await self._wait_until_element_is_visible(self.__checkboxes)
+            checkboxes = await self._find_all(self.__checkboxes)
+        if index < 0 or index >= len(checkboxes):
+            raise ValueError(f"Checkbox number {checkbox_number} is out of range. Only {len(checkboxes)} checkboxes available.")
+        return checkboxes[index]
+
+    async def is_checkbox_selected(self, checkbox_number):
+        """Check if a specific checkbox is selected"""
+        states = await self.get_all_checkboxes_state()
+        index = checkbox_number - 1
+        if index < 0 or index >= len(states):
+            raise ValueError(f"Checkbox number {checkbox_number} is out of range. Only {len(states)} checkboxes available.")
+        return states[index]
+
+    async def toggle_checkbox(self, checkbox_number):
+        """Toggle the state of a specific checkbox"""
+        await self._retry_stale(lambda: self._click_checkbox(checkbox_number))
+        return self
+
+    async def _click_checkbox(self, checkbox_number):
+        await (await self.get_checkbox(checkbox_number)).click()
+
+    async def select_checkbox(self, checkbox_number):
+        """Select a specific checkbox if it's not already selected"""
+        if not await self.is_checkbox_selected(checkbox_number):
+            await self.toggle_checkbox(checkbox_number)
+        return self
+
+    async def deselect_checkbox(self, checkbox_number):
+        """Deselect a specific checkbox if it's currently selected"""
+        if await self.is_checkbox_selected(checkbox_number):
+            await self.toggle_checkbox(checkbox_number)
+        return self
+
+    async def get_all_checkboxes_state(self):
+        """Get the selection state of all checkboxes as a list of booleans"""
+        query = {"checkboxes": (self.__checkboxes, ("selected",))}
+        states = (await self._query_elements(query))["checkboxes"]
+        if not states:
+            await self._wait_until_element_is_visible(self.__checkboxes)
+            states = (await self._query_elements(query))["checkboxes"]
+        return [state["selected"] for state in states]
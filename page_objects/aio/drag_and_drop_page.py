@@ -0,0 +1,48 @@
+from selenium.webdriver.common.by import By
+
+# Registers the dragAndDrop script helper this page calls
+import page_objects.drag_and_drop_page  # noqa: F401
+from page_objects.aio.base_page import AsyncBasePage
+from utilities.async_webdriver import AsyncWebDriver
+
+
+class DragAndDropPage(AsyncBasePage):
+    path = "drag_and_drop"
+    __d_and_d_test_header = (By.TAG_NAME, "h3")
+    __column_a = (By.ID, "column-a")
+    __column_b = (By.ID, "column-b")
+
+    def __init__(self, driver: AsyncWebDriver):
+        super().__init__(driver)
+
+    async def current_url(self) -> str:
+        return await self._driver.current_url()
+
+    async def open(self):
+        """Navigate directly to the drag_and_drop page"""
+        await self.open_url(self.path)
+        return self
+
+    async def d_and_d_page_loaded_successfully(self):
+        assert await self.is_displayed(self.__d_and_d_test_header, time=2), "The header is not displayed"
+        return self
+
+    async def drag_and_drop_js(self):
+        """Drag column A onto column B with the dragAndDrop script helper, see the synchronous DragAndDropPage"""
+        source = await self._find(self.__column_a)
+        target = await self._find(self.__column_b)
+        if not await self._call_script("dragAndDrop", source, target, 2000):
+            print("Timeout waiting for the columns to change after drag and drop")
+
+    async def get_column_text(self, column: str) -> str:
+        if column.lower() not in ("a", "b"):
+            raise ValueError("Column must be 'a' or 'b'")
+        return (await self.get_columns_text())[column.lower()]
+
+    async def get_columns_text(self) -> dict:
+        """Read the text of both columns in one round trip, e.g. {"a": "A", "b": "B"}"""
+        states = await self._query_elements({
+            "a": (self.__column_a, ("text",)),
+            "b": (self.__column_b, ("text",)),
+        })
+        return {column: elements[0]["text"] if elements else "" for column, elements in states.items()}
@@ -0,0 +1,22 @@
+from selenium.webdriver.common.by import By
+
+from page_objects.aio.base_page import AsyncBasePage
+from utilities.async_webdriver import AsyncWebDriver
+
+
+class ElementalSeleniumPage(AsyncBasePage):
+    __elemental_selenium_link = (By.LINK_TEXT, "Elemental Selenium")
+    __header_tag = (By.TAG_NAME, "h1")
+
+    def __init__(self, driver: AsyncWebDriver):
+        super().__init__(driver)
+
+    async def click_selemental_link(self):
+        await self._click(self.__elemental_selenium_link)
+
+    async def elemental_landing_page(self):
+        await self._click(self.__elemental_selenium_link)
+        await self._switch_tab("child")
+        await self._wait_until_element_is_visible(self.__header_tag)
+        page_url = await self._driver.current_url()
+        assert page_url == "https://elementalselenium.com/", "The url is incorrect for elemental selenium"
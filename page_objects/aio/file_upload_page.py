@@ -0,0 +1,72 @@
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from page_objects.aio.base_page import AsyncBasePage
+from utilities.asset_registry import assets
+
+
+class FileUploadPage(AsyncBasePage):
+    """Page Object for the File Upload page /upload"""
+
+    path = "upload"
+
+    __file_input = (By.ID, "file-upload")
+    __upload_button = (By.ID, "file-submit")
+    __success_message = (By.TAG_NAME, "h3")
+    __uploaded_filename = (By.ID, "uploaded-files")
+    __page_header = (By.CSS_SELECTOR, "h3")
+
+    async def current_url(self) -> str:
+        return await self._driver.current_url()
+
+    async def open(self):
+        """Navigate directly to the file upload page"""
+        await self.open_url(self.path)
+        return self
+
+    async def verify_page_loaded(self):
+        """Verify that the file upload page has loaded correctly"""
+        header_text = await self._wait_for_text(self.__page_header)
+        assert "File Uploader" in header_text, f"Expected 'File Uploader' in header, but got '{header_text}'"
+        return self
+
+    async def upload_file(self, file_path):
+        """Upload a file and click the upload button
+
+        Args:
+            file_path: The path to the file to upload, or a key of the upload asset registry
+        """
+        await self.choose_file(file_path)
+        await self.click_upload_button()
+        return self
+
+    async def choose_file(self, file_path):
+        """Put a local file in the file input without submitting the form
+
+        There is no file upload to remote sessions here, the driver must run on this machine.
+        """
+        await self._type(self.__file_input, assets.resolve(file_path))
+        return self
+
+    async def click_upload_button(self, time: float = 2):
+        """Click the upload button and wait up to ``time`` seconds for the response"""
+        await self._click(self.__upload_button)
+        try:
+            await self._wait_until_element_is_visible(self.__success_message, time)
+        except TimeoutException:
+            print("Timeout waiting for response after clicking upload button")
+        return self
+
+    async def get_success_message(self):
+        try:
+            return await self._wait_for_text(self.__success_message)
+        except TimeoutException:
+            print("Timeout waiting for success message")
+            return ""
+
+    async def get_uploaded_filename(self, time: float = 2):
+        try:
+            return await self._wait_for_text(self.__uploaded_filename, time)
+        except TimeoutException:
+            print("Timeout waiting for uploaded filename")
+            return ""
@@ -0,0 +1,39 @@
+from selenium.webdriver.common.by import By
+
+from page_objects.aio.base_page import AsyncBasePage
+from utilities.async_webdriver import AsyncWebDriver
+
+
+class LandingPage(AsyncBasePage):
+    path = ""
+    __url_ab_page = "abtest"
+    __url_d_and_d_page = "drag_and_drop"
+    __url_checkbox_page = "checkboxes"
+    __url_file_upload = "upload"
+    __ab_testing_link = (By.XPATH, "//a[contains(., 'A/B Testing')]")
+    __d_and_d_testing_link = (By.XPATH, "//a[contains(., 'Drag and Drop')]")
+    __checkbox_testing_link = (By.XPATH, "//a[contains(., 'Checkboxes')]")
+    __file_upload_testing_link = (By.XPATH, "//a[contains(., 'File Upload')]")
+
+    def __init__(self, driver: AsyncWebDriver):
+        super().__init__(driver)
+
+    async def open(self):
+        await self.open_url(self.path)
+        return self
+
+    async def click_ab_testing_link(self):
+        await self._click(self.__ab_testing_link)
+        await self._wait_until_url_contains(self.__url_ab_page)
+
+    async def click_drag_and_drop_testing_link(self):
+        await self._click(self.__d_and_d_testing_link)
+        await self._wait_until_url_contains(self.__url_d_and_d_page)
+
+    async def click_checkboxes_testing_link(self):
+        await self._click(self.__checkbox_testing_link)
+        await self._wait_until_url_contains(self.__url_checkbox_page)
+
+    async def click_file_upload_testing_link(self):
+        await self._click(self.__file_upload_testing_link)
+        await self._wait_until_url_contains(self.__url_file_upload)
@@ -1,52 +1,251 @@
-from selenium.common import NoSuchElementException
+from time import perf_counter
+from urllib.parse import urljoin
+
+from selenium.common import NoSuchElementException, StaleElementReferenceException, TimeoutException
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
 
+from utilities import metrics, navigation
+from utilities.lazy_driver import unwrap
+from utilities.script_registry import scripts
+
+# findAll(by, value): the elements a locator matches, with the DOM query a driver runs for its strategy
+FIND_ALL_JS = """
+function findAll(by, value) {
+    switch (by) {
+        case "id": return Array.from(document.querySelectorAll("[id='" + CSS.escape(value) + "']"));
+        case "css selector": return Array.from(document.querySelectorAll(value));
+        case "tag name": return Array.from(document.getElementsByTagName(value));
+        case "class name": return Array.from(document.getElementsByClassName(value));
+        case "name": return Array.from(document.getElementsByName(value));
+        case "link text":
+            return Array.from(document.links).filter(function (a) { return a.innerText.trim() === value; });
+        case "partial link text":
+            return Array.from(document.links).filter(function (a) { return a.innerText.indexOf(value) !== -1; });
+        case "xpath":
+            var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+            return nodes;
+    }
+    throw new Error("Unsupported locator strategy " + by);
+}
+"""
+
+# Reads the requested fields of every element matched by each locator in one round trip.
+# arguments[0] is a list of [name, by, value, fields]; "@name" fields read attributes.
+QUERY_ELEMENTS_JS = FIND_ALL_JS + """
+function isDisplayed(element) {
+    var style = window.getComputedStyle(element);
+    return style.visibility !== "hidden" && style.display !== "none" && element.getClientRects().length > 0;
+}
+
+function read(element, field) {
+    switch (field) {
+        case "text": return isDisplayed(element) ? element.innerText.trim() : "";
+        case "selected": return Boolean(element.checked || element.selected);
+        case "displayed": return isDisplayed(element);
+        case "value": return element.value === undefined ? null : element.value;
+    }
+    if (field.charAt(0) === "@") { return element.getAttribute(field.substring(1)); }
+    throw new Error("Unsupported field " + field);
+}
+
+var results = {};
+arguments[0].forEach(function (query) {
+    results[query[0]] = findAll(query[1], query[2]).map(function (element) {
+        var state = {};
+        query[3].forEach(function (field) { state[field] = read(element, field); });
+        return state;
+    });
+});
+return results;
+"""
 
 class BasePage:
+    # Relative page urls are resolved against this; conftest sets it from --base-url
+    base_url = "https://the-internet.herokuapp.com/"
+    # Url of the page relative to base_url, used by open() and the page router
+    path = None
+    # Sessions run with no implicit wait, every wait goes through _wait_for with its own timeout
+    poll_interval = 0.1
+
     def __init__(self, driver: WebDriver):
         self._driver = driver
+        self._elements = {}
+        # Feeds the test impact map (--impacted-since) with the page classes each test uses
+        metrics.current().record_page(
+            f"{cls.__module__}.{cls.__qualname__}" for cls in type(self).__mro__
+            if issubclass(cls, BasePage) and cls is not BasePage
+        )
 
     def open_url(self, url: str):
-        self._driver.get(url)
+        self._driver.get(urljoin(self.base_url, url))
+        self._navigated()
 
     def _find(self, locator: tuple) -> WebElement:
-        return self._driver.find_element(*locator)
+        metrics.current().record_locator(locator)
+        element = self._cached(locator)
+        if element is None:
+            element = self._remember(locator, self._driver.find_element(*locator))
+        return element
+
+    def _find_all(self, locator: tuple) -> list:
+        metrics.current().record_locator(locator)
+        elements = self._cached((locator, "all"))
+        if elements is None:
+            elements = self._remember((locator, "all"), self._driver.find_elements(*locator))
+        return elements
 
     def _type(self, locator: tuple, text: str):
-        self._wait_until_element_is_visible(locator)
-        self._find(locator).send_keys(text)
+        self._retry_stale(locator, lambda: self._wait_until_element_is_visible(locator).send_keys(text))
+
+    def _click(self, locator: tuple, time: float = 2, navigates: bool = True):
+        """Click the element once visible
+
+        A click may follow a link or submit a form without the url being checked, so cached
+        handles are dropped afterwards unless the caller passes ``navigates=False``. Only pass
+        it for clicks that stay on the page: navigation the browser starts by itself (a link,
+        a submit, a script redirect) sends no command, and handles cached before it would
+        only be noticed as stale when used.
+        """
+        self._retry_stale(locator, lambda: self._wait_until_element_is_visible(locator, time).click())
+        if navigates:
+            self._navigated()
+
+    def _navigation_epoch(self) -> int:
+        return navigation.epoch(unwrap(self._driver))
+
+    def _navigated(self):
+        """Invalidate the element caches of every page object sharing this driver"""
+        navigation.navigated(unwrap(self._driver))
+
+    def _cached(self, key):
+        entry = self._elements.get(key)
+        if entry is not None and entry[0] == self._navigation_epoch():
+            metrics.current().record_cache(hit=True)
+            return entry[1]
+        metrics.current().record_cache(hit=False)
+        return None
+
+    def _remember(self, key, element):
+        if element:
+            navigation.watch(unwrap(self._driver))
+            self._elements[key] = (self._navigation_epoch(), element)
+        return element
+
+    def _forget(self, locator: tuple):
+        self._elements.pop(locator, None)
+        self._elements.pop((locator, "all"), None)
 
-    def _click(self, locator: tuple, time: int = 2):
-        self._wait_until_element_is_visible(locator, time)
-        self._find(locator).click()
+    def _retry_stale(self, locator: tuple, action):
+        """Run action(), fetching the element again once if the cached handle went stale"""
+        try:
+            return action()
+        except StaleElementReferenceException:
+            metrics.current().record_stale()
+            self._forget(locator)
+            return action()
+
+    def _query_elements(self, queries: dict) -> dict:
+        """Read element state for several locators with a single execute_script call
+
+        Args:
+            queries: {name: (locator, fields)} where fields are any of "text",
+                "selected", "displayed", "value" or "@attribute"
+
+        Returns:
+            dict: {name: [{field: value} for every matching element]}
+        """
+        for locator, _ in queries.values():
+            metrics.current().record_locator(locator)
+        return self._driver.execute_script(QUERY_ELEMENTS_JS, [
+            [name, locator[0], locator[1], list(fields)] for name, (locator, fields) in queries.items()
+        ])
+
+    def _call_script(self, name: str, *args):
+        """Invoke a helper registered with utilities.script_registry.scripts by name"""
+        return scripts.call(self._driver, name, *args)
+
+    def _wait_for_text(self, locator: tuple, time: float = 2, poll: float = None) -> str:
+        """Wait until the first element matching locator is displayed and return its text"""
+        def displayed_text(driver):
+            states = self._query_elements({"element": (locator, ("displayed", "text"))})["element"]
+            return states and states[0]["displayed"] and states[0]
+        return self._wait_for(displayed_text, f"text of {locator}", time, poll)["text"]
+
+    def _wait_for(self, condition, description: str, time: float = 2, poll: float = None):
+        """Wait until condition(driver) is truthy and record how long it took
 
-    def _wait_until_url_contains(self, url: str, time: int = 1):
-        wait = WebDriverWait(self._driver, time)
-        wait.until(ec.url_contains(url))
+        Raises TimeoutException after ``time`` seconds, polling every ``poll`` seconds.
+        """
+        wait = WebDriverWait(self._driver, time, poll_frequency=poll or self.poll_interval)
+        started = perf_counter()
+        timed_out = False
+        try:
+            return wait.until(condition)
+        except TimeoutException:
+            timed_out = True
+            raise
+        finally:
+            metrics.current().record_wait(
+                f"{type(self).__name__}: {description}", perf_counter() - started, timed_out
+            )
+
+    def _wait_until_url_contains(self, url: str, time: float = 1, poll: float = None):
+        self._wait_for(ec.url_contains(url), f"url contains {url!r}", time, poll)
+        self._navigated()
 
-    def _wait_until_element_is_visible(self, locator: tuple, time: int = 2):
-        wait = WebDriverWait(self._driver, time)
-        wait.until(ec.visibility_of_element_located(locator))
+    def _wait_until_element_is_visible(self, locator: tuple, time: float = 2, poll: float = None) -> WebElement:
+        """Wait for the element to be visible and return it, reusing the cached handle when possible"""
+        metrics.current().record_locator(locator)
+        element = self._cached(locator)
+        if element is not None:
+            try:
+                if element.is_displayed():
+                    return element
+            except StaleElementReferenceException:
+                metrics.current().record_stale()
+                self._forget(locator)
+        element = self._wait_for(ec.visibility_of_element_located(locator), f"visibility of {locator}", time, poll)
+        return self._remember(locator, element)
 
-    def _wait_until_element_is_not_visible(self, locator: tuple, time: int = 1):
-        wait = WebDriverWait(self._driver, time)
-        wait.until(ec.invisibility_of_element_located(locator))
+    def _wait_until_element_is_not_visible(self, locator: tuple, time: float = 1, poll: float = None):
+        metrics.current().record_locator(locator)
+        self._wait_for(ec.invisibility_of_element_located(locator), f"invisibility of {locator}", time, poll)
 
-    def is_displayed(self, locator: tuple) -> bool:
+    def is_displayed(self, locator: tuple, time: float = 0) -> bool:
+        """Whether the element is visible, waiting up to ``time`` seconds for it to become so"""
+        if time:
+            try:
+                self._wait_until_element_is_visible(locator, time)
+                return True
+            except TimeoutException:
+                return False
         try:
-            return self._find(locator).is_displayed()
+            return self._retry_stale(locator, lambda: self._find(locator).is_displayed())
         except NoSuchElementException:
             return False
-    
+
     def is_selected(self, locator: tuple) -> bool:
         try:
-            return self._find(locator).is_selected()
+            return self._retry_stale(locator, lambda: self._find(locator).is_selected())
         except NoSuchElementException:
             return False
 
+    def is_absent(self, locator: tuple, time: float = 0) -> bool:
+        """Whether no element matches the locator, in a single round trip unless ``time`` is given"""
+        metrics.current().record_locator(locator)
+        if not time:
+            return not self._driver.find_elements(*locator)
+        try:
+            self._wait_for(lambda driver: not driver.find_elements(*locator), f"absence of {locator}", time)
+        except TimeoutException:
+            return False
+        return True
+
     def _contains_text(self, locator: tuple, text: str):
         assert locator.text.__contains__(str)
 
@@ -62,6 +261,7 @@ class BasePage:
             case _:
                 "missing window"
         self._driver.switch_to.window(window)
+        self._navigated()
 
     def get_window_size(self) -> dict:
         return self._driver.get_window_size()
@@ -70,5 +270,6 @@ class BasePage:
         return self._driver.set_window_size(width=int(width), height=int(height))
     
     def _refresh_page(self):
+        self._navigated()
         return self._driver.refresh()
     
\ No newline at end of file
@@ -5,7 +5,7 @@ from page_objects.base_page import BasePage
 
 
 class CheckboxesPage(BasePage):
-    __url = "https://the-internet.herokuapp.com/checkboxes"
+    path = "checkboxes"
     __checkboxes_test_header = (By.TAG_NAME, "h3")
     __checkboxes = (By.CSS_SELECTOR, "input[type='checkbox']")
 
@@ -18,12 +18,12 @@ class CheckboxesPage(BasePage):
 
     def open(self):
         """Navigate directly to the checkboxes page"""
-        self.open_url(self.__url)
+        self.open_url(self.path)
         return self
 
     def checkboxes_page_loaded_successfully(self):
         """Verify that the checkboxes page is loaded correctly"""
-        assert self.is_displayed(self.__checkboxes_test_header), "The header is not displayed"
+        assert self.is_displayed(self.__checkboxes_test_header, time=2), "The header is not displayed"
         return self
 
     def get_checkbox(self, checkbox_number):
@@ -31,11 +31,11 @@ class CheckboxesPage(BasePage):
         # Adjust index since checkbox_number is 1-based but list is 0-based
         index = checkbox_number - 1
         
-        # Ensure the checkboxes are visible before trying to access them
-        self._wait_until_element_is_visible(self.__checkboxes)
-        
-        # We need to get all checkboxes manually since BasePage doesn't have a find_elements method
-        checkboxes = self._driver.find_elements(*self.__checkboxes)
+        # Reuse the cached checkbox list, only waiting for visibility when it is not on the page yet
+        checkboxes = self._find_all(self.__checkboxes)
+        if not checkboxes:
+            self._wait_until_element_is_visible(self.__checkboxes)
+            checkboxes = self._find_all(self.__checkboxes)
         
         if index < 0 or index >= len(checkboxes):
             raise ValueError(f"Checkbox number {checkbox_number} is out of range. Only {len(checkboxes)} checkboxes available.")
@@ -44,13 +44,15 @@ class CheckboxesPage(BasePage):
     
     def is_checkbox_selected(self, checkbox_number):
         """Check if a specific checkbox is selected"""
-        checkbox = self.get_checkbox(checkbox_number)
-        return checkbox.is_selected()
+        states = self.get_all_checkboxes_state()
+        index = checkbox_number - 1
+        if index < 0 or index >= len(states):
+            raise ValueError(f"Checkbox number {checkbox_number} is out of range. Only {len(states)} checkboxes available.")
+        return states[index]
     
     def toggle_checkbox(self, checkbox_number):
         """Toggle the state of a specific checkbox"""
-        checkbox = self.get_checkbox(checkbox_number)
-        checkbox.click()
+        self._retry_stale(self.__checkboxes, lambda: self.get_checkbox(checkbox_number).click())
         return self
     
     def select_checkbox(self, checkbox_number):
@@ -67,9 +69,10 @@ class CheckboxesPage(BasePage):
     
     def get_all_checkboxes_state(self):
         """Get the selection state of all checkboxes as a list of booleans"""
-        # Ensure the checkboxes are visible
-        self._wait_until_element_is_visible(self.__checkboxes)
-        
-        # Get all checkboxes
-        checkboxes = self._driver.find_elements(*self.__checkboxes)
-        return [checkbox.is_selected() for checkbox in checkboxes]
+        # One DOM read for every checkbox, only waiting when the page has not rendered them yet
+        query = {"checkboxes": (self.__checkboxes, ("selected",))}
+        states = self._query_elements(query)["checkboxes"]
+        if not states:
+            self._wait_until_element_is_visible(self.__checkboxes)
+            states = self._query_elements(query)["checkboxes"]
+        return [state["selected"] for state in states]
@@ -1,14 +1,67 @@
-import time
-
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.action_chains import ActionChains
 
 from page_objects.base_page import BasePage
+from utilities.script_registry import scripts
+
+# JavaScript helper to solve issue with Drag and Drop
+scripts.register("dragAndDrop", """
+function (source, destination, timeoutMs, done) {
+    function createEvent(typeOfEvent) {
+        var event = document.createEvent("CustomEvent");
+        event.initCustomEvent(typeOfEvent, true, true, null);
+        event.dataTransfer = {
+            data: {},
+            setData: function(key, value) {
+                this.data[key] = value;
+            },
+            getData: function(key) {
+                return this.data[key];
+            }
+        };
+        return event;
+    }
+
+    function dispatchEvent(element, event, transferData) {
+        if (transferData !== undefined) {
+            event.dataTransfer = transferData;
+        }
+        if (element.dispatchEvent) {
+            element.dispatchEvent(event);
+        } else if (element.fireEvent) {
+            element.fireEvent("on" + event.type, event);
+        }
+    }
+
+    var finished = false;
+    function finish(changed) {
+        if (finished) { return; }
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        done(changed);
+    }
+
+    // Resolve on the first DOM change of either column instead of sleeping
+    var observer = new MutationObserver(function () { finish(true); });
+    [source, destination].forEach(function (column) {
+        observer.observe(column, {childList: true, subtree: true, characterData: true});
+    });
+    var timer = setTimeout(function () { finish(false); }, timeoutMs);
+
+    var dragStartEvent = createEvent('dragstart');
+    dispatchEvent(source, dragStartEvent);
+    var dropEvent = createEvent('drop');
+    dispatchEvent(destination, dropEvent, dragStartEvent.dataTransfer);
+    var dragEndEvent = createEvent('dragend');
+    dispatchEvent(source, dragEndEvent, dropEvent.dataTransfer);
+}
+""", is_async=True)
 
 
 class DragAndDropPage(BasePage):
-    __url = "https://the-internet.herokuapp.com/drag_and_drop"
+    path = "drag_and_drop"
     __d_and_d_test_header = (By.TAG_NAME, "h3")
     __column_a = (By.ID, "column-a")
     __column_b = (By.ID, "column-b")
@@ -22,11 +75,11 @@ class DragAndDropPage(BasePage):
     
     def open(self):
         """Navigate directly to the drag_and_drop page"""
-        self.open_url(self.__url)
+        self.open_url(self.path)
         return self
     
     def d_and_d_page_loaded_successfully(self):
-        assert super().is_displayed(self.__d_and_d_test_header), "The header is not displayed"
+        assert super().is_displayed(self.__d_and_d_test_header, time=2), "The header is not displayed"
 
     def drag_and_drop_elements(self):
         """
@@ -39,60 +92,26 @@ class DragAndDropPage(BasePage):
     def drag_and_drop_js(self):
         """
         Implement drag and drop method using JavaScript (Stack Overflow solution: https://stackoverflow.com/questions/60077655/unable-to-perform-drag-and-drop-with-selenium-python)
-        """
-        # JavaScript helper to solve issue with Drag and Drop
-        js_drag_and_drop = """
-        function createEvent(typeOfEvent) {
-            var event = document.createEvent("CustomEvent");
-            event.initCustomEvent(typeOfEvent, true, true, null);
-            event.dataTransfer = {
-                data: {},
-                setData: function(key, value) {
-                    this.data[key] = value;
-                },
-                getData: function(key) {
-                    return this.data[key];
-                }
-            };
-            return event;
-        }
-
-        function dispatchEvent(element, event, transferData) {
-            if (transferData !== undefined) {
-                event.dataTransfer = transferData;
-            }
-            if (element.dispatchEvent) {
-                element.dispatchEvent(event);
-            } else if (element.fireEvent) {
-                element.fireEvent("on" + event.type, event);
-            }
-        }
 
-        function simulateHTML5DragAndDrop(element, destination) {
-            var dragStartEvent = createEvent('dragstart');
-            dispatchEvent(element, dragStartEvent);
-            var dropEvent = createEvent('drop');
-            dispatchEvent(destination, dropEvent, dragStartEvent.dataTransfer);
-            var dragEndEvent = createEvent('dragend');
-            dispatchEvent(element, dragEndEvent, dropEvent.dataTransfer);
-        }
-
-        var source = arguments[0];
-        var destination = arguments[1];
-        simulateHTML5DragAndDrop(source, destination);
+        The helper is installed in the page once and returns as soon as the columns change.
         """
-        
         source = self._find(self.__column_a)
         target = self._find(self.__column_b)
-        
-        # Execute the JS script to perform drag and drop
-        self._driver.execute_script(js_drag_and_drop, source, target)
-        
-        # Wait a moment for the action to complete.
-        time.sleep(1)
+
+        # Resolves when the drop handler has swapped the columns, False if nothing changed in time
+        if not self._call_script("dragAndDrop", source, target, 2000):
+            print("Timeout waiting for the columns to change after drag and drop")
 
     def get_column_text(self, column: str) -> str:
         column_mapping = {"a": self.__column_a, "b": self.__column_b}
         if column.lower() not in column_mapping:
             raise ValueError("Column must be 'a' or 'b'")
-        return self._driver.find_element(*column_mapping[column.lower()]).text
\ No newline at end of file
+        return self.get_columns_text()[column.lower()]
+
+    def get_columns_text(self) -> dict:
+        """Read the text of both columns in one round trip, e.g. {"a": "A", "b": "B"}"""
+        states = self._query_elements({
+            "a": (self.__column_a, ("text",)),
+            "b": (self.__column_b, ("text",)),
+        })
+        return {column: elements[0]["text"] if elements else "" for column, elements in states.items()}
\ No newline at end of file
@@ -2,13 +2,14 @@ from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException
 
 from page_objects.base_page import BasePage
+from utilities.asset_registry import assets
 
 
 class FileUploadPage(BasePage):
     """Page Object for the File Upload page /upload"""
     
     # URL of the page
-    __url = "https://the-internet.herokuapp.com/upload"
+    path = "upload"
     
     # Locators
     __file_input = (By.ID, "file-upload")
@@ -28,13 +29,12 @@ class FileUploadPage(BasePage):
     
     def open(self):
         """Navigate directly to the file upload page"""
-        self.open_url(self.__url)
+        self.open_url(self.path)
         return self
     
     def verify_page_loaded(self):
         """Verify that the file upload page has loaded correctly"""
-        self._wait_until_element_is_visible(self.__page_header)
-        header_text = self._find(self.__page_header).text
+        header_text = self._wait_for_text(self.__page_header)
         assert "File Uploader" in header_text, f"Expected 'File Uploader' in header, but got '{header_text}'"
         return self
     
@@ -42,27 +42,35 @@ class FileUploadPage(BasePage):
         """Upload a file and click the upload button
         
         Args:
-            file_path: The path to the file to upload
+            file_path: The path to the file to upload, or a key of the upload asset registry
         """
-        # Wait for the file input to be present
-        self._wait_until_element_is_visible(self.__file_input)
-        
-        # Send the file path to the file input
-        file_input = self._find(self.__file_input)
-        file_input.send_keys(file_path)
+        self.choose_file(file_path)
         
         # Click the upload button
         self.click_upload_button()
         
         return self
     
-    def click_upload_button(self):
-        """Click the upload button"""
+    def choose_file(self, file_path):
+        """Put a file in the file input without submitting the form
+        
+        Args:
+            file_path: The path to the file to upload, or a key of the upload asset registry
+        """
+        # Wait for the file input and send the file path to it, on remote sessions the path it was uploaded to
+        upload_path = assets.upload_path(self._driver, file_path)
+        with assets.no_reupload(self._driver):
+            self._type(self.__file_input, upload_path)
+        
+        return self
+    
+    def click_upload_button(self, time: float = 2):
+        """Click the upload button and wait up to ``time`` seconds for the response"""
         self._click(self.__upload_button)
         
         # Wait for the response (either success or error)
         try:
-            self._wait_until_element_is_visible(self.__success_message)
+            self._wait_until_element_is_visible(self.__success_message, time)
         except TimeoutException:
             print("Timeout waiting for response after clicking upload button")
         
@@ -75,8 +83,7 @@ class FileUploadPage(BasePage):
             str: The text of the success message
         """
         try:
-            self._wait_until_element_is_visible(self.__success_message)
-            return self._find(self.__success_message).text
+            return self._wait_for_text(self.__success_message)
         except TimeoutException:
             print("Timeout waiting for success message")
             return ""
@@ -89,21 +96,19 @@ class FileUploadPage(BasePage):
         """
         # Uses the same locator as success message but expects different text
         try:
-            self._wait_until_element_is_visible(self.__error_message)
-            return self._find(self.__error_message).text
+            return self._wait_for_text(self.__error_message)
         except TimeoutException:
             print("Timeout waiting for error message")
             return ""
     
-    def get_uploaded_filename(self):
+    def get_uploaded_filename(self, time: float = 2):
         """Get the name of the successfully uploaded file
         
         Returns:
             str: The name of the uploaded file
         """
         try:
-            self._wait_until_element_is_visible(self.__uploaded_filename)
-            return self._find(self.__uploaded_filename).text
+            return self._wait_for_text(self.__uploaded_filename, time)
         except TimeoutException:
             print("Timeout waiting for uploaded filename")
             return ""
\ No newline at end of file
@@ -5,7 +5,7 @@ from page_objects.base_page import BasePage
 
 
 class LandingPage(BasePage):
-    __url = "https://the-internet.herokuapp.com/"
+    path = ""
     __url_ab_page = "abtest"
     __url_d_and_d_page = "drag_and_drop"
     __url_checkbox_page = "checkboxes"
@@ -21,7 +21,7 @@ class LandingPage(BasePage):
         super().__init__(driver)
 
     def open(self):
-        super().open_url(self.__url)
+        super().open_url(self.path)
 
     def click_ab_testing_link(self):
         super()._click(self.__ab_testing_link)
@@ -0,0 +1,54 @@
+from urllib.parse import urljoin
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from page_objects.ab_testing_page import AbTestingPage
+from page_objects.base_page import BasePage
+from page_objects.checkbox_page import CheckboxesPage
+from page_objects.drag_and_drop_page import DragAndDropPage
+from page_objects.file_upload_page import FileUploadPage
+from page_objects.landing_page import LandingPage
+
+
+class PageRouter:
+    """Brings the session to a page object by the cheapest route
+
+    By default that is a direct get of the page url. Tests marked ``navigation``
+    use click_through=True and arrive the way a user would, through the links on
+    the landing page. Either way nothing happens when the session is already there.
+    """
+
+    # Landing page link that reaches each page object
+    links = {
+        AbTestingPage: LandingPage.click_ab_testing_link,
+        CheckboxesPage: LandingPage.click_checkboxes_testing_link,
+        DragAndDropPage: LandingPage.click_drag_and_drop_testing_link,
+        FileUploadPage: LandingPage.click_file_upload_testing_link,
+    }
+
+    def __init__(self, driver: WebDriver, click_through: bool = False):
+        self._driver = driver
+        self.click_through = click_through
+
+    @staticmethod
+    def url_of(page_class) -> str:
+        if page_class.path is None:
+            raise ValueError(f"{page_class.__name__} has no path and cannot be routed to")
+        return urljoin(BasePage.base_url, page_class.path)
+
+    def is_reachable(self, page_class) -> bool:
+        if self.click_through:
+            return page_class is LandingPage or page_class in self.links
+        return page_class.path is not None
+
+    def arrive(self, page_class):
+        """Navigate to page_class unless the session is already on it and return the page object"""
+        if not self.is_reachable(page_class):
+            raise ValueError(f"No route to {page_class.__name__}")
+        if self._driver.current_url != self.url_of(page_class):
+            if self.click_through and page_class is not LandingPage:
+                landing_page = self.arrive(LandingPage)
+                self.links[page_class](landing_page)
+            else:
+                page_class(self._driver).open_url(page_class.path)
+        return page_class(self._driver)
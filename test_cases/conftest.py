@@ -0,0 +1,28 @@
+import pytest
+
+from utilities.fake_driver import FakeWebDriver
+
+
+class CountingFakeWebDriver(FakeWebDriver):
+    """FakeWebDriver that counts the commands it is sent, each one a round trip to a real browser
+
+    Only commands for which ``counted(command, params)`` is true are counted, every one by default.
+    Tests set ``counted`` to narrow it down, e.g. to the scripts that install page helpers.
+    """
+
+    def __init__(self, counted=None):
+        super().__init__()
+        self.counted = counted or (lambda command, params: True)
+        self.commands = []
+
+    def execute(self, driver_command: str, params: dict = None) -> dict:
+        if self.counted(driver_command, params or {}):
+            self.commands.append(driver_command)
+        return super().execute(driver_command, params)
+
+
+@pytest.fixture
+def fake_driver():
+    driver = CountingFakeWebDriver()
+    yield driver
+    driver.quit()
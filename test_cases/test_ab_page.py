@@ -6,11 +6,11 @@ from page_objects.landing_page import LandingPage
 
 
 @pytest.mark.smoke
+@pytest.mark.navigation
 class TestAbPage:
-    def test_login_to_ab_link(self, driver):
+    def test_login_to_ab_link(self, driver, router):
         # Go to webpage
-        landing_page = LandingPage(driver)
-        landing_page.open()
+        landing_page = router.arrive(LandingPage)
 
         # Click on A/B Testing
         landing_page.click_ab_testing_link()
@@ -23,10 +23,9 @@ class TestAbPage:
         elemental_selenium = elementalSeleniumPage(driver)
         elemental_selenium.elemental_landing_page()
 
-    def test_multiple_login_to_ab_link(self, driver):
+    def test_multiple_login_to_ab_link(self, driver, router):
         # Go to webpage
-        landing_page = LandingPage(driver)
-        landing_page.open()
+        landing_page = router.arrive(LandingPage)
 
         for run_count in range(6):
             # Click on A/B Testing
@@ -0,0 +1,75 @@
+import hashlib
+import json
+
+import pytest
+from selenium.webdriver.remote.command import Command
+
+from utilities.asset_registry import AssetError, AssetRegistry
+
+
+class StubRemoteDriver:
+    """Answers UPLOAD_FILE like a remote end and counts how often it was sent"""
+
+    _is_remote = True
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.uploads = 0
+
+    def execute(self, driver_command, params=None):
+        assert driver_command == Command.UPLOAD_FILE
+        self.uploads += 1
+        return {"value": f"/remote/{self.session_id}/{self.uploads}"}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    asset_file = tmp_path / "notes.txt"
+    asset_file.write_text("hello")
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({
+        "notes": {"path": str(asset_file), "size": 5, "sha256": hashlib.sha256(b"hello").hexdigest()},
+        "zeros": {"generate": {"name": "zeros.bin", "size": 3 * 1024 * 1024 + 1, "content": "sparse"}},
+    }))
+    return AssetRegistry(str(manifest), str(tmp_path / "cache"))
+
+
+@pytest.mark.unit
+class TestAssetRegistry:
+    def test_generated_asset_is_written_once_with_its_hash(self, registry):
+        asset = registry.get("zeros")
+
+        with open(asset.path, "rb") as asset_file:
+            content = asset_file.read()
+        assert asset.name == "zeros.bin" and len(content) == asset.size
+        assert asset.sha256 == hashlib.sha256(content).hexdigest()
+        assert AssetRegistry(registry.manifest_path, registry.cache_dir).get("zeros").sha256 == asset.sha256
+
+    def test_changed_file_no_longer_matches_the_manifest(self, registry, tmp_path):
+        (tmp_path / "notes.txt").write_text("HELLO")
+
+        with pytest.raises(AssetError, match="no longer matches the manifest"):
+            registry.get("notes")
+        assert registry.resolve("not/a/key.txt") == "not/a/key.txt"
+
+    def test_remote_upload_is_sent_once_per_session_and_content(self, registry):
+        first, second = StubRemoteDriver("first"), StubRemoteDriver("second")
+
+        paths = [registry.upload_path(first, "notes"), registry.upload_path(first, "notes")]
+        registry.upload_path(second, "notes")
+
+        assert paths == ["/remote/first/1", "/remote/first/1"]
+        assert first.uploads == 1 and second.uploads == 1
+        assert len(registry._payloads) == 1
+
+    def test_plain_path_is_uploaded_without_being_registered(self, registry, tmp_path):
+        driver = StubRemoteDriver("first")
+        report = tmp_path / "report.csv"
+        report.write_text("a,b")
+
+        assert registry.upload_path(driver, str(report)) == "/remote/first/1"
+        assert registry.upload_path(driver, str(report)) == "/remote/first/1"
+        assert driver.uploads == 1
+        assert str(report) not in registry
+        with pytest.raises(AssetError, match="does not exist"):
+            registry.upload_path(driver, str(tmp_path / "missing.csv"))
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from selenium.common import NoSuchElementException, TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from page_objects.aio.ab_testing_page import AbTestingPage
+from page_objects.aio.checkbox_page import CheckboxesPage
+from page_objects.aio.drag_and_drop_page import DragAndDropPage
+from page_objects.aio.landing_page import LandingPage
+from utilities.async_webdriver import DriverService, start_session, w3c_command
+from utilities import metrics
+from utilities.fake_w3c_server import FakeW3CServer
+from utilities.metrics import TestMetrics
+from utilities.session_broker import PROJECT_ROOT
+
+
+@pytest.fixture(scope="module")
+def w3c_server():
+    server = FakeW3CServer().start()
+    yield server
+    server.stop()
+
+
+def driver_binary(directory, body: str) -> str:
+    """An executable taking ``--port=N`` like chromedriver does, running body"""
+    path = os.path.join(directory, "fakedriver")
+    with open(path, "w") as script:
+        script.write(f"#!{sys.executable}\nimport sys\nsys.path.insert(0, {PROJECT_ROOT!r})\n{body}\n")
+    os.chmod(path, 0o755)
+    return path
+
+
+def run_session(server, scenario):
+    """Run ``await scenario(driver)`` on a new fake session and quit it afterwards"""
+    async def run():
+        driver = await start_session("fake", server.url)
+        try:
+            return await scenario(driver)
+        finally:
+            await driver.quit()
+    return asyncio.run(run())
+
+
+@pytest.mark.unit
+class TestAsyncPages:
+    def test_landing_to_ab_testing_journey(self, w3c_server):
+        async def journey(driver):
+            landing_page = await LandingPage(driver).open()
+            await landing_page.click_ab_testing_link()
+            ab_testing_page = await AbTestingPage(driver).ab_landing_page_loaded_successfully()
+            return await ab_testing_page.current_url()
+
+        assert run_session(w3c_server, journey).endswith("/abtest")
+        assert not w3c_server.sessions
+
+    def test_many_sessions_share_one_event_loop(self, w3c_server):
+        async def journey(driver):
+            landing_page = await LandingPage(driver).open()
+            await landing_page.click_checkboxes_testing_link()
+            checkboxes_page = CheckboxesPage(driver)
+            await checkboxes_page.select_checkbox(1)
+            return await checkboxes_page.get_all_checkboxes_state()
+
+        async def run_all():
+            drivers = await asyncio.gather(*(start_session("fake", w3c_server.url) for _ in range(12)))
+            try:
+                return await asyncio.gather(*(journey(driver) for driver in drivers))
+            finally:
+                await asyncio.gather(*(driver.quit() for driver in drivers))
+
+        assert asyncio.run(run_all()) == [[True, True]] * 12
+
+    def test_sessions_with_their_own_metrics_keep_them_apart(self, w3c_server):
+        async def journey(driver, index):
+            driver.metrics = TestMetrics(f"session {index}")
+            landing_page = await LandingPage(driver).open()
+            if index:
+                await landing_page.click_checkboxes_testing_link()
+            return driver.metrics
+
+        async def run_all():
+            drivers = await asyncio.gather(*(start_session("fake", w3c_server.url) for _ in range(3)))
+            try:
+                return await asyncio.gather(*(journey(driver, index) for index, driver in enumerate(drivers)))
+            finally:
+                await asyncio.gather(*(driver.quit() for driver in drivers))
+
+        test_waits = len(metrics.current().waits)
+        first, *others = asyncio.run(run_all())
+
+        assert metrics.current().waits[test_waits:] == []
+        assert first.waits == [] and "page_objects.aio.landing_page.LandingPage" in first.page_classes
+        # Each click waits for the link and then for the url, once per session
+        assert [[wait["wait"].split(":")[0] for wait in session.waits] for session in others] == [
+            ["LandingPage", "LandingPage"]
+        ] * 2
+
+    def test_script_helpers_and_element_arguments(self, w3c_server):
+        async def drag(driver):
+            drag_and_drop_page = await DragAndDropPage(driver).open()
+            await drag_and_drop_page.drag_and_drop_js()
+            return await drag_and_drop_page.get_columns_text()
+
+        assert run_session(w3c_server, drag) == {"a": "B", "b": "A"}
+
+    def test_errors_are_selenium_exceptions(self, w3c_server):
+        async def missing(driver):
+            await driver.get("https://the-internet.herokuapp.com/")
+            with pytest.raises(NoSuchElementException):
+                await driver.find_element(By.ID, "does-not-exist")
+            landing_page = LandingPage(driver)
+            assert not await landing_page.is_displayed((By.ID, "does-not-exist"))
+            with pytest.raises(TimeoutException, match="visibility of"):
+                await landing_page._wait_until_element_is_visible((By.ID, "does-not-exist"), time=0.2)
+
+        run_session(w3c_server, missing)
+
+    def test_driver_binaries_are_started_once_ready(self, tmp_path):
+        path = driver_binary(tmp_path, "import runpy; runpy.run_module('utilities.fake_w3c_server', run_name='__main__')")
+
+        async def run():
+            driver = await start_session("fake", driver_path=path)
+            service = driver.service
+            await driver.get("https://the-internet.herokuapp.com/")
+            await driver.quit()
+            return service
+
+        service = asyncio.run(run())
+        assert service.process.poll() is not None
+        blocking = DriverService(path)
+        assert w3c_command(blocking.url, "GET", "/status")["ready"]
+        blocking.stop()
+
+    def test_driver_binary_that_exits_is_reported(self, tmp_path):
+        with pytest.raises(WebDriverException, match="did not start listening"):
+            asyncio.run(DriverService.start(driver_binary(tmp_path, "sys.exit(1)")))
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utilities.browser_matrix import BrowserMatrixReport, parse_browsers, parse_worker_limits, strip_browser
+
+
+def report(nodeid, when="call", duration=1.0, outcome="passed"):
+    return SimpleNamespace(
+        nodeid=nodeid, when=when, duration=duration,
+        passed=outcome == "passed", failed=outcome == "failed", skipped=outcome == "skipped",
+    )
+
+
+@pytest.mark.unit
+class TestBrowserMatrix:
+    def test_browser_list_and_worker_limits_are_parsed(self):
+        browsers = parse_browsers("Firefox, chrome,firefox")
+
+        assert browsers == ["firefox", "chrome"]
+        assert parse_worker_limits("firefox=2, chrome=1", browsers) == {"firefox": 2, "chrome": 1}
+        with pytest.raises(ValueError, match="Unknown browser 'safari'"):
+            parse_browsers("firefox,safari")
+        with pytest.raises(ValueError, match="not in --browser"):
+            parse_worker_limits("edge=1", browsers)
+
+    def test_results_of_one_test_are_merged_across_browsers(self):
+        matrix = BrowserMatrixReport(["firefox", "chrome"], missing=["chrome"])
+        matrix.pytest_runtest_logreport(report("test_a.py::test_upload[firefox-1KB]", "setup", 0.5))
+        matrix.pytest_runtest_logreport(report("test_a.py::test_upload[firefox-1KB]", "call", 1.5))
+        matrix.pytest_runtest_logreport(report("test_a.py::test_upload[chrome-1KB]", "setup", 0.0, "skipped"))
+        matrix.pytest_runtest_logreport(report("test_a.py::test_unit", "call", 9.0))
+
+        assert strip_browser("test_a.py::test_upload[firefox-1KB]", ["firefox"]) == "test_a.py::test_upload[1KB]"
+        assert matrix.rows() == [("test_a.py::test_upload[1KB]", ["2.00s", "skipped"])]
+        assert matrix.totals()["chrome"]["skipped"] == 1
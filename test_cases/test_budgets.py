@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+from utilities.budgets import BudgetBaseline, measure, violations
+from utilities.driver_resolver import PROJECT_ROOT
+
+# Registers the plugin the way conftest.py does, on options of its own
+BUDGET_CONFTEST = """
+import pytest
+
+from utilities import metrics
+from utilities.budgets import BudgetBaseline, BudgetPlugin
+
+
+def pytest_addoption(parser):
+    parser.addoption("--soft", action="store_true")
+    parser.addoption("--baseline")
+    parser.addoption("--record", action="store_true")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "budget(seconds, roundtrips, waits): performance budget")
+    baseline = config.getoption("--baseline")
+    config.pluginmanager.register(BudgetPlugin(
+        soft=config.getoption("--soft"),
+        baseline=BudgetBaseline(baseline, drift=0.0) if baseline else None,
+        record=config.getoption("--record"),
+    ), "budgets")
+
+
+def pytest_runtest_setup(item):
+    metrics.start(item.nodeid)
+"""
+
+# Waits are recorded by hand so the numbers do not depend on how fast the machine is
+BUDGET_TESTS = """
+import os
+
+import pytest
+
+from utilities import metrics
+
+WAITS = float(os.environ.get("WAITS", "0.3"))
+
+
+@pytest.mark.budget(waits=0.1)
+def test_over_budget():
+    metrics.current().record_wait("slow page", 0.3, False)
+
+
+@pytest.mark.budget(waits=0.5)
+def test_within_budget():
+    metrics.current().record_wait("slow page", 0.3, False)
+
+
+def test_against_the_baseline():
+    metrics.current().record_wait("slow page", WAITS, False)
+"""
+
+
+@pytest.fixture
+def budget_suite(pytester, monkeypatch):
+    """Runs BUDGET_TESTS in a pytest process of its own, so its metrics stay apart from this run's"""
+    monkeypatch.setenv("PYTHONPATH", PROJECT_ROOT)
+    pytester.makeconftest(BUDGET_CONFTEST)
+    pytester.makepyfile(test_suite=BUDGET_TESTS)
+    return lambda *args: pytester.runpytest_subprocess("-p", "no:cacheprovider", *args)
+
+
+@pytest.mark.unit
+class TestBudgets:
+    def test_violations_only_report_exceeded_limits(self):
+        found = violations(
+            {"seconds": 1.0, "roundtrips": 10, "waits": 0.5},
+            {"seconds": 1.5, "roundtrips": 10, "waits": 0.1},
+            "budget marker",
+        )
+
+        assert found == ["seconds 1.500s > 1.000s (budget marker)"]
+
+    def test_missing_round_trip_count_is_not_a_violation(self):
+        assert violations({"roundtrips": 1}, {"roundtrips": None}, "budget marker") == []
+
+    def test_baseline_tolerates_drift(self, tmp_path):
+        baseline = BudgetBaseline(str(tmp_path / "baseline.json"), drift=0.5)
+        baseline.record("test_a", {"seconds": 2.0, "roundtrips": 20, "waits": None})
+        baseline.save()
+
+        limits = BudgetBaseline(baseline.path, drift=0.5).limits_for("test_a")
+
+        assert limits == {"seconds": 3.0, "roundtrips": 30}
+        assert BudgetBaseline(baseline.path, drift=0.5).limits_for("test_b") == {}
+
+    def test_small_round_trip_baselines_round_up(self, tmp_path):
+        baseline = BudgetBaseline(str(tmp_path / "baseline.json"), drift=0.1)
+        baseline.record("test_a", {"seconds": None, "roundtrips": 7, "waits": None})
+        baseline.record("test_b", {"seconds": None, "roundtrips": 25, "waits": None})
+
+        assert baseline.limits_for("test_a") == {"roundtrips": 8}
+        assert baseline.limits_for("test_b") == {"roundtrips": 28}
+
+    def test_zero_baselines_keep_an_absolute_floor(self, tmp_path):
+        baseline = BudgetBaseline(str(tmp_path / "baseline.json"), drift=0.1)
+        baseline.record("test_a", {"seconds": 0.0, "roundtrips": 0, "waits": 0.0})
+
+        limits = baseline.limits_for("test_a")
+
+        assert limits == {"seconds": 0.05, "roundtrips": 1, "waits": 0.05}
+        assert violations(limits, {"seconds": 0.01, "roundtrips": 1, "waits": 0.02}, "baseline") == []
+
+    def test_browser_startup_is_left_out_of_wall_time(self):
+        class CallReport:
+            duration = 2.5
+
+        assert measure(CallReport(), driver_start=2.0)["seconds"] == 0.5
+        assert measure(CallReport())["seconds"] == 2.5
+
+
+@pytest.mark.unit
+class TestBudgetPlugin:
+    def test_strict_budgets_fail_tests_over_their_marker(self, budget_suite):
+        result = budget_suite()
+
+        result.assert_outcomes(passed=2, failed=1)
+        result.stdout.fnmatch_lines([
+            "*test_over_budget*",
+            "Performance budget exceeded: waits 0.300s > 0.100s (budget marker)",
+        ])
+        assert "test_within_budget FAILED" not in result.stdout.str()
+
+    def test_soft_budgets_only_warn(self, budget_suite):
+        result = budget_suite("--soft")
+
+        result.assert_outcomes(passed=3, warnings=1)
+        result.stdout.fnmatch_lines(["*BudgetExceeded: Performance budget exceeded: waits 0.300s > 0.100s*"])
+
+    def test_recorded_baseline_is_checked_on_the_next_run(self, budget_suite, pytester, monkeypatch):
+        baseline = pytester.path / "baseline.json"
+
+        budget_suite("--baseline", str(baseline), "--record").assert_outcomes(passed=3)
+        recorded = json.loads(baseline.read_text())
+        assert recorded["test_suite.py::test_against_the_baseline"]["waits"] == 0.3
+        # Over the marker, but a recording run checks nothing
+        assert "test_suite.py::test_over_budget" in recorded
+
+        monkeypatch.setenv("WAITS", "0.4")
+        result = budget_suite("--baseline", str(baseline), "-k", "baseline")
+
+        result.assert_outcomes(failed=1, deselected=2)
+        result.stdout.fnmatch_lines(["Performance budget exceeded: waits 0.400s > 0.350s (baseline +0%)"])
@@ -1,22 +1,17 @@
 import pytest
 
-from page_objects.landing_page import LandingPage
 from page_objects.base_page import BasePage
 from page_objects.checkbox_page import CheckboxesPage
 
 @pytest.mark.checkboxes
 class TestCheckboxes:
-    def test_checkbox_interaction(self, driver):
+    @pytest.mark.navigation
+    def test_checkbox_interaction(self, router):
         """Test interaction with checkboxes - selection, deselection and state verification"""
-        # Go to webpage
-        landing_page = LandingPage(driver)
-        landing_page.open()
-        
-        # Click on Checkboxes link
-        landing_page.click_checkboxes_testing_link()
+        # Arrive at the checkboxes page
+        checkboxes_page = router.arrive(CheckboxesPage)
         
         # Verify checkboxes page is loaded
-        checkboxes_page = CheckboxesPage(driver)
         checkboxes_page.checkboxes_page_loaded_successfully()
         
         # Verify initial state (typically checkbox 1 is unchecked, checkbox 2 is checked)
@@ -43,17 +38,12 @@ class TestCheckboxes:
         assert not checkboxes_page.is_checkbox_selected(1), "Checkbox 1 should be unchecked after toggling back"
         assert checkboxes_page.is_checkbox_selected(2), "Checkbox 2 should be checked after toggling back"
 
-    def test_checkbox_state_after_page_refresh(self, driver):
+    def test_checkbox_state_after_page_refresh(self, driver, router):
         """Test if checkbox states persist after page refresh"""
-        # Go to webpage
-        landing_page = LandingPage(driver)
-        landing_page.open()
-        
-        # Click on Checkboxes link
-        landing_page.click_checkboxes_testing_link()
+        # Arrive at the checkboxes page
+        checkboxes_page = router.arrive(CheckboxesPage)
         
         # Verify checkboxes page is loaded
-        checkboxes_page = CheckboxesPage(driver)
         checkboxes_page.checkboxes_page_loaded_successfully()
         
         # Record initial state
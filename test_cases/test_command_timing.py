@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from page_objects.checkbox_page import CheckboxesPage
+from utilities import metrics
+from utilities.command_timing import CommandTimingReport, instrument
+from utilities.fake_driver import FakeWebDriver
+from utilities.metrics import TestMetrics
+
+
+class CallReport:
+    when = "call"
+
+    def __init__(self, nodeid: str, user_properties: list):
+        self.nodeid = nodeid
+        self.user_properties = user_properties
+
+
+@pytest.mark.unit
+class TestCommandTiming:
+    def test_commands_are_counted_and_attributed_to_page_methods(self, tmp_path, monkeypatch):
+        driver = FakeWebDriver()
+        assert instrument(instrument(driver)) is driver
+        # Recorded apart from the running test's own metrics, which monkeypatch puts back afterwards
+        test_metrics = TestMetrics("test_cases/test_checkboxes.py::test_a")
+        monkeypatch.setattr(metrics, "_current", test_metrics)
+        try:
+            checkboxes_page = CheckboxesPage(driver).open()
+            states = checkboxes_page.get_all_checkboxes_state()
+            driver.title
+        finally:
+            driver.quit()
+            monkeypatch.undo()
+
+        issuers = [(command["command"], command["issuer"]) for command in test_metrics.commands]
+        assert states == [False, True]
+        # BasePage helpers are reported under the page method that called them, other calls under the test
+        assert issuers == [
+            ("get", "CheckboxesPage.open"),
+            ("w3cExecuteScript", "CheckboxesPage.get_all_checkboxes_state"),
+            ("getTitle", "test_commands_are_counted_and_attributed_to_page_methods"),
+            ("quit", "test_commands_are_counted_and_attributed_to_page_methods"),
+        ]
+
+        report = CommandTimingReport(str(tmp_path / "commands.json"))
+        report.pytest_runtest_logreport(CallReport(test_metrics.nodeid, test_metrics.to_properties()))
+        report.pytest_sessionfinish(None)
+        sidecar = json.loads((tmp_path / "commands.json").read_text())
+
+        assert sidecar["tests"][test_metrics.nodeid]["roundtrips"] == len(issuers)
+        assert sidecar["commands"]["get"]["count"] == 1
+        assert sum(values["count"] for values in sidecar["commands"].values()) == len(issuers)
+        assert {call["test"] for call in sidecar["slowest"]} == {test_metrics.nodeid}
@@ -1,22 +1,17 @@
 import pytest
 
 from page_objects.drag_and_drop_page import DragAndDropPage
-from page_objects.landing_page import LandingPage
 from page_objects.base_page import BasePage
 
 
 @pytest.mark.dragdrop
 class TestDragAndDrop:
-    def test_drag_and_drop_success(self, driver):
-        # Go to webpage
-        landing_page = LandingPage(driver)
-        landing_page.open()
-
-        # Click on Drag and Drop
-        landing_page.click_drag_and_drop_testing_link()
+    @pytest.mark.navigation
+    def test_drag_and_drop_success(self, router):
+        # Arrive at Drag and Drop
+        drag_and_drop_page = router.arrive(DragAndDropPage)
 
         # Verify page is on Drag and Drop
-        drag_and_drop_page = DragAndDropPage(driver)
         drag_and_drop_page.d_and_d_page_loaded_successfully()
         
         # Perform drag and drop
@@ -26,16 +21,11 @@ class TestDragAndDrop:
         assert drag_and_drop_page.get_column_text("a") == "B", "Column A should contain 'A' after reverting drag and drop"
         assert drag_and_drop_page.get_column_text("b") == "A", "Column B should contain 'B' after reverting drag and drop"
 
-    def test_drag_and_drop_reverse(self, driver):
-         # Go to webpage
-        landing_page = LandingPage(driver)
-        landing_page.open()
-
-        # Click on Drag and Drop
-        landing_page.click_drag_and_drop_testing_link()
+    def test_drag_and_drop_reverse(self, router):
+        # Arrive at Drag and Drop
+        drag_and_drop_page = router.arrive(DragAndDropPage)
 
         # Verify page is on Drag and Drop
-        drag_and_drop_page = DragAndDropPage(driver)
         drag_and_drop_page.d_and_d_page_loaded_successfully()
         
         # Perform drag and drop twice to revert
@@ -48,17 +38,12 @@ class TestDragAndDrop:
         assert drag_and_drop_page.get_column_text("b") == "B", "Column B should contain 'B' after reverting drag and drop"
 
     
-    def test_drag_and_drop_with_page_resize(self, driver):
+    def test_drag_and_drop_with_page_resize(self, driver, router):
         """Test if drag and drop works after resizing browser window"""
-        # Go to webpage
-        landing_page = LandingPage(driver)
-        landing_page.open()
-
-        # Click on Drag and Drop
-        landing_page.click_drag_and_drop_testing_link()
+        # Arrive at Drag and Drop
+        drag_and_drop_page = router.arrive(DragAndDropPage)
 
         # Verify page is on Drag and Drop
-        drag_and_drop_page = DragAndDropPage(driver)
         drag_and_drop_page.d_and_d_page_loaded_successfully()
         
         # Resize browser window
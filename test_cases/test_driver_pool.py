@@ -0,0 +1,115 @@
+import pytest
+
+from utilities.driver_pool import DriverPool
+
+
+class StubSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver.current_window_handle = handle
+
+
+class StubDriver:
+    """Records the commands the pool sends so the reset sequence can be checked without a browser"""
+
+    def __init__(self, fail_reset=False):
+        self.window_handles = ["main"]
+        self.current_window_handle = "main"
+        self.urls = {"main": "https://the-internet.herokuapp.com/checkboxes"}
+        self.switch_to = StubSwitchTo(self)
+        self.size = {"width": 1280, "height": 800}
+        self.commands = []
+        self.fail_reset = fail_reset
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        return self.urls[self.current_window_handle]
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+    def delete_all_cookies(self):
+        if self.fail_reset:
+            raise RuntimeError("browser went away")
+        self.commands.append("delete_all_cookies")
+
+    def execute_script(self, script):
+        self.commands.append("execute_script")
+
+    def get(self, url):
+        self.urls[self.current_window_handle] = url
+        self.commands.append(f"get {url}")
+
+    def get_window_size(self):
+        return dict(self.size)
+
+    def set_window_size(self, width, height):
+        self.size = {"width": width, "height": height}
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.mark.unit
+class TestDriverPool:
+    def test_session_is_reused_and_reset(self):
+        created = []
+        pool = DriverPool(lambda browser: created.append(StubDriver()) or created[-1])
+
+        first = pool.acquire("firefox")
+        first.window_handles.append("child")
+        first.urls["child"] = first.urls["main"]
+        first.set_window_size(800, 600)
+        pool.release(first)
+        second = pool.acquire("firefox")
+
+        assert second is first and len(created) == 1
+        assert first.window_handles == ["main"]
+        assert first.size == {"width": 1280, "height": 800}
+        assert first.commands == ["delete_all_cookies", "execute_script", "get about:blank"]
+
+    def test_every_origin_left_open_is_cleared(self):
+        pool = DriverPool(lambda browser: StubDriver())
+
+        driver = pool.acquire("firefox")
+        driver.window_handles.append("child")
+        driver.urls["child"] = "https://elementalselenium.com/tips"
+        pool.release(driver)
+
+        assert driver.commands == [
+            "delete_all_cookies", "execute_script",
+            "get https://elementalselenium.com/", "delete_all_cookies", "execute_script",
+            "get about:blank",
+        ]
+
+    def test_blank_pages_have_nothing_to_clear(self):
+        pool = DriverPool(lambda browser: StubDriver())
+
+        driver = pool.acquire("firefox")
+        driver.urls["main"] = "about:blank"
+        pool.release(driver)
+
+        assert driver.commands == ["get about:blank"]
+
+    def test_session_is_recycled_after_max_uses(self):
+        pool = DriverPool(lambda browser: StubDriver(), max_uses=2)
+
+        first = pool.acquire("chrome")
+        pool.release(first)
+        assert pool.acquire("chrome") is first
+        pool.release(first)
+
+        assert first.quit_called
+        assert pool.acquire("chrome") is not first
+
+    def test_session_is_recycled_when_reset_fails(self):
+        pool = DriverPool(lambda browser: StubDriver(fail_reset=True))
+
+        first = pool.acquire("edge")
+        pool.release(first)
+
+        assert first.quit_called
+        assert pool.acquire("edge") is not first
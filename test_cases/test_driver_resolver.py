@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from utilities import driver_resolver
+from utilities.driver_resolver import DriverResolutionError, resolve_drivers
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Project cache in tmp_path with a chromedriver pinned for the platform; going online fails the test"""
+    binary = tmp_path / "drivers" / "chromedriver" / "linux64" / "120.0.6099.109" / "chromedriver"
+    binary.parent.mkdir(parents=True)
+    binary.write_text("")
+    lock = {"linux64": {"chrome": {"version": "120.0.6099.109",
+                                   "path": "drivers/chromedriver/linux64/120.0.6099.109/chromedriver"}}}
+
+    def online(browser, entry):
+        raise AssertionError(f"{browser} was resolved online")
+
+    monkeypatch.setattr(driver_resolver, "CACHE_ROOT", str(tmp_path))
+    monkeypatch.setattr(driver_resolver, "load_lockfile", lambda: lock)
+    monkeypatch.setattr(driver_resolver, "platform_key", lambda: "linux64")
+    monkeypatch.setattr(driver_resolver, "_resolve_online", online)
+    return binary
+
+
+@pytest.mark.unit
+class TestOfflineResolution:
+    def test_pinned_binary_is_taken_from_the_cache(self, cache):
+        resolved = resolve_drivers(["chrome", "fake"], offline=True)
+
+        assert list(resolved) == ["chrome"]
+        assert resolved["chrome"].path == os.path.join(str(cache.parent), "chromedriver")
+        assert (resolved["chrome"].version, resolved["chrome"].source) == ("120.0.6099.109", "lockfile")
+
+    def test_browser_without_a_pin_is_an_error(self, cache):
+        with pytest.raises(DriverResolutionError, match="No firefox driver pinned for linux64"):
+            resolve_drivers(["firefox"], offline=True)
+
+    def test_pinned_binary_missing_from_the_cache_is_an_error(self, cache):
+        cache.unlink()
+
+        with pytest.raises(DriverResolutionError, match="Pinned chrome driver 120.0.6099.109 is not cached"):
+            resolve_drivers(["chrome"], offline=True)
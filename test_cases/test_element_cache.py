@@ -0,0 +1,62 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+from page_objects.checkbox_page import CheckboxesPage
+from page_objects.file_upload_page import FileUploadPage
+from utilities import metrics
+
+HEADER = (By.TAG_NAME, "h3")
+
+
+@pytest.mark.unit
+class TestElementCache:
+    def test_second_lookup_is_a_cache_hit(self, fake_driver):
+        checkboxes_page = CheckboxesPage(fake_driver).open()
+        hits = metrics.current().cache_hits
+
+        first = checkboxes_page._find(HEADER)
+        commands = len(fake_driver.commands)
+        second = checkboxes_page._find(HEADER)
+
+        assert second is first
+        assert len(fake_driver.commands) == commands
+        assert metrics.current().cache_hits == hits + 1
+
+    def test_click_that_submits_drops_cached_handles(self, fake_driver, tmp_path):
+        upload = tmp_path / "upload.txt"
+        upload.write_text("cache")
+        file_upload_page = FileUploadPage(fake_driver).open()
+        before_submit = file_upload_page._wait_until_element_is_visible(HEADER)
+        file_upload_page.choose_file(str(upload))
+        stale_refetches = metrics.current().stale_refetches
+
+        file_upload_page._click((By.ID, "file-submit"))
+
+        assert file_upload_page._cached(HEADER) is None
+        after_submit = file_upload_page._wait_until_element_is_visible(HEADER)
+        assert after_submit.id != before_submit.id
+        assert after_submit.text == "File Uploaded!"
+        assert metrics.current().stale_refetches == stale_refetches
+
+    def test_stale_handle_is_fetched_again(self, fake_driver):
+        checkboxes_page = CheckboxesPage(fake_driver).open()
+        stale_handle = checkboxes_page._find(HEADER)
+        # Reload without a WebDriver command, as a script would, so the cache still holds the old handle
+        fake_driver._traverse(0)
+        stale_refetches = metrics.current().stale_refetches
+
+        assert checkboxes_page.is_displayed(HEADER)
+        assert metrics.current().stale_refetches == stale_refetches + 1
+        assert checkboxes_page._find(HEADER).id != stale_handle.id
+
+    def test_navigation_outside_the_page_object_drops_cached_handles(self, fake_driver):
+        checkboxes_page = CheckboxesPage(fake_driver).open()
+        checkboxes_page._find(HEADER)
+
+        fake_driver.get(fake_driver.current_url)
+        assert checkboxes_page._cached(HEADER) is None
+
+        checkboxes_page._find(HEADER)
+        fake_driver.back()
+        assert checkboxes_page._cached(HEADER) is None
+        assert checkboxes_page._find(HEADER).text == "Checkboxes"
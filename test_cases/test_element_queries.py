@@ -0,0 +1,43 @@
+import pytest
+from selenium.common import JavascriptException
+from selenium.webdriver.common.by import By
+
+from page_objects.checkbox_page import CheckboxesPage
+
+CHECKBOXES = (By.CSS_SELECTOR, "#checkboxes input")
+
+
+@pytest.mark.unit
+class TestElementQueries:
+    def test_several_locators_are_read_in_one_call(self, fake_driver):
+        checkboxes_page = CheckboxesPage(fake_driver).open()
+        calls = len(fake_driver.commands)
+
+        states = checkboxes_page._query_elements({
+            "header": ((By.TAG_NAME, "h3"), ("text", "displayed")),
+            "checkboxes": (CHECKBOXES, ("selected", "@type", "value")),
+            "missing": ((By.ID, "does-not-exist"), ("text",)),
+        })
+
+        assert len(fake_driver.commands) == calls + 1
+        assert states["header"] == [{"text": "Checkboxes", "displayed": True}]
+        assert [(state["selected"], state["@type"]) for state in states["checkboxes"]] == [
+            (False, "checkbox"), (True, "checkbox")
+        ]
+        assert states["missing"] == []
+
+    def test_unsupported_field_is_a_script_error(self, fake_driver):
+        checkboxes_page = CheckboxesPage(fake_driver).open()
+
+        with pytest.raises(JavascriptException, match="Unsupported field size"):
+            checkboxes_page._query_elements({"checkboxes": (CHECKBOXES, ("size",))})
+
+    def test_checkbox_state_takes_one_call_once_rendered(self, fake_driver):
+        checkboxes_page = CheckboxesPage(fake_driver).open()
+        calls = len(fake_driver.commands)
+
+        assert checkboxes_page.get_all_checkboxes_state() == [False, True]
+        assert checkboxes_page.is_checkbox_selected(2)
+        assert len(fake_driver.commands) == calls + 2
+        with pytest.raises(ValueError, match="Checkbox number 3 is out of range"):
+            checkboxes_page.is_checkbox_selected(3)
@@ -0,0 +1,86 @@
+import base64
+import gzip
+import json
+
+import pytest
+
+from utilities.driver_resolver import PROJECT_ROOT
+from utilities.failure_artifacts import ArtifactWriter, artifact_name, capture
+from utilities.fake_driver import FakeWebDriver
+
+# A browser whose screenshot cannot be decoded, so writing its artifacts fails
+ARTIFACTS_CONFTEST = """
+import pytest
+
+from utilities.failure_artifacts import FailureArtifacts
+
+
+class BrokenScreenshotDriver:
+    current_url = "http://site/"
+
+    def get_screenshot_as_base64(self):
+        return "not base64!"
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(FailureArtifacts("artifacts"), "failure_artifacts")
+
+
+@pytest.fixture
+def driver():
+    return BrokenScreenshotDriver()
+"""
+
+
+@pytest.mark.unit
+class TestFailureArtifacts:
+    def test_capture_leaves_out_what_the_session_cannot_provide(self):
+        driver = FakeWebDriver()
+        try:
+            driver.get("https://the-internet.herokuapp.com/checkboxes")
+            artifacts = capture(driver)
+        finally:
+            driver.quit()
+
+        assert artifacts["url"] == "https://the-internet.herokuapp.com/checkboxes"
+        assert "checkbox" in artifacts["page_source"]
+        assert "screenshot" not in artifacts and "console" not in artifacts
+
+    def test_writer_decodes_and_compresses_in_the_background(self, tmp_path):
+        writer = ArtifactWriter()
+        directory = tmp_path / artifact_name("test_cases/test_a.py::TestA::test_b[fake]")
+        writer.submit(str(directory), {
+            "url": "http://site/", "screenshot": base64.b64encode(b"png").decode(),
+            "page_source": "<html></html>", "console": [{"level": "SEVERE", "message": "boom"}],
+        }, {"test": "test_a", "when": "call"})
+        writer.close()
+
+        assert directory.name == "test_a.py-TestA-test_b-fake"
+        assert (directory / "screenshot.png").read_bytes() == b"png"
+        assert gzip.decompress((directory / "page.html.gz").read_bytes()) == b"<html></html>"
+        assert json.loads((directory / "failure.json").read_text())["url"] == "http://site/"
+        assert json.loads((directory / "console.json").read_text())[0]["message"] == "boom"
+
+    def test_writer_keeps_going_after_a_bad_artifact(self, tmp_path):
+        writer = ArtifactWriter()
+        writer.submit(str(tmp_path / "bad-screenshot"), {"screenshot": "not base64!"}, {"test": "test_a"})
+        writer.submit(str(tmp_path / "bad-console"), {"console": [object()]}, {"test": "test_b"})
+        writer.submit(str(tmp_path / "good"), {"url": "http://site/"}, {"test": "test_c"})
+        writer.close()
+
+        assert [error.split(": ")[1] for error in writer.errors] == ["Error", "TypeError"]
+        assert json.loads((tmp_path / "good" / "failure.json").read_text())["test"] == "test_c"
+
+    @pytest.mark.parametrize("workers", [[], ["-n", "2"]], ids=["serial", "xdist"])
+    def test_write_errors_are_reported_in_the_terminal_summary(self, pytester, monkeypatch, workers):
+        monkeypatch.setenv("PYTHONPATH", PROJECT_ROOT)
+        pytester.makeconftest(ARTIFACTS_CONFTEST)
+        pytester.makepyfile(test_suite="def test_fails(driver):\n    assert False\n")
+
+        result = pytester.runpytest_subprocess("-p", "no:cacheprovider", *workers)
+
+        result.assert_outcomes(failed=1)
+        result.stdout.fnmatch_lines([
+            "*failure artifacts*",
+            "Could not write failure artifacts to artifacts*test_suite.py-test_fails: Error: *",
+        ])
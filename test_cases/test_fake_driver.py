@@ -0,0 +1,55 @@
+import pytest
+from selenium.common import InvalidSelectorException
+from selenium.webdriver.common.by import By
+
+from page_objects.checkbox_page import CheckboxesPage
+from page_objects.drag_and_drop_page import DragAndDropPage
+from page_objects.file_upload_page import FileUploadPage
+from utilities import metrics
+
+
+@pytest.mark.unit
+class TestFakeDriver:
+    def test_get_checkbox_rejects_out_of_range_numbers(self, fake_driver):
+        checkboxes_page = CheckboxesPage(fake_driver).open()
+
+        assert checkboxes_page.get_checkbox(2).is_selected()
+        with pytest.raises(ValueError, match="Only 2 checkboxes available"):
+            checkboxes_page.get_checkbox(3)
+        with pytest.raises(ValueError):
+            checkboxes_page.get_checkbox(0)
+
+    def test_column_text_follows_drag_and_drop(self, fake_driver):
+        drag_and_drop_page = DragAndDropPage(fake_driver).open()
+        drag_and_drop_page.drag_and_drop_js()
+
+        assert drag_and_drop_page.get_columns_text() == {"a": "B", "b": "A"}
+        assert drag_and_drop_page.get_column_text("A") == "B"
+        with pytest.raises(ValueError, match="Column must be 'a' or 'b'"):
+            drag_and_drop_page.get_column_text("c")
+
+    def test_upload_without_file_shows_server_error(self, fake_driver):
+        file_upload_page = FileUploadPage(fake_driver).open()
+        file_upload_page.verify_page_loaded()
+        fake_driver.find_element(By.ID, "file-submit").click()
+
+        assert file_upload_page.get_error_message() == "Internal Server Error"
+
+    def test_cached_element_is_fetched_again_after_refresh(self, fake_driver):
+        checkboxes_page = CheckboxesPage(fake_driver).open()
+        checkboxes_page.get_checkbox(1)
+        # Reload without a WebDriver command, as a script would, so its cached handle goes stale
+        fake_driver._traverse(0)
+        stale_refetches = metrics.current().stale_refetches
+
+        checkboxes_page.toggle_checkbox(1)
+
+        assert metrics.current().stale_refetches == stale_refetches + 1
+        assert checkboxes_page.get_all_checkboxes_state() == [True, True]
+
+    def test_unsupported_xpath_is_an_invalid_selector(self, fake_driver):
+        fake_driver.get("https://the-internet.herokuapp.com/")
+
+        assert len(fake_driver.find_elements(By.CSS_SELECTOR, "ul > li a[href^='/']")) == 5
+        with pytest.raises(InvalidSelectorException, match="does not support xpath"):
+            fake_driver.find_elements(By.XPATH, "//a[last()]")
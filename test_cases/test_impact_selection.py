@@ -0,0 +1,63 @@
+import pytest
+
+from utilities.test_impact import ImpactMap, ImpactTracker, changed_symbols
+
+PAGE_SOURCE = '''from selenium.webdriver.common.by import By
+
+from page_objects.base_page import BasePage
+
+
+class UploadPage(BasePage):
+    path = "upload"
+
+    __file_input = (By.ID, "file-upload")
+
+    def choose_file(self, path):
+        self._type(self.__file_input, path)
+'''
+
+
+class StubChanges:
+    def __init__(self, page_objects, test_files=()):
+        self.full_suite = None
+        self.test_files = set(test_files)
+        self.page_objects = page_objects
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    impact_map = ImpactMap(str(tmp_path / "impact.json"))
+    impact_map.record("test_cases/test_a.py::test_input", {
+        "classes": ["page_objects.upload_page.UploadPage"], "locators": [["id", "file-upload"]],
+    }, failed=False)
+    impact_map.record("test_cases/test_a.py::test_path", {
+        "classes": ["page_objects.upload_page.UploadPage"], "locators": [],
+    }, failed=False)
+    impact_map.record("test_cases/test_b.py::test_other", {"classes": [], "locators": []}, failed=False)
+    return ImpactTracker(impact_map)
+
+
+@pytest.mark.unit
+class TestImpactSelection:
+    def test_changed_lines_map_to_locators_classes_and_module(self):
+        assert changed_symbols(PAGE_SOURCE, {9}) == {("locator", "UploadPage", ("id", "file-upload"))}
+        assert changed_symbols(PAGE_SOURCE, {12}) == {("class", "UploadPage")}
+        assert changed_symbols(PAGE_SOURCE, {3}) == {("module",)}
+        assert changed_symbols(None, {3}) == set()
+
+    def test_only_tests_that_used_a_changed_locator_are_impacted(self, tracker):
+        tracker.changes = StubChanges({
+            "page_objects.upload_page": {("locator", "UploadPage", ("id", "file-upload"))},
+        })
+
+        assert tracker.is_impacted("test_cases/test_a.py::test_input")
+        assert not tracker.is_impacted("test_cases/test_a.py::test_path")
+        assert not tracker.is_impacted("test_cases/test_b.py::test_other")
+
+    def test_class_changes_own_test_modules_and_failures_are_impacted(self, tracker):
+        tracker.changes = StubChanges({"page_objects.upload_page": {("class", "UploadPage")}}, ["test_cases/test_b.py"])
+        tracker.map.tests["test_cases/test_c.py::test_flaky"] = {"classes": [], "locators": [], "failed": True}
+
+        assert tracker.is_impacted("test_cases/test_a.py::test_path")
+        assert tracker.is_impacted("test_cases/test_b.py::test_other")
+        assert tracker.is_impacted("test_cases/test_c.py::test_flaky")
@@ -0,0 +1,59 @@
+import pytest
+from selenium import webdriver
+
+from utilities.launch_profiles import LaunchStats, default_profile_name, get_profile
+
+CONFIG = {
+    "launch_profile": "default",
+    "ci_launch_profile": "fast",
+    "launch_profiles": {
+        "default": {},
+        "fast": {"headless": True, "page_load_strategy": "eager", "block_images": True, "window_size": [1280, 800]},
+    },
+}
+
+
+@pytest.mark.unit
+class TestLaunchProfiles:
+    def test_ci_selects_the_ci_profile(self, monkeypatch):
+        monkeypatch.delenv("CI", raising=False)
+        assert default_profile_name(CONFIG) == "default"
+
+        monkeypatch.setenv("CI", "true")
+        assert default_profile_name(CONFIG) == "fast"
+        assert default_profile_name({"launch_profile": "headless"}) == "headless"
+        assert default_profile_name({}) == "default"
+
+    def test_profile_settings_are_merged_over_the_defaults(self):
+        fast = get_profile("fast", CONFIG)
+
+        assert (fast.name, fast.headless, fast.page_load_strategy, fast.window_size) == (
+            "fast", True, "eager", [1280, 800]
+        )
+        assert not fast.block_fonts and not fast.disable_gpu
+        default = get_profile("default", CONFIG)
+        assert (default.headless, default.page_load_strategy, default.window_size) == (False, "normal", None)
+        with pytest.raises(ValueError, match="Unknown launch profile slow, available: default, fast"):
+            get_profile("slow", CONFIG)
+
+    def test_profile_is_applied_to_each_browser(self):
+        fast = get_profile("fast", CONFIG)
+
+        chrome = fast.apply("chrome", webdriver.ChromeOptions())
+        firefox = fast.apply("firefox", webdriver.FirefoxOptions())
+
+        assert chrome.page_load_strategy == firefox.page_load_strategy == "eager"
+        assert chrome.arguments == ["--headless=new", "--window-size=1280,800"]
+        assert chrome.experimental_options["prefs"] == {"profile.managed_default_content_settings.images": 2}
+        assert firefox.arguments == ["-headless", "--width=1280", "--height=800"]
+        assert firefox.preferences["permissions.default.image"] == 2
+
+    def test_startups_are_summarised_per_profile(self):
+        stats = LaunchStats()
+        for profile, seconds in (("fast", 1.0), ("default", 3.0), ("fast", 2.0)):
+            stats.record_startup(profile, seconds)
+
+        assert list(stats.summary_lines()) == [
+            "default: 1 session(s), startup mean 3.00s max 3.00s",
+            "fast: 2 session(s), startup mean 1.50s max 2.00s",
+        ]
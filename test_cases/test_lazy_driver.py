@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from page_objects.drag_and_drop_page import DragAndDropPage
+from utilities.driver_resolver import PROJECT_ROOT
+from utilities.fake_driver import FakeWebDriver
+from utilities.lazy_driver import LazyDriver
+from utilities.script_registry import scripts
+from utilities.startup_timing import StartupTiming
+
+
+class CountingStart:
+    """start() callback for a LazyDriver that counts the sessions it launches"""
+
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        self.drivers.append(FakeWebDriver())
+        return self.drivers[-1]
+
+    def quit(self):
+        for driver in self.drivers:
+            driver.quit()
+
+
+@pytest.mark.unit
+class TestLazyDriver:
+    def test_browser_starts_on_the_first_command_only(self):
+        start = CountingStart()
+        driver = LazyDriver(start)
+
+        assert not driver.started and driver.start_seconds is None
+        assert start.drivers == []
+        DragAndDropPage(driver)
+        assert start.drivers == []
+
+        DragAndDropPage(driver).open()
+        driver.marker = "set on the session"
+
+        assert driver.started and driver.start_seconds >= 0
+        assert start.drivers == [driver.wrapped_driver]
+        assert driver.wrapped_driver.marker == "set on the session"
+        assert driver.current_url.endswith("/drag_and_drop")
+        start.quit()
+
+    def test_script_helpers_are_pinned_once_per_session(self):
+        session = FakeWebDriver()
+        for _ in range(2):
+            drag_and_drop_page = DragAndDropPage(LazyDriver(lambda: session)).open()
+            drag_and_drop_page.drag_and_drop_js()
+
+        assert len(session.pinned_scripts) == 1
+        assert session in scripts._pinned
+        session.quit()
+
+    def test_unused_drivers_are_reported_with_the_startup_avoided(self):
+        timing = StartupTiming(import_seconds=0.25)
+        timing.collections.append((0.1, 68, 26))
+        timing.start_seconds.extend([2.0, 4.0])
+        timing.unused_drivers = 3
+
+        assert timing.summary_lines() == [
+            "conftest imported in 0.250s",
+            "collected 68 tests in 0.100s, 26 deselected",
+            "5 tests took a driver, 2 started it (mean 3.00s to start)",
+            "3 tests never sent a command, no browser was started for them, about 9.0s of startup avoided",
+        ]
+
+    def test_conftest_does_not_import_webdriver_manager(self):
+        check = (
+            "import sys; import conftest; from utilities.driver_resolver import resolve_drivers; "
+            "assert resolve_drivers(['fake']) == {}; "
+            "print(sorted(name for name in sys.modules if name.startswith('webdriver_manager')))"
+        )
+        result = subprocess.run([sys.executable, "-c", check], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                                env={**os.environ, "PYTHONPATH": PROJECT_ROOT})
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
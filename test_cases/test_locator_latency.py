@@ -0,0 +1,18 @@
+import pytest
+
+from utilities.locator_profiler import discover_locators, over_threshold, profile_locators, report_lines
+
+
+@pytest.mark.locator_latency
+def test_page_object_locators_are_fast(request, driver):
+    """Time every locator declared in page_objects/ on its page and fail on those over --locator-max-ms"""
+    max_ms = request.config.getoption("--locator-max-ms")
+    profiles = profile_locators(driver, discover_locators(), samples=request.config.getoption("--locator-samples"))
+    print("\n".join(report_lines(profiles)))
+
+    slow = over_threshold(profiles, max_ms)
+    assert not slow, f"{len(slow)} locators over {max_ms}ms: " + ", ".join(
+        f"{profile.locator[0]} {profile.locator[1]!r} on /{profile.path} ({profile.latency_ms:.3f}ms)"
+        + (f", try {tuple(profile.suggestion['locator'])}" if profile.suggestion else "")
+        for profile in slow
+    )
@@ -0,0 +1,45 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+from utilities.locator_profiler import DeclaredLocator, discover_locators, over_threshold, profile_locators
+
+
+@pytest.mark.unit
+class TestLocatorProfiler:
+    def test_discovers_mangled_locators_of_sync_and_async_pages(self):
+        declared = {item.label: item for item in discover_locators()}
+
+        landing_link = declared["landing_page.LandingPage.__ab_testing_link"]
+        assert landing_link.locator == (By.XPATH, "//a[contains(., 'A/B Testing')]")
+        assert landing_link.path == ""
+        assert declared["aio.landing_page.LandingPage.__ab_testing_link"].locator == landing_link.locator
+        assert declared["file_upload_page.FileUploadPage.__file_input"].path == "upload"
+        assert not any("router" in label for label in declared)
+
+    def test_profiles_rank_and_suggest_id_or_css(self, fake_driver):
+        declared = [
+            DeclaredLocator("LandingPage", "__ab_testing_link", "", (By.XPATH, "//a[contains(., 'A/B Testing')]")),
+            DeclaredLocator("AsyncLandingPage", "__ab_testing_link", "", (By.XPATH, "//a[contains(., 'A/B Testing')]")),
+            DeclaredLocator("DragAndDropPage", "__header", "drag_and_drop", (By.TAG_NAME, "h3")),
+            DeclaredLocator("DragAndDropPage", "__column_a", "drag_and_drop", (By.CSS_SELECTOR, "div#column-a")),
+            DeclaredLocator("LandingPage", "__missing", "", (By.XPATH, "//a[contains(., 'Nowhere')]")),
+        ]
+        profiles = {profile.locator[1]: profile for profile in profile_locators(fake_driver, declared, samples=3)}
+
+        link = profiles["//a[contains(., 'A/B Testing')]"]
+        assert link.declared == ["LandingPage.__ab_testing_link", "AsyncLandingPage.__ab_testing_link"]
+        assert link.matches == 1 and len(link.round_trip_ms) == 3 and len(link.in_page_ms) == 3
+        assert link.suggestion["locator"] == [By.CSS_SELECTOR, "a[href='/abtest']"]
+        assert profiles["div#column-a"].suggestion["locator"] == [By.ID, "column-a"]
+        assert profiles["h3"].suggestion is None
+        assert profiles["//a[contains(., 'Nowhere')]"].matches == 0
+        assert profiles["//a[contains(., 'Nowhere')]"].suggestion is None
+
+    def test_threshold_check_flags_slow_lookups(self, fake_driver):
+        declared = [DeclaredLocator("CheckboxesPage", "__checkboxes", "checkboxes",
+                                    (By.CSS_SELECTOR, "input[type='checkbox']"))]
+        profiles = profile_locators(fake_driver, declared, samples=3)
+
+        assert profiles[0].matches == 2
+        assert over_threshold(profiles, 10_000) == []
+        assert over_threshold(profiles, 0) == profiles
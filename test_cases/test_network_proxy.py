@@ -0,0 +1,130 @@
+import http.client
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utilities import metrics
+from utilities.network_proxy import FilteringProxy, NetworkPolicy, ThrottleProfile, load_policy
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = f"page {self.path}".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def upstream():
+    """Local site the proxy forwards to and tunnels into"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def through_proxy(policy: NetworkPolicy, request):
+    """Run request(connection) against a FilteringProxy for policy and return its result"""
+    proxy = FilteringProxy(policy).start()
+    host, port = proxy.address.split(":")
+    connection = http.client.HTTPConnection(host, int(port), timeout=10)
+    try:
+        return request(connection)
+    finally:
+        connection.close()
+        proxy.stop()
+
+
+def get(url: str):
+    def request(connection):
+        connection.request("GET", url)
+        response = connection.getresponse()
+        return response.status, response.read().decode()
+    return request
+
+
+def tunnel(port: int, path: str = "/"):
+    def request(connection):
+        connection.set_tunnel("127.0.0.1", port)
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, response.read().decode()
+    return request
+
+
+@pytest.mark.unit
+class TestNetworkPolicy:
+    def test_host_and_url_patterns(self):
+        policy = NetworkPolicy("ads", block=["*.doubleclick.net", "http://*/ads/*"])
+
+        assert not policy.allows("stats.g.doubleclick.net")
+        assert not policy.allows("example.com", "http://example.com/ads/banner.js")
+        assert policy.allows("example.com", "http://example.com/page")
+        assert policy.allows("doubleclick.net")
+
+    def test_blocklist_applies_on_top_of_the_allowlist(self):
+        policy = NetworkPolicy("site only", block=["cdn.example.com"], allow=["example.com", "*.example.com"])
+
+        assert policy.allows("example.com") and policy.allows("www.example.com")
+        assert not policy.allows("cdn.example.com")
+        assert not policy.allows("github.com")
+        assert NetworkPolicy("open").allows("anything.test")
+
+    def test_load_policy_expands_the_base_host(self):
+        config = {
+            "network_policies": {"site": {"allow": ["$BASE_HOST"]}},
+            "throttle_profiles": {"slow": {"latency_ms": 100, "download_kbps": 500}},
+        }
+
+        policy = load_policy("site", config, "http://127.0.0.1:8123/", "slow")
+
+        assert policy.allow == ["127.0.0.1"] and policy.throttle.latency_ms == 100
+        with pytest.raises(ValueError, match="Unknown network policy missing, available: site"):
+            load_policy("missing", config, "http://127.0.0.1/")
+        with pytest.raises(ValueError, match="Unknown throttle profile fast"):
+            load_policy("site", config, "http://127.0.0.1/", "fast")
+
+
+@pytest.mark.unit
+class TestFilteringProxy:
+    def test_allowed_request_is_forwarded_and_counted(self, upstream):
+        requests = metrics.current().requests
+
+        status, body = through_proxy(NetworkPolicy("open"), get(f"http://127.0.0.1:{upstream}/checkboxes"))
+
+        assert (status, body) == (200, "page /checkboxes")
+        assert metrics.current().requests == requests + 1
+
+    def test_blocked_request_gets_an_empty_response(self, upstream):
+        blocked = metrics.current().blocked_requests.get("127.0.0.1", 0)
+
+        status, body = through_proxy(
+            NetworkPolicy("no ads", block=["http://*/ads/*"]), get(f"http://127.0.0.1:{upstream}/ads/banner.js")
+        )
+
+        assert (status, body) == (204, "")
+        assert metrics.current().blocked_requests["127.0.0.1"] == blocked + 1
+
+    def test_connect_is_tunnelled_when_allowed(self, upstream):
+        assert through_proxy(NetworkPolicy("local", allow=["127.0.0.1"]), tunnel(upstream, "/upload")) == (
+            200, "page /upload"
+        )
+        with pytest.raises(OSError, match="403"):
+            through_proxy(NetworkPolicy("local", block=["127.0.0.1"]), tunnel(upstream))
+
+    def test_throttle_adds_latency(self, upstream):
+        policy = NetworkPolicy("slow", throttle=ThrottleProfile("slow", latency_ms=200))
+        started = time.perf_counter()
+
+        through_proxy(policy, get(f"http://127.0.0.1:{upstream}/"))
+
+        assert time.perf_counter() - started >= 0.2
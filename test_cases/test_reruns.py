@@ -0,0 +1,54 @@
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from page_objects.base_page import BasePage
+from utilities.reruns import FlakeHistory, classify_failure
+
+
+class StubDriver:
+    window_handles = ["main"]
+    current_window_handle = "main"
+
+
+def failure(action):
+    with pytest.raises(Exception) as excinfo:
+        action()
+    return excinfo
+
+
+def raise_error(error: Exception):
+    raise error
+
+
+def click_upload_button():
+    raise_error(TimeoutException("no response"))
+
+
+@pytest.mark.unit
+class TestReruns:
+    def test_timing_and_transport_errors_are_transient(self):
+        assert classify_failure(failure(click_upload_button)) == "TimeoutException"
+        assert classify_failure(failure(lambda: BasePage(StubDriver())._switch_tab("child"))) == \
+            "IndexError in BasePage._switch_tab"
+        assert classify_failure(failure(lambda: raise_error(WebDriverException("chrome not reachable")))) == \
+            "WebDriverException"
+
+    def test_assertions_and_other_errors_are_real_failures(self):
+        def assert_after_timeout():
+            try:
+                click_upload_button()
+            except TimeoutException:
+                assert False, "no uploaded file"
+
+        assert classify_failure(failure(assert_after_timeout)) is None
+        assert classify_failure(failure(lambda: raise_error(WebDriverException("invalid argument")))) is None
+        assert classify_failure(failure(lambda: [][1])) is None
+
+    def test_flake_rate_counts_passes_on_rerun(self, tmp_path):
+        history = FlakeHistory(str(tmp_path / "flakes.json"))
+        history.record("test_a", retried=True, flaky=True)
+        history.record("test_a", retried=False, flaky=False)
+        history.save()
+
+        assert FlakeHistory(history.path).flake_rate("test_a") == 0.5
+        assert history.flake_rate("test_unknown") == 0.0
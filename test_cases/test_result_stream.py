@@ -0,0 +1,44 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utilities.result_stream import JsonlWriter, merge, read_records, report_record
+
+
+def report(nodeid, start, outcome="passed"):
+    return SimpleNamespace(
+        nodeid=nodeid, when="call", outcome=outcome, duration=0.5, start=start, user_properties=[],
+        failed=outcome == "failed", skipped=outcome == "skipped", longrepr="assert False",
+    )
+
+
+def stream(path, worker, reports, outcomes):
+    writer = JsonlWriter(str(path))
+    writer.write({"type": "session", "started": f"2026-01-01T00:00:0{worker[-1]}", "worker": worker})
+    for test_report in reports:
+        writer.write(report_record(test_report, worker, str(path.parent)))
+    writer.write({"type": "summary", "outcomes": outcomes, "seconds": 2.0, "exitstatus": 0})
+    writer.close()
+    return str(path)
+
+
+@pytest.mark.unit
+class TestResultStream:
+    def test_worker_streams_merge_in_start_order(self, tmp_path):
+        first = stream(tmp_path / "results.gw0.jsonl", "gw0", [report("test_b", 2.0)], {"passed": 1})
+        second = stream(tmp_path / "results.gw1.jsonl", "gw1", [report("test_a", 1.0, "failed")], {"failed": 1})
+
+        assert merge([first, second], str(tmp_path / "results.jsonl")) == 2
+        records = read_records(str(tmp_path / "results.jsonl"))
+        assert [record["type"] for record in records] == ["session", "test", "test", "summary"]
+        assert records[0]["worker"] == "gw0" and records[0]["workers"] == 2
+        assert [record["nodeid"] for record in records[1:3]] == ["test_a", "test_b"]
+        assert records[1]["longrepr"] == "assert False" and "longrepr" not in records[2]
+        assert records[3]["outcomes"] == {"passed": 1, "failed": 1}
+
+    def test_line_cut_off_by_a_crash_is_ignored(self, tmp_path):
+        path = tmp_path / "results.jsonl"
+        path.write_text(json.dumps({"type": "test", "nodeid": "test_a"}) + "\n" + '{"type": "te')
+
+        assert read_records(str(path)) == [{"type": "test", "nodeid": "test_a"}]
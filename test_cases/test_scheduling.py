@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+
+from utilities.scheduling import DurationHistory, LongestFirstScheduling, browser_of
+
+
+class StubConfig:
+    def getvalue(self, name):
+        return {"tx": ["2*popen"], "dist": "load"}[name]
+
+    def getoption(self, name):
+        return {"maxschedchunk": None}[name]
+
+
+class StubNode:
+    """Stands in for an xdist WorkerController and records what it was sent"""
+
+    def __init__(self, name):
+        self.gateway = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def scheduler_for(collection, durations, browsers=("firefox",), limits=None):
+    history = DurationHistory("does-not-exist.json")
+    history.durations = durations
+    scheduler = LongestFirstScheduling(StubConfig(), None, history, browsers, limits)
+    nodes = [StubNode("gw0"), StubNode("gw1")]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+@pytest.mark.unit
+class TestScheduling:
+    def test_longest_tests_start_first_on_separate_workers(self):
+        collection = ["fast", "slow", "medium", "slowest"]
+        scheduler, (first, second) = scheduler_for(collection, {"fast": 1, "slow": 5, "medium": 3, "slowest": 9})
+
+        assert [collection[index] for index in first.sent] == ["slowest", "medium"]
+        assert [collection[index] for index in second.sent] == ["slow", "fast"]
+        assert first.shutting_down and second.shutting_down
+
+    def test_workers_keep_their_browser_until_it_runs_out(self):
+        collection = [f"test_{index}[{browser}]" for index in range(4) for browser in ("firefox", "chrome")]
+        scheduler, (first, second) = scheduler_for(collection, {}, browsers=("firefox", "chrome"))
+
+        assert len({browser_of(collection[index], ["firefox", "chrome"]) for index in first.sent}) == 1
+        assert len({browser_of(collection[index], ["firefox", "chrome"]) for index in second.sent}) == 1
+        assert scheduler.node2browser[first] != scheduler.node2browser[second]
+
+    def test_browser_at_its_worker_limit_is_not_taken(self):
+        collection = [f"test_{index}[chrome]" for index in range(4)] + ["test_0[firefox]"]
+        scheduler, (first, second) = scheduler_for(
+            collection, {"test_0[firefox]": 0.1}, browsers=("firefox", "chrome"), limits={"chrome": 1}
+        )
+
+        chrome_workers = [node for node in (first, second) if scheduler.node2browser.get(node) == "chrome"]
+        assert len(chrome_workers) == 1
+        firefox_worker = second if chrome_workers == [first] else first
+        assert [collection[index] for index in firefox_worker.sent] == ["test_0[firefox]"]
+        assert firefox_worker.shutting_down and not chrome_workers[0].shutting_down
+
+    def test_history_smooths_new_durations(self, tmp_path):
+        history = DurationHistory(str(tmp_path / "durations.json"))
+        history.record("test_a", 4.0)
+        history.record("test_a", 2.0)
+        history.save()
+
+        reloaded = DurationHistory(history.path)
+        assert reloaded.estimate("test_a") == 3.0
+        assert reloaded.estimate("test_unknown") == 3.0
@@ -0,0 +1,90 @@
+import itertools
+
+import pytest
+
+from page_objects.drag_and_drop_page import DragAndDropPage
+from utilities.fake_driver import FakeWebDriver
+from utilities.script_registry import HELPERS_GLOBAL, ScriptRegistry
+
+DRAG_AND_DROP_JS = "function (source, target) {}"
+
+
+class ChromiumFakeWebDriver(FakeWebDriver):
+    """Keeps the scripts Chromium would run in every new document, as added and removed over CDP"""
+
+    def __init__(self):
+        super().__init__()
+        self.new_document_scripts = {}
+        self._identifiers = itertools.count(1)
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict):
+        if cmd == "Page.addScriptToEvaluateOnNewDocument":
+            identifier = str(next(self._identifiers))
+            self.new_document_scripts[identifier] = cmd_args["source"]
+            return {"identifier": identifier}
+        if cmd == "Page.removeScriptToEvaluateOnNewDocument":
+            del self.new_document_scripts[cmd_args["identifier"]]
+            return {}
+        raise AssertionError(f"Unexpected CDP command {cmd}")
+
+
+def is_install(command: str, params: dict) -> bool:
+    """Whether a command runs the helper bundle in the page"""
+    return params.get("script", "").startswith(f"window.{HELPERS_GLOBAL} =")
+
+
+@pytest.fixture
+def registry():
+    registry = ScriptRegistry()
+    registry.register("dragAndDrop", DRAG_AND_DROP_JS)
+    return registry
+
+
+def drag(registry: ScriptRegistry, page: DragAndDropPage):
+    registry.call(page._driver, "dragAndDrop", page._find(page._DragAndDropPage__column_a),
+                  page._find(page._DragAndDropPage__column_b), 2000)
+
+
+@pytest.mark.unit
+class TestScriptRegistry:
+    def test_pinned_bundle_is_installed_once_per_document(self, fake_driver, registry):
+        fake_driver.counted = is_install
+        drag_and_drop_page = DragAndDropPage(fake_driver).open()
+
+        drag(registry, drag_and_drop_page)
+        drag(registry, drag_and_drop_page)
+        assert len(fake_driver.commands) == 1
+
+        # A new document has no helpers, the first call reports them missing and they are installed again
+        drag_and_drop_page.open()
+        drag(registry, drag_and_drop_page)
+
+        assert len(fake_driver.commands) == 2
+        assert len(fake_driver.pinned_scripts) == 1
+        assert drag_and_drop_page.get_columns_text() == {"a": "B", "b": "A"}
+
+    def test_new_helpers_replace_the_pinned_bundle(self, fake_driver, registry):
+        drag_and_drop_page = DragAndDropPage(fake_driver).open()
+        drag(registry, drag_and_drop_page)
+        first_key = registry._pinned[fake_driver][1]
+
+        registry.register("noop", "function () {}")
+        drag(registry, drag_and_drop_page)
+
+        assert list(fake_driver.pinned_scripts) == [registry._pinned[fake_driver][1].id]
+        assert first_key.id not in fake_driver.pinned_scripts
+        assert "'noop'" in fake_driver.pinned_scripts[registry._pinned[fake_driver][1].id]
+
+    def test_unknown_helper_is_a_key_error(self, fake_driver, registry):
+        with pytest.raises(KeyError, match="No script helper registered as swap"):
+            registry.call(fake_driver, "swap")
+
+    def test_new_document_script_is_replaced_on_chromium(self, registry):
+        driver = ChromiumFakeWebDriver()
+        drag_and_drop_page = DragAndDropPage(driver).open()
+        drag(registry, drag_and_drop_page)
+        registry.register("noop", "function () {}")
+        drag(registry, drag_and_drop_page)
+        driver.quit()
+
+        assert list(driver.new_document_scripts.values()) == [registry.bundle()]
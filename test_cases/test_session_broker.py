@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+from page_objects.ab_testing_page import AbTestingPage
+from page_objects.landing_page import LandingPage
+from utilities.session_broker import (
+    BrokeredSession, BrokerClient, BrokerError, BrokerServer, SessionBroker, SessionLauncher,
+)
+
+
+class SlowLauncher:
+    """Launcher whose sessions take ``seconds`` to start and can be made to fail or die"""
+
+    def __init__(self, seconds: float = 0.05):
+        self.seconds = seconds
+        self.error = None
+        self.dead = set()
+        self.quit_sessions = []
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def launch(self, browser):
+        time.sleep(self.seconds)
+        if self.error:
+            raise self.error
+        with self._lock:
+            self._count += 1
+            return BrokeredSession(browser, f"{browser}-{self._count}", "http://127.0.0.1:1", {})
+
+    def alive(self, session):
+        return session.session_id not in self.dead
+
+    def quit(self, session):
+        self.quit_sessions.append(session.session_id)
+
+    def close(self):
+        pass
+
+
+def wait_until_ready(broker, browser, count):
+    deadline = time.monotonic() + 5
+    while broker.snapshot()[browser]["ready"] < count:
+        assert time.monotonic() < deadline, "the pool did not fill up"
+        time.sleep(0.01)
+
+
+@pytest.mark.unit
+class TestSessionBroker:
+    def test_warm_pool_hits_and_refills(self):
+        broker = SessionBroker(SlowLauncher(), {"chrome": 2}).start()
+        wait_until_ready(broker, "chrome", 2)
+
+        first, second = broker.checkout("chrome"), broker.checkout("chrome")
+        wait_until_ready(broker, "chrome", 2)
+        stats = broker.snapshot()["chrome"]
+
+        assert first.session_id != second.session_id
+        assert (stats["hits"], stats["misses"], stats["leased"], stats["launches"]) == (2, 0, 2, 4)
+        broker.discard(first.session_id)
+        assert broker.launcher.quit_sessions == [first.session_id]
+        broker.close()
+
+    def test_empty_pool_waits_and_counts_a_miss(self):
+        broker = SessionBroker(SlowLauncher(seconds=0.2), {"firefox": 1}).start()
+
+        broker.checkout("firefox")
+        stats = broker.snapshot()["firefox"]
+
+        assert (stats["hits"], stats["misses"]) == (0, 1)
+        assert stats["max_wait_seconds"] >= 0.1
+        broker.close()
+
+    def test_burst_of_checkouts_launches_one_session_each(self):
+        broker = SessionBroker(SlowLauncher(seconds=0.2), {"chrome": 1}).start()
+        sessions = []
+        threads = [threading.Thread(target=lambda: sessions.append(broker.checkout("chrome"))) for _ in range(4)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Launched side by side, not one after another behind a pool of one
+        assert time.monotonic() - started < 0.6
+        assert len({session.session_id for session in sessions}) == 4
+        broker.close()
+
+    def test_dead_sessions_are_replaced_and_failures_reported(self):
+        launcher = SlowLauncher()
+        broker = SessionBroker(launcher, {"chrome": 1}).start()
+        wait_until_ready(broker, "chrome", 1)
+        launcher.dead.add("chrome-1")
+
+        assert broker.checkout("chrome").session_id == "chrome-2"
+        assert broker.snapshot()["chrome"]["dead"] == 1
+        with pytest.raises(BrokerError, match="keeps no edge sessions"):
+            broker.checkout("edge")
+        broker.close()
+
+        launcher.error = OSError("driver crashed")
+        failing = SessionBroker(launcher, {"chrome": 1}).start()
+        with pytest.raises(BrokerError, match="could not start a chrome session: OSError: driver crashed"):
+            failing.checkout("chrome", timeout=5)
+        failing.close()
+
+    def test_workers_attach_to_brokered_fake_sessions(self):
+        server = BrokerServer(SessionBroker(SessionLauncher({}), {"fake": 1}).start()).start()
+        client = BrokerClient(server.url)
+        try:
+            driver = client.checkout("fake")
+            landing_page = LandingPage(driver)
+            landing_page.open()
+            landing_page.click_ab_testing_link()
+            AbTestingPage(driver).ab_landing_page_loaded_successfully()
+            driver.quit()
+
+            stats = client.stats()["fake"]
+            assert stats["hits"] + stats["misses"] == 1
+            assert stats["leased"] == 0
+            with pytest.raises(BrokerError, match="keeps no chrome sessions"):
+                client.checkout("chrome")
+        finally:
+            server.stop()
@@ -0,0 +1,125 @@
+import http.client
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+from utilities.site_archive import SiteArchive, SiteServer
+
+_BOUNDARY = "----benchmarkboundary"
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    """Stands in for the target site: one page and one redirect"""
+
+    def do_GET(self):
+        if self.path == "/old":
+            self.send_response(302)
+            self.send_header("Location", f"http://127.0.0.1:{self.server.server_address[1]}/checkboxes")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = f"<title>The Internet</title>{self.path}".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def get(server: SiteServer, path: str):
+    address = urlsplit(server.base_url)
+    connection = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+    connection.request("GET", path)
+    response = connection.getresponse()
+    result = response.status, dict(response.getheaders()), response.read().decode()
+    connection.close()
+    return result
+
+
+def post_upload(server: SiteServer, filename: str, size: int):
+    """Send a multipart upload of size bytes in chunks, the way a browser streams a large file"""
+    head = (
+        f"--{_BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{_BOUNDARY}--\r\n".encode()
+    address = urlsplit(server.base_url)
+    connection = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+    connection.putrequest("POST", "/upload")
+    connection.putheader("Content-Type", f"multipart/form-data; boundary={_BOUNDARY}")
+    connection.putheader("Content-Length", str(len(head) + size + len(tail)))
+    connection.endheaders()
+    connection.send(head)
+    chunk = os.urandom(64 * 1024)
+    for offset in range(0, size, len(chunk)):
+        connection.send(chunk[:size - offset])
+    connection.send(tail)
+    response = connection.getresponse()
+    body = response.read().decode()
+    connection.close()
+    return response.status, body
+
+
+@pytest.fixture
+def replay_server(tmp_path):
+    server = SiteServer("replay", SiteArchive(str(tmp_path / "archive"))).start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.unit
+class TestRecordReplay:
+    def test_recorded_responses_replay_without_the_upstream(self, tmp_path):
+        upstream = ThreadingHTTPServer(("127.0.0.1", 0), UpstreamHandler)
+        threading.Thread(target=upstream.serve_forever, daemon=True).start()
+        recorder = SiteServer("record", SiteArchive(str(tmp_path)), f"http://127.0.0.1:{upstream.server_address[1]}/")
+        recorder.start()
+        recorded = [get(recorder, "/checkboxes"), get(recorder, "/old")]
+        recorder.stop()
+        upstream.shutdown()
+        upstream.server_close()
+
+        replayer = SiteServer("replay", SiteArchive(str(tmp_path))).start()
+        page, redirect = get(replayer, "/checkboxes"), get(replayer, "/old")
+        redirected = get(replayer, redirect[1]["Location"])
+        missing = get(replayer, "/dropdown")
+        replayer.stop()
+
+        assert [page[0], page[2]] == [recorded[0][0], recorded[0][2]] == [200, "<title>The Internet</title>/checkboxes"]
+        # Redirects are kept relative, so they lead to the replaying server and not to the recorder or the site
+        assert (redirect[0], redirect[1]["Location"]) == (302, "/checkboxes")
+        assert redirected[::2] == page[::2]
+        assert missing[0] == 404
+
+    def test_unknown_mode_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported site mode live"):
+            SiteServer("live", SiteArchive(str(tmp_path)))
+
+
+@pytest.mark.unit
+class TestSiteArchive:
+    def test_replayed_upload_is_streamed_and_counted(self, replay_server):
+        status, body = post_upload(replay_server, "large.bin", 5 * 1024 * 1024 + 7)
+
+        assert status == 200 and "large.bin" in body
+        assert replay_server.last_upload["filename"] == "large.bin"
+        assert replay_server.last_upload["bytes"] == 5 * 1024 * 1024 + 7
+
+    def test_upload_without_file_is_a_server_error(self, replay_server):
+        status, body = post_upload(replay_server, "", 0)
+
+        assert status == 500 and "Internal Server Error" in body
+
+    def test_unrecorded_upload_form_is_served_locally(self, replay_server):
+        address = urlsplit(replay_server.base_url)
+        connection = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+        connection.request("GET", "/upload")
+        response = connection.getresponse()
+
+        assert response.status == 200 and 'id="file-upload"' in response.read().decode()
@@ -0,0 +1,65 @@
+from time import perf_counter
+
+import pytest
+
+from page_objects.base_page import BasePage
+from page_objects.file_upload_page import FileUploadPage
+from utilities.site_archive import SiteArchive, SiteServer
+from utilities.upload_benchmark import FILE_TYPES, SIZES, RssSampler, generate_asset, megabytes_per_second
+
+# Slowest upload rate the waits allow for before a case counts as timed out
+_MIN_BYTES_PER_SECOND = 2 * 1024 ** 2
+
+
+@pytest.fixture(scope="module")
+def upload_endpoint(tmp_path_factory):
+    """Local replay server whose /upload streams and discards the body, used as the site for this module"""
+    server = SiteServer("replay", SiteArchive(str(tmp_path_factory.mktemp("upload_endpoint")))).start()
+    base_url, BasePage.base_url = BasePage.base_url, server.base_url
+    yield server
+    BasePage.base_url = base_url
+    server.stop()
+
+
+@pytest.mark.benchmark
+@pytest.mark.file_upload
+@pytest.mark.parametrize("file_type", FILE_TYPES)
+@pytest.mark.parametrize("size_name", SIZES)
+def test_upload_throughput(request, browser, driver, router, assets, upload_endpoint, size_name, file_type):
+    """Time choosing, submitting and confirming one generated file and record MB/s and process memory"""
+    if browser == "fake":
+        pytest.skip("the fake driver does not transfer files")
+    asset = generate_asset(assets, size_name, file_type)
+    # Written (or found in .assets/) before the clock starts
+    assets.get(asset.key)
+    timeout = 30 + asset.size / _MIN_BYTES_PER_SECOND
+
+    file_upload_page = router.arrive(FileUploadPage)
+    file_upload_page.verify_page_loaded()
+    sampler = RssSampler(driver).start()
+    try:
+        started = perf_counter()
+        file_upload_page.choose_file(asset.key)
+        chosen = perf_counter()
+        file_upload_page.click_upload_button(time=timeout)
+        submitted = perf_counter()
+        filename = file_upload_page.get_uploaded_filename(time=timeout)
+        rendered = perf_counter()
+    finally:
+        rss = sampler.stop()
+
+    assert filename == asset.name, f"Expected filename '{asset.name}', but got '{filename}'"
+    received = upload_endpoint.last_upload
+    assert received["bytes"] == asset.size, f"The endpoint received {received['bytes']} of {asset.size} bytes"
+
+    total = rendered - started
+    request.node.user_properties.append(("upload_benchmark", {
+        "browser": browser,
+        "case": f"{size_name}-{file_type}",
+        "bytes": asset.size,
+        "seconds": {"send_keys": chosen - started, "submit": submitted - chosen, "render": rendered - submitted},
+        "total_seconds": total,
+        "mb_per_s": megabytes_per_second(asset.size, total),
+        "server_seconds": received["seconds"],
+        "rss": rss,
+    }))
@@ -0,0 +1,52 @@
+from time import perf_counter
+
+import pytest
+from selenium.common import TimeoutException
+from selenium.webdriver.common.by import By
+
+from page_objects.checkbox_page import CheckboxesPage
+from utilities import metrics
+
+HEADER = (By.TAG_NAME, "h3")
+
+
+@pytest.fixture
+def checkboxes_page(fake_driver):
+    return CheckboxesPage(fake_driver).open()
+
+
+@pytest.mark.unit
+class TestWaits:
+    def test_met_condition_is_recorded_as_a_wait(self, checkboxes_page):
+        waits = len(metrics.current().waits)
+
+        assert checkboxes_page._wait_for_text(HEADER) == "Checkboxes"
+
+        recorded = metrics.current().waits[waits:]
+        assert [(wait["wait"], wait["timed_out"]) for wait in recorded] == [
+            (f"CheckboxesPage: text of {HEADER}", False)
+        ]
+
+    def test_timeout_raises_after_the_given_time_and_is_recorded(self, checkboxes_page):
+        polls = []
+        waits = len(metrics.current().waits)
+        started = perf_counter()
+
+        with pytest.raises(TimeoutException):
+            checkboxes_page._wait_for(lambda driver: polls.append(perf_counter()), "never", time=0.3, poll=0.05)
+
+        assert perf_counter() - started >= 0.3
+        # Polled every 0.05s rather than at the default interval of 0.1s
+        assert len(polls) >= 5
+        wait, = metrics.current().waits[waits:]
+        assert (wait["wait"], wait["timed_out"]) == ("CheckboxesPage: never", True)
+        assert wait["seconds"] >= 0.3
+
+    def test_absent_element_is_checked_without_waiting(self, checkboxes_page):
+        waits = len(metrics.current().waits)
+
+        assert not checkboxes_page.is_absent(HEADER, time=0.2)
+        assert checkboxes_page.is_absent((By.ID, "does-not-exist"))
+
+        wait, = metrics.current().waits[waits:]
+        assert wait["timed_out"] and wait["wait"] == f"CheckboxesPage: absence of {HEADER}"
@@ -0,0 +1,284 @@
+import argparse
+import base64
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import zipfile
+
+from selenium.webdriver.remote.file_detector import UselessFileDetector
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST = os.path.join(PROJECT_ROOT, "test_assets", "manifest.json")
+# Generated assets are written here on first use, one directory per generation spec
+CACHE_ROOT = os.path.join(PROJECT_ROOT, ".assets")
+CONTENT_KINDS = ("random", "text", "sparse")
+
+_CHUNK_SIZE = 1024 * 1024
+# Encoded remote uploads up to this size are kept in memory for the next session
+_PAYLOAD_CACHE_LIMIT = 64 * 1024 * 1024
+_TEXT_LINE = b"The quick brown fox jumps over the lazy dog. 0123456789\n"
+
+
+class AssetError(ValueError):
+    """An asset is unknown, missing or no longer matches the manifest"""
+
+
+class Asset:
+    """A file tests can upload: a checked-in file or one generated from a size and content kind"""
+
+    def __init__(self, key: str, path: str, size: int, sha256: str = None, content: str = None):
+        self.key = key
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        # Content kind of generated assets, None for checked-in files
+        self.content = content
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def generated(self) -> bool:
+        return self.content is not None
+
+    def to_dict(self) -> dict:
+        if self.generated:
+            entry = {"generate": {"name": self.name, "size": self.size, "content": self.content}}
+        else:
+            entry = {"path": os.path.relpath(self.path, PROJECT_ROOT).replace(os.sep, "/"), "size": self.size}
+        if self.sha256:
+            entry["sha256"] = self.sha256
+        return entry
+
+
+def _spec_id(name: str, size: int, content: str) -> str:
+    spec = json.dumps({"name": name, "size": size, "content": content}, sort_keys=True)
+    return hashlib.sha1(spec.encode()).hexdigest()[:16]
+
+
+def _generated_chunks(asset: Asset):
+    """The content of a generated asset, chunk by chunk; it is never held in memory as a whole"""
+    remaining = asset.size
+    if asset.content == "random":
+        # Seeded by the spec so every run and every worker produces the same bytes
+        generator = random.Random(_spec_id(asset.name, asset.size, asset.content))
+        while remaining:
+            chunk = generator.randbytes(min(remaining, _CHUNK_SIZE))
+            remaining -= len(chunk)
+            yield chunk
+    elif asset.content == "text":
+        block = _TEXT_LINE * (_CHUNK_SIZE // len(_TEXT_LINE) + 1)
+        while remaining:
+            chunk = block[:min(remaining, _CHUNK_SIZE)]
+            remaining -= len(chunk)
+            yield chunk
+    else:
+        zeros = bytes(_CHUNK_SIZE)
+        while remaining:
+            chunk = zeros[:min(remaining, _CHUNK_SIZE)]
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as asset_file:
+        for chunk in iter(lambda: asset_file.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetRegistry:
+    """Upload fixtures addressed by key, described by test_assets/manifest.json
+
+    Checked-in files are verified against the size and sha256 in the manifest the
+    first time they are used. Generated files are written to ``.assets/`` on first
+    use, streamed in chunks (sparse for zero content), and reused by later runs.
+    On remote sessions each file is uploaded once per session and content hash,
+    and the encoded payload is reused by other sessions.
+    """
+
+    def __init__(self, manifest_path: str = MANIFEST, cache_dir: str = CACHE_ROOT):
+        self.manifest_path = manifest_path
+        self.cache_dir = cache_dir
+        self._assets = None
+        self._ready = set()
+        self._payloads = {}
+        self._remote_paths = {}
+
+    def load(self) -> "AssetRegistry":
+        if self._assets is not None:
+            return self
+        self._assets = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as manifest_file:
+                for key, entry in json.load(manifest_file).items():
+                    self._assets[key] = self._from_entry(key, entry)
+        return self
+
+    def _from_entry(self, key: str, entry: dict) -> Asset:
+        if "generate" in entry:
+            spec = entry["generate"]
+            return self._generated_asset(key, spec["name"], spec["size"], spec.get("content", "random"), entry.get("sha256"))
+        return Asset(key, os.path.join(PROJECT_ROOT, entry["path"]), entry.get("size"), entry.get("sha256"))
+
+    def _generated_asset(self, key: str, name: str, size: int, content: str, sha256: str = None) -> Asset:
+        if content not in CONTENT_KINDS:
+            raise AssetError(f"Unknown content kind {content} for asset {key}, use one of {', '.join(CONTENT_KINDS)}")
+        path = os.path.join(self.cache_dir, _spec_id(name, size, content), name)
+        return Asset(key, path, int(size), sha256, content)
+
+    def keys(self) -> list:
+        return list(self.load()._assets)
+
+    def __contains__(self, key) -> bool:
+        return key in self.load()._assets
+
+    def register(self, key: str, path: str) -> Asset:
+        """Add a checked-in file at runtime"""
+        asset = Asset(key, os.path.abspath(path), None)
+        self.load()._assets[key] = asset
+        return asset
+
+    def generate(self, name: str, size: int, content: str = "random", key: str = None) -> Asset:
+        """Add a synthetic file of ``size`` bytes at runtime; it is only written when first used"""
+        asset = self._generated_asset(key or name, name, size, content)
+        self.load()._assets[asset.key] = asset
+        return asset
+
+    def get(self, key: str) -> Asset:
+        """The asset with its file in place and its size and hash verified"""
+        asset = self.load()._assets.get(key)
+        if asset is None:
+            raise AssetError(f"No upload asset {key!r}, known assets: {', '.join(sorted(self._assets))}")
+        if key not in self._ready:
+            if asset.generated:
+                self._materialize(asset)
+            else:
+                self._verify(asset)
+            self._ready.add(key)
+        return asset
+
+    def resolve(self, key_or_path: str) -> str:
+        """Local path of a registry key; anything else is taken to be a path already"""
+        return self.get(key_or_path).path if key_or_path in self else key_or_path
+
+    def _verify(self, asset: Asset):
+        if not os.path.isfile(asset.path):
+            raise AssetError(f"Upload asset {asset.key} does not exist at {asset.path}")
+        size = os.path.getsize(asset.path)
+        sha256 = _file_digest(asset.path)
+        if (asset.size is not None and size != asset.size) or (asset.sha256 and sha256 != asset.sha256):
+            raise AssetError(
+                f"Upload asset {asset.key} at {asset.path} no longer matches the manifest, "
+                f"run python -m utilities.asset_registry update if the change is intended"
+            )
+        asset.size, asset.sha256 = size, sha256
+
+    def _materialize(self, asset: Asset):
+        """Write a generated asset unless an earlier run already did, hashing it on the way"""
+        digest_path = asset.path + ".sha256"
+        if os.path.isfile(asset.path) and os.path.getsize(asset.path) == asset.size and os.path.isfile(digest_path):
+            with open(digest_path) as digest_file:
+                sha256 = digest_file.read().strip()
+        else:
+            os.makedirs(os.path.dirname(asset.path), exist_ok=True)
+            digest = hashlib.sha256()
+            # Written under a temporary name so pytest-xdist workers never see a partial file
+            partial_path = f"{asset.path}.{os.getpid()}.partial"
+            with open(partial_path, "wb") as asset_file:
+                if asset.content == "sparse":
+                    asset_file.truncate(asset.size)
+                    for chunk in _generated_chunks(asset):
+                        digest.update(chunk)
+                else:
+                    for chunk in _generated_chunks(asset):
+                        digest.update(chunk)
+                        asset_file.write(chunk)
+            sha256 = digest.hexdigest()
+            os.replace(partial_path, asset.path)
+            with open(digest_path, "w") as digest_file:
+                digest_file.write(sha256)
+        if asset.sha256 and sha256 != asset.sha256:
+            raise AssetError(f"Generated asset {asset.key} does not match the sha256 in the manifest")
+        asset.sha256 = sha256
+
+    def upload_path(self, driver: WebDriver, key_or_path: str) -> str:
+        """The path to type into a file input of this session
+
+        For remote sessions that is the path on the remote end, uploaded only once
+        per session and content hash. A path that is not a registry key is hashed on
+        every call but never added to the registry.
+        """
+        if key_or_path in self:
+            asset = self.get(key_or_path)
+        else:
+            asset = Asset(key_or_path, os.path.abspath(key_or_path), None)
+            self._verify(asset)
+        if not getattr(driver, "_is_remote", False):
+            return asset.path
+        remote_key = (driver.session_id, asset.sha256)
+        if remote_key not in self._remote_paths:
+            payload = self._payloads.get(asset.sha256) or self._encode(asset)
+            if asset.size <= _PAYLOAD_CACHE_LIMIT:
+                self._payloads[asset.sha256] = payload
+            self._remote_paths[remote_key] = driver.execute(Command.UPLOAD_FILE, {"file": payload})["value"]
+        return self._remote_paths[remote_key]
+
+    @staticmethod
+    def no_reupload(driver: WebDriver):
+        """Context for typing an upload_path() so Selenium does not upload the file a second time"""
+        if not getattr(driver, "_is_remote", False):
+            return contextlib.nullcontext()
+        return driver.file_detector_context(UselessFileDetector)
+
+    @staticmethod
+    def _encode(asset: Asset) -> str:
+        """The zipped, base64 encoded file the remote end expects, as WebElement.send_keys builds it"""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.write(asset.path, asset.name)
+        return base64.encodebytes(buffer.getvalue()).decode("utf-8")
+
+    def update(self):
+        """Record the current size and sha256 of every asset, hashing generated ones without writing them"""
+        for asset in self.load()._assets.values():
+            if asset.generated:
+                digest = hashlib.sha256()
+                for chunk in _generated_chunks(asset):
+                    digest.update(chunk)
+                asset.sha256 = digest.hexdigest()
+            else:
+                asset.size, asset.sha256 = None, None
+                self._verify(asset)
+        self.save()
+
+    def save(self):
+        with open(self.manifest_path, "w") as manifest_file:
+            json.dump({key: asset.to_dict() for key, asset in self._assets.items()}, manifest_file, indent=4)
+            manifest_file.write("\n")
+
+
+# Shared by page objects and the ``assets`` fixture, so the manifest is read once per session
+assets = AssetRegistry()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List the upload assets or refresh their hashes in the manifest")
+    parser.add_argument("command", choices=["list", "update"])
+    parser.add_argument("--manifest", default=MANIFEST)
+    arguments = parser.parse_args()
+
+    registry = AssetRegistry(arguments.manifest)
+    if arguments.command == "update":
+        registry.update()
+        print(f"Updated {arguments.manifest}")
+    for key in registry.keys():
+        asset = registry._assets[key]
+        print(f"{key:<20}{asset.size or 0:>14,} {asset.sha256 or '-'} {'generated' if asset.generated else asset.path}")
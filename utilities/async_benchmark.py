@@ -0,0 +1,202 @@
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes (ru_maxrss is in KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _result(mode: str, sessions: int, journeys: int, wall: float, cpu: float, rss: int) -> dict:
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "journeys": sessions * journeys,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "journeys_per_second": round(sessions * journeys / wall, 2) if wall else 0.0,
+        # Sessions one fully busy core of client-side Python keeps going at this pace
+        "sessions_per_core": round(sessions * wall / cpu, 1) if cpu else 0.0,
+        "peak_rss": rss,
+    }
+
+
+async def _async_journeys(browser: str, url: str | None, driver_path: str | None, profile, journeys: int):
+    from page_objects.aio.ab_testing_page import AbTestingPage
+    from page_objects.aio.landing_page import LandingPage
+    from utilities.async_webdriver import start_session
+
+    driver = await start_session(browser, url, driver_path, profile)
+    try:
+        for _ in range(journeys):
+            landing_page = await LandingPage(driver).open()
+            await landing_page.click_ab_testing_link()
+            await AbTestingPage(driver).ab_landing_page_loaded_successfully()
+    finally:
+        await driver.quit()
+
+
+def run_async(browser: str, sessions: int, journeys: int, url: str = None, driver_path: str = None, profile=None) -> dict:
+    """Run ``sessions`` LandingPage -> AbTestingPage journeys at once from one event loop in this process"""
+    async def run_all():
+        await asyncio.gather(*(
+            _async_journeys(browser, url, driver_path, profile, journeys) for _ in range(sessions)
+        ))
+
+    started, cpu_started = time.perf_counter(), time.process_time()
+    asyncio.run(run_all())
+    wall, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+    return _result("asyncio", sessions, journeys, wall, cpu, _peak_rss())
+
+
+def run_worker(browser: str, journeys: int, url: str = None, driver_path: str = None, profile=None) -> dict:
+    """One synchronous session like an xdist worker drives it, run in its own interpreter by run_processes"""
+    from selenium import webdriver
+
+    from page_objects.ab_testing_page import AbTestingPage
+    from page_objects.landing_page import LandingPage
+    from utilities.driver_factory import create_driver
+
+    if url:
+        driver = webdriver.Remote(command_executor=url, options=webdriver.ChromeOptions())
+    else:
+        driver = create_driver(browser, driver_path, profile)
+    try:
+        for _ in range(journeys):
+            landing_page = LandingPage(driver)
+            landing_page.open()
+            landing_page.click_ab_testing_link()
+            AbTestingPage(driver).ab_landing_page_loaded_successfully()
+    finally:
+        driver.quit()
+    # Includes interpreter startup and imports, which every xdist worker pays as well
+    return {"cpu_seconds": time.process_time(), "peak_rss": _peak_rss()}
+
+
+def run_processes(browser: str, sessions: int, journeys: int, url: str = None, driver_path: str = None,
+                  profile_name: str = None, base_url: str = None) -> dict:
+    """Run the same journeys with one Python process per session, the way pytest -n drives browsers
+
+    Workers skip pytest's own startup and collection, so this is the cheapest an xdist run could be.
+    """
+    command = [sys.executable, "-m", "utilities.async_benchmark", "worker", "--browser", browser,
+               "--journeys", str(journeys)]
+    for option, value in (("--url", url), ("--driver-path", driver_path),
+                          ("--launch-profile", profile_name), ("--base-url", base_url)):
+        if value:
+            command += [option, value]
+    started = time.perf_counter()
+    workers = [
+        subprocess.Popen(command, cwd=PROJECT_ROOT, stdout=subprocess.PIPE, text=True) for _ in range(sessions)
+    ]
+    reports = []
+    for worker in workers:
+        output, _ = worker.communicate()
+        if worker.returncode != 0:
+            raise RuntimeError(f"Benchmark worker exited with {worker.returncode}")
+        reports.append(json.loads(output.strip().splitlines()[-1]))
+    wall = time.perf_counter() - started
+    return _result(
+        "processes", sessions, journeys, wall,
+        sum(report["cpu_seconds"] for report in reports), sum(report["peak_rss"] for report in reports),
+    )
+
+
+class FakeDriverServer:
+    """utilities.fake_w3c_server in a process of its own, so its work is not counted as client CPU"""
+
+    def __enter__(self) -> str:
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "utilities.fake_w3c_server", "--port", "0"],
+            cwd=PROJECT_ROOT, stdout=subprocess.PIPE, text=True,
+        )
+        return self._process.stdout.readline().split()[-1]
+
+    def __exit__(self, *exc_info):
+        self._process.terminate()
+        self._process.wait()
+        self._process.stdout.close()
+
+
+def compare(browser: str, sessions: int, journeys: int, driver_path: str = None, profile_name: str = None,
+            base_url: str = None) -> list:
+    """Results of the asyncio and the process per session approach for the same journeys"""
+    from utilities.launch_profiles import get_profile, load_config
+
+    profile = get_profile(profile_name, load_config()) if profile_name else None
+    if base_url:
+        from page_objects.aio.base_page import AsyncBasePage
+        AsyncBasePage.base_url = base_url
+    if browser == "fake":
+        with FakeDriverServer() as url:
+            return [
+                run_async(browser, sessions, journeys, url),
+                run_processes(browser, sessions, journeys, url, base_url=base_url),
+            ]
+    return [
+        run_async(browser, sessions, journeys, driver_path=driver_path, profile=profile),
+        run_processes(browser, sessions, journeys, driver_path=driver_path, profile_name=profile_name,
+                      base_url=base_url),
+    ]
+
+
+def _format_bytes(value: int) -> str:
+    return f"{value / 1024 ** 2:.0f}MiB"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare driving many sessions from one asyncio event loop with one process per session"
+    )
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    compare_parser = subcommands.add_parser("compare", help="Run both approaches and print sessions per core")
+    compare_parser.add_argument("--sessions", type=int, default=20)
+    worker_parser = subcommands.add_parser("worker", help="Drive one synchronous session (used by compare)")
+    worker_parser.add_argument("--url")
+    for subparser in (compare_parser, worker_parser):
+        subparser.add_argument("--browser", default="fake")
+        subparser.add_argument("--journeys", type=int, default=5)
+        subparser.add_argument("--driver-path")
+        subparser.add_argument("--launch-profile")
+        subparser.add_argument("--base-url")
+    compare_parser.add_argument("--offline", action="store_true")
+    arguments = parser.parse_args()
+
+    if arguments.command == "worker":
+        from page_objects.base_page import BasePage
+        from utilities.launch_profiles import get_profile, load_config
+
+        if arguments.base_url:
+            BasePage.base_url = arguments.base_url
+        profile = get_profile(arguments.launch_profile, load_config()) if arguments.launch_profile else None
+        print(json.dumps(run_worker(arguments.browser, arguments.journeys, arguments.url, arguments.driver_path, profile)))
+        sys.exit(0)
+
+    driver_path = arguments.driver_path
+    if arguments.browser != "fake" and not driver_path:
+        from utilities.driver_resolver import resolve_drivers
+        driver_path = resolve_drivers([arguments.browser], offline=arguments.offline)[arguments.browser].path
+    results = compare(
+        arguments.browser, arguments.sessions, arguments.journeys, driver_path, arguments.launch_profile,
+        arguments.base_url,
+    )
+    print(f"{'mode':<11}{'sessions':>9}{'journeys/s':>12}{'wall (s)':>10}{'CPU (s)':>9}{'sessions/core':>15}{'RSS':>9}")
+    for result in results:
+        print(
+            f"{result['mode']:<11}{result['sessions']:>9}{result['journeys_per_second']:>12.1f}"
+            f"{result['wall_seconds']:>10.2f}{result['cpu_seconds']:>9.2f}{result['sessions_per_core']:>15.1f}"
+            f"{_format_bytes(result['peak_rss']):>9}"
+        )
+    asyncio_result, process_result = results
+    if process_result["sessions_per_core"]:
+        print(f"asyncio drives {asyncio_result['sessions_per_core'] / process_result['sessions_per_core']:.1f}x "
+              f"the sessions per core of one process per session")
@@ -0,0 +1,348 @@
+import asyncio
+import json
+import socket
+import subprocess
+import time
+from urllib import error as urllib_error, request as urllib_request
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+from selenium.common import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+
+from utilities.launch_profiles import LaunchProfile
+
+# Key of an element reference in W3C WebDriver JSON
+W3C_ELEMENT = "element-6066-11e4-a52e-4f735466cecf"
+
+_OPTIONS = {"chrome": webdriver.ChromeOptions, "edge": webdriver.EdgeOptions, "firefox": webdriver.FirefoxOptions}
+
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection to a driver, sending one request at a time
+
+    A WebDriver session handles its commands in order anyway, so each session gets
+    its own connection and concurrency comes from running many sessions at once.
+    """
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.base_path = parts.path.rstrip("/")
+        self._reader = self._writer = None
+        self._lock = asyncio.Lock()
+
+    async def request(self, method: str, path: str, body=None) -> tuple:
+        """(HTTP status, body) of a request, reconnecting once when the driver closed an idle connection"""
+        content = json.dumps(body).encode() if body is not None else b""
+        head = (
+            f"{method} {self.base_path}{path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json;charset=UTF-8\r\nContent-Length: {len(content)}\r\n"
+            f"Connection: keep-alive\r\n\r\n"
+        )
+        async with self._lock:
+            reused = self._writer is not None
+            try:
+                return await self._send(head.encode() + content)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.close()
+                if not reused:
+                    raise
+            return await self._send(head.encode() + content)
+
+    async def _send(self, request: bytes) -> tuple:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(request)
+        await self._writer.drain()
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionResetError("The driver closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await self._reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "content-length" in headers:
+            content = await self._reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            content = await self._read_chunks()
+        else:
+            content = await self._reader.read()
+            headers["connection"] = "close"
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, content
+
+    async def _read_chunks(self) -> bytes:
+        chunks = []
+        while True:
+            size = int((await self._reader.readline()).split(b";")[0], 16)
+            if not size:
+                await self._reader.readline()
+                return b"".join(chunks)
+            chunks.append(await self._reader.readexactly(size))
+            await self._reader.readline()
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+def w3c_value(method: str, path: str, status: int, text: str):
+    """Value of a W3C response, raising the same exceptions Selenium's own client raises"""
+    if status >= 400:
+        ErrorHandler().check_response({"status": status, "value": text})
+        raise WebDriverException(f"{method} {path} failed with HTTP {status}: {text}")
+    return json.loads(text)["value"] if text else None
+
+
+async def _command(connection: _Connection, method: str, path: str, body=None):
+    status, content = await connection.request(method, path, body)
+    return w3c_value(method, path, status, content.decode("utf-8"))
+
+
+def w3c_command(url: str, method: str, path: str, body=None, timeout: float = 60):
+    """Value of a W3C command sent with a blocking request, for callers outside an event loop"""
+    data = json.dumps(body).encode() if body is not None else None
+    http_request = urllib_request.Request(
+        url + path, data=data, method=method, headers={"Content-Type": "application/json;charset=UTF-8"}
+    )
+    try:
+        with urllib_request.urlopen(http_request, timeout=timeout) as response:
+            return w3c_value(method, path, response.status, response.read().decode("utf-8"))
+    except urllib_error.HTTPError as error:
+        return w3c_value(method, path, error.code, error.read().decode("utf-8"))
+
+
+class AsyncWebElement:
+    def __init__(self, driver: "AsyncWebDriver", element_id: str):
+        self.driver = driver
+        self.id = element_id
+
+    def _execute(self, method: str, path: str = "", body=None):
+        return self.driver.execute(method, f"/element/{self.id}{path}", body)
+
+    async def click(self):
+        await self._execute("POST", "/click", {})
+
+    async def clear(self):
+        await self._execute("POST", "/clear", {})
+
+    async def send_keys(self, *value):
+        text = "".join(str(part) for part in value)
+        await self._execute("POST", "/value", {"text": text, "value": list(text)})
+
+    async def text(self) -> str:
+        return await self._execute("GET", "/text")
+
+    async def get_attribute(self, name: str) -> str | None:
+        return await self._execute("GET", f"/attribute/{name}")
+
+    async def is_selected(self) -> bool:
+        return await self._execute("GET", "/selected")
+
+    async def is_enabled(self) -> bool:
+        return await self._execute("GET", "/enabled")
+
+    async def is_displayed(self) -> bool:
+        return await self._execute("GET", "/displayed")
+
+    async def find_element(self, by=By.ID, value: str = None) -> "AsyncWebElement":
+        return await self._execute("POST", "/element", {"using": by, "value": value})
+
+    async def find_elements(self, by=By.ID, value: str = None) -> list:
+        return await self._execute("POST", "/elements", {"using": by, "value": value})
+
+
+class AsyncWebDriver:
+    """A WebDriver session driven over the W3C protocol with asyncio, so one event loop can run many
+
+    Commands are coroutines with the names of their Selenium counterparts
+    (``await driver.get(url)``, ``await driver.find_element(By.ID, "x")``); reads
+    that are properties in Selenium are coroutine methods here (``await
+    driver.current_url()``). Errors are raised as Selenium's own exceptions.
+    """
+
+    def __init__(self, connection: _Connection, session_id: str, capabilities: dict, service=None):
+        self._connection = connection
+        self.session_id = session_id
+        self.capabilities = capabilities
+        # The driver binary this session runs on, stopped on quit() when the session owns it
+        self.service = service
+        # TestMetrics the page objects on this session record into, those of the running test when None
+        self.metrics = None
+
+    @classmethod
+    async def start(cls, url: str, capabilities: dict, service=None) -> "AsyncWebDriver":
+        """Open a new session on the driver listening at url"""
+        connection = _Connection(url)
+        value = await _command(connection, "POST", "/session", {"capabilities": {"alwaysMatch": capabilities}})
+        return cls(connection, value["sessionId"], value.get("capabilities", {}), service)
+
+    @property
+    def name(self) -> str:
+        return self.capabilities.get("browserName", "")
+
+    async def execute(self, method: str, path: str, body=None):
+        value = await _command(self._connection, method, f"/session/{self.session_id}{path}", self._wrap(body))
+        return self._unwrap(value)
+
+    def _wrap(self, value):
+        if isinstance(value, AsyncWebElement):
+            return {W3C_ELEMENT: value.id}
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, dict):
+            if W3C_ELEMENT in value:
+                return AsyncWebElement(self, value[W3C_ELEMENT])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+
+    async def get(self, url: str):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def current_url(self) -> str:
+        return await self.execute("GET", "/url")
+
+    async def title(self) -> str:
+        return await self.execute("GET", "/title")
+
+    async def page_source(self) -> str:
+        return await self.execute("GET", "/source")
+
+    async def back(self):
+        await self.execute("POST", "/back", {})
+
+    async def forward(self):
+        await self.execute("POST", "/forward", {})
+
+    async def refresh(self):
+        await self.execute("POST", "/refresh", {})
+
+    async def find_element(self, by=By.ID, value: str = None) -> AsyncWebElement:
+        return await self.execute("POST", "/element", {"using": by, "value": value})
+
+    async def find_elements(self, by=By.ID, value: str = None) -> list:
+        return await self.execute("POST", "/elements", {"using": by, "value": value})
+
+    async def execute_script(self, script: str, *args):
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": list(args)})
+
+    async def execute_async_script(self, script: str, *args):
+        return await self.execute("POST", "/execute/async", {"script": script, "args": list(args)})
+
+    async def window_handles(self) -> list:
+        return await self.execute("GET", "/window/handles")
+
+    async def current_window_handle(self) -> str:
+        return await self.execute("GET", "/window")
+
+    async def switch_to_window(self, handle: str):
+        await self.execute("POST", "/window", {"handle": handle})
+
+    async def close(self):
+        await self.execute("DELETE", "/window")
+
+    async def get_window_size(self) -> dict:
+        rect = await self.execute("GET", "/window/rect")
+        return {"width": rect["width"], "height": rect["height"]}
+
+    async def set_window_size(self, width: int, height: int):
+        await self.execute("POST", "/window/rect", {"width": int(width), "height": int(height)})
+
+    async def delete_all_cookies(self):
+        await self.execute("DELETE", "/cookie")
+
+    async def quit(self):
+        try:
+            await _command(self._connection, "DELETE", f"/session/{self.session_id}")
+        finally:
+            self._connection.close()
+            if self.service is not None:
+                await self.service.stop_async()
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class DriverService:
+    """A driver binary (chromedriver, msedgedriver, geckodriver) listening on a free local port
+
+    Starting it waits for the driver to report ready on /status. The session broker
+    starts and stops services as they are, async callers go through start() and
+    stop_async(), which run the same steps in a thread.
+    """
+
+    def __init__(self, driver_path: str, timeout: float = 20):
+        port = free_port()
+        self.url = f"http://127.0.0.1:{port}"
+        self.process = subprocess.Popen(
+            [driver_path, f"--port={port}"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if (w3c_command(self.url, "GET", "/status", timeout=2) or {}).get("ready", True):
+                    return
+            except (OSError, WebDriverException):
+                pass
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                self.stop()
+                raise WebDriverException(f"{driver_path} did not start listening on port {port}")
+            time.sleep(0.05)
+
+    @classmethod
+    async def start(cls, driver_path: str, timeout: float = 20) -> "DriverService":
+        return await asyncio.to_thread(cls, driver_path, timeout)
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    async def stop_async(self):
+        await asyncio.to_thread(self.stop)
+
+
+def capabilities(browser: str, profile: LaunchProfile = None) -> dict:
+    """W3C capabilities of a new session for a browser and launch profile"""
+    if browser == "fake":
+        return {"browserName": "fake"}
+    if browser not in _OPTIONS:
+        raise TypeError(f"Automation does not support browser {browser}")
+    return (profile or LaunchProfile("default")).apply(browser, _OPTIONS[browser]()).to_capabilities()
+
+
+async def start_session(browser: str, url: str = None, driver_path: str = None, profile: LaunchProfile = None):
+    """New AsyncWebDriver session on the driver at url, or on its own driver binary started from driver_path
+
+    chromedriver and msedgedriver serve any number of sessions, so many sessions can
+    share one service url. geckodriver runs a single session at a time, Firefox
+    sessions started from driver_path get a service each and stop it on quit().
+    """
+    service = None
+    if url is None:
+        service = await DriverService.start(driver_path)
+        url = service.url
+    try:
+        return await AsyncWebDriver.start(url, capabilities(browser, profile), service)
+    except BaseException:
+        if service is not None:
+            await service.stop_async()
+        raise
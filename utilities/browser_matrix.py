@@ -0,0 +1,133 @@
+import re
+
+import pytest
+
+BROWSERS = ("chrome", "edge", "firefox", "fake")
+
+
+def parse_browsers(value: str) -> list:
+    """--browser value as a list of browsers, e.g. "firefox,chrome" -> ["firefox", "chrome"]"""
+    browsers = []
+    for browser in (part.strip().lower() for part in value.split(",")):
+        if not browser or browser in browsers:
+            continue
+        if browser not in BROWSERS:
+            raise ValueError(f"Unknown browser '{browser}', expected one of {', '.join(BROWSERS)}")
+        browsers.append(browser)
+    if not browsers:
+        raise ValueError("--browser needs at least one browser")
+    return browsers
+
+
+def parse_worker_limits(value: str | None, browsers) -> dict:
+    """--browser-workers value as {browser: max workers}, e.g. "firefox=2,chrome=1" """
+    limits = {}
+    for part in filter(None, (part.strip() for part in (value or "").split(","))):
+        browser, _, count = part.partition("=")
+        browser = browser.strip().lower()
+        if browser not in browsers:
+            raise ValueError(f"--browser-workers names '{browser}', which is not in --browser")
+        if not count.strip().isdigit() or int(count) < 1:
+            raise ValueError(f"--browser-workers needs a worker count of at least 1 for {browser}, got '{count}'")
+        limits[browser] = int(count)
+    return limits
+
+
+def strip_browser(nodeid: str, browsers) -> str:
+    """Node id of a matrix test with its browser parameter removed, shared by all of its browsers"""
+    params = re.search(r"\[(.*)\]$", nodeid)
+    if not params:
+        return nodeid
+    rest = [param for param in params.group(1).split("-") if param not in browsers]
+    base = nodeid[:params.start()]
+    return f"{base}[{'-'.join(rest)}]" if rest else base
+
+
+class BrowserMatrixReport:
+    """Collects the duration and outcome of every test per browser and shows the browsers side by side
+
+    The duration of a test is its setup, call and teardown time on that browser.
+    """
+
+    def __init__(self, browsers, missing=()):
+        self.browsers = list(browsers)
+        self.missing = set(missing)
+        self.tests = {}
+
+    def pytest_runtest_logreport(self, report):
+        browser = next((param for param in self._params(report.nodeid) if param in self.browsers), None)
+        if browser is None:
+            return
+        result = self.tests.setdefault(strip_browser(report.nodeid, self.browsers), {}).setdefault(
+            browser, {"seconds": 0.0, "outcome": "passed"}
+        )
+        result["seconds"] += report.duration
+        if report.failed:
+            result["outcome"] = "failed"
+        elif report.skipped and result["outcome"] == "passed":
+            result["outcome"] = "skipped"
+
+    @staticmethod
+    def _params(nodeid: str) -> list:
+        params = re.search(r"\[(.*)\]$", nodeid)
+        return params.group(1).split("-") if params else []
+
+    def totals(self) -> dict:
+        """Time spent and tests passed, failed and skipped on each browser"""
+        totals = {browser: {"seconds": 0.0, "passed": 0, "failed": 0, "skipped": 0} for browser in self.browsers}
+        for results in self.tests.values():
+            for browser, result in results.items():
+                totals[browser]["seconds"] += result["seconds"]
+                totals[browser][result["outcome"]] += 1
+        return totals
+
+    def _cell(self, result) -> str:
+        if result is None:
+            return "-"
+        if result["outcome"] == "skipped":
+            return "skipped"
+        return f"{result['seconds']:.2f}s" + (" FAIL" if result["outcome"] == "failed" else "")
+
+    def rows(self) -> list:
+        """(test, cell per browser) ordered by the slowest browser time, slowest first"""
+        ordered = sorted(
+            self.tests.items(),
+            key=lambda item: -max(result["seconds"] for result in item[1].values()),
+        )
+        return [(test, [self._cell(results.get(browser)) for browser in self.browsers]) for test, results in ordered]
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix):
+        if not self.tests:
+            return
+        from py.xml import html
+
+        totals = self.totals()
+        postfix.extend([
+            html.h2("Browser matrix"),
+            html.table(
+                html.tr(html.th("test"), [html.th(browser) for browser in self.browsers]),
+                [html.tr(html.td(test), [html.td(cell) for cell in cells]) for test, cells in self.rows()],
+                html.tr(html.th("total"), [html.th(
+                    "not installed" if browser in self.missing else
+                    f"{totals[browser]['seconds']:.2f}s ({totals[browser]['passed']} passed, "
+                    f"{totals[browser]['failed']} failed)"
+                ) for browser in self.browsers]),
+            ),
+        ])
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.tests:
+            return
+        terminalreporter.section("browser matrix")
+        width = max(len(test) for test in self.tests) + 2
+        terminalreporter.write_line(f"{'test':<{width}}" + "".join(f"{browser:>14}" for browser in self.browsers))
+        for test, cells in self.rows():
+            terminalreporter.write_line(f"{test:<{width}}" + "".join(f"{cell:>14}" for cell in cells))
+        totals = self.totals()
+        terminalreporter.write_line(
+            f"{'total':<{width}}" + "".join(f"{totals[browser]['seconds']:>13.2f}s" for browser in self.browsers)
+        )
+        for browser in self.browsers:
+            if browser in self.missing:
+                terminalreporter.write_line(f"{browser} is not installed, its tests were skipped", yellow=True)
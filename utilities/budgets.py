@@ -0,0 +1,132 @@
+import json
+import math
+import os
+
+import pytest
+
+from utilities import metrics
+
+BUDGET_KEYS = ("seconds", "roundtrips", "waits")
+# Least a baseline may grow by, so small or zero recorded numbers still leave some room
+_MIN_SLACK = {"seconds": 0.05, "roundtrips": 1, "waits": 0.05}
+
+
+class BudgetExceeded(pytest.PytestWarning):
+    """Emitted instead of a failure when budgets run in soft mode"""
+
+
+# Browser startup the lazy driver fixture did inside the test call, left out of its wall time
+_CALL_DRIVER_START = pytest.StashKey[float]()
+
+
+def measure(report, driver_start: float = 0.0) -> dict:
+    """Wall time, WebDriver round trips and cumulative wait time of the test that just ran
+
+    ``driver_start`` is the time spent starting the browser during the call, which depends
+    on run order (a cold pool) rather than on the test, so it is not counted.
+    """
+    test_metrics = metrics.current()
+    return {
+        "seconds": max(report.duration - driver_start, 0.0),
+        # Round trips are only counted on instrumented drivers
+        "roundtrips": len(test_metrics.commands) if test_metrics.commands else None,
+        "waits": test_metrics.wait_seconds,
+    }
+
+
+def violations(limits: dict, actual: dict, source: str) -> list:
+    found = []
+    for key in BUDGET_KEYS:
+        if limits.get(key) is None or actual.get(key) is None:
+            continue
+        if actual[key] > limits[key]:
+            found.append(f"{key} {_format(key, actual[key])} > {_format(key, limits[key])} ({source})")
+    return found
+
+
+def _format(key: str, value) -> str:
+    return str(value) if key == "roundtrips" else f"{value:.3f}s"
+
+
+class BudgetBaseline:
+    """Recorded per-test numbers that later runs may exceed by at most ``drift`` (a fraction)"""
+
+    def __init__(self, path: str, drift: float):
+        self.path = path
+        self.drift = drift
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as baseline_file:
+                self.entries = json.load(baseline_file)
+
+    def limits_for(self, nodeid: str) -> dict:
+        entry = self.entries.get(nodeid)
+        if not entry:
+            return {}
+        return {key: self._limit(key, value) for key, value in entry.items() if value is not None}
+
+    def _limit(self, key: str, value):
+        limit = max(value * (1 + self.drift), value + _MIN_SLACK[key])
+        return math.ceil(limit) if key == "roundtrips" else limit
+
+    def record(self, nodeid: str, actual: dict):
+        self.entries[nodeid] = {key: actual.get(key) for key in BUDGET_KEYS}
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as baseline_file:
+            json.dump(self.entries, baseline_file, indent=2, sort_keys=True)
+
+
+class BudgetPlugin:
+    """Fails (or warns, in soft mode) tests that exceed their @pytest.mark.budget or the recorded baseline"""
+
+    def __init__(self, soft: bool, baseline: BudgetBaseline = None, record: bool = False):
+        self.soft = soft
+        self.baseline = baseline
+        self.record = record
+
+    def wants_roundtrips(self, item) -> bool:
+        marker = item.get_closest_marker("budget")
+        return self.baseline is not None or (marker is not None and "roundtrips" in marker.kwargs)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        started = metrics.current().driver_start_seconds
+        yield
+        item.stash[_CALL_DRIVER_START] = metrics.current().driver_start_seconds - started
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if call.when != "call":
+            return
+        actual = measure(report, item.stash.get(_CALL_DRIVER_START, 0.0))
+        report.user_properties.append(("budget_actual", actual))
+        if not report.passed or self.record:
+            return
+
+        found = []
+        marker = item.get_closest_marker("budget")
+        if marker is not None:
+            found += violations(marker.kwargs, actual, "budget marker")
+        if self.baseline is not None:
+            found += violations(self.baseline.limits_for(item.nodeid), actual, f"baseline +{self.baseline.drift:.0%}")
+        if not found:
+            return
+
+        message = "Performance budget exceeded: " + "; ".join(found)
+        if self.soft:
+            item.warn(BudgetExceeded(message))
+        else:
+            report.outcome = "failed"
+            report.longrepr = message
+
+    def pytest_runtest_logreport(self, report):
+        if self.record and report.when == "call" and report.passed:
+            self.baseline.record(report.nodeid, dict(report.user_properties)["budget_actual"])
+
+    def pytest_sessionfinish(self, session):
+        if self.record and not hasattr(session.config, "workerinput"):
+            self.baseline.save()
@@ -0,0 +1,162 @@
+import json
+import os
+import sys
+import weakref
+from time import perf_counter
+
+import pytest
+
+from utilities import metrics
+from utilities.metrics import percentile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PAGE_OBJECTS_DIR = os.path.join(PROJECT_ROOT, "page_objects") + os.sep
+_TEST_CASES_DIR = os.path.join(PROJECT_ROOT, "test_cases") + os.sep
+
+_instrumented = weakref.WeakSet()
+
+
+def instrument(driver):
+    """Time every WebDriver command the driver sends and record it on the running test's metrics
+
+    Element commands go through the parent driver's execute() as well, so wrapping
+    that single method covers the whole W3C command surface.
+    """
+    if driver in _instrumented:
+        return driver
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        started = perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            metrics.current().record_command(driver_command, perf_counter() - started, _issuer())
+
+    driver.execute = timed_execute
+    _instrumented.add(driver)
+    return driver
+
+
+def _issuer() -> str:
+    """The page-object method (or else the test) that sent the command"""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_PAGE_OBJECTS_DIR):
+            owner = frame.f_locals.get("self")
+            issuer = f"{type(owner).__name__ if owner is not None else os.path.basename(filename)}.{frame.f_code.co_name}"
+            # BasePage helpers are reported under the page-object method that called them
+            if os.path.basename(filename) != "base_page.py":
+                return issuer
+            fallback = fallback or issuer
+        elif fallback is None and filename.startswith(_TEST_CASES_DIR):
+            fallback = frame.f_code.co_name
+        frame = frame.f_back
+    return fallback or "-"
+
+
+class CommandTimingReport:
+    """Collects the per-test command timings on the controller and writes the report section and JSON sidecar"""
+
+    def __init__(self, json_path: str):
+        self.json_path = json_path
+        self.tests = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call":
+            return
+        properties = dict(report.user_properties)
+        if properties.get("roundtrips"):
+            self.tests[report.nodeid] = properties
+
+    def command_stats(self) -> dict:
+        durations = {}
+        for properties in self.tests.values():
+            for command, samples in properties["command_durations"].items():
+                durations.setdefault(command, []).extend(samples)
+        return {
+            command: {
+                "count": len(samples),
+                "p50": percentile(samples, 0.5),
+                "p95": percentile(samples, 0.95),
+                "total": sum(samples),
+            }
+            for command, samples in durations.items()
+        }
+
+    def slowest_commands(self, count: int = 10) -> list:
+        calls = [
+            dict(call, test=nodeid)
+            for nodeid, properties in self.tests.items()
+            for call in properties["slowest_commands"]
+        ]
+        return sorted(calls, key=lambda call: call["seconds"], reverse=True)[:count]
+
+    def to_json(self) -> dict:
+        return {
+            "commands": self.command_stats(),
+            "slowest": self.slowest_commands(),
+            "tests": {
+                nodeid: {
+                    "roundtrips": properties["roundtrips"],
+                    "commands": {
+                        command: {
+                            "count": len(samples),
+                            "p50": percentile(samples, 0.5),
+                            "p95": percentile(samples, 0.95),
+                        }
+                        for command, samples in properties["command_durations"].items()
+                    },
+                    "slowest": properties["slowest_commands"],
+                }
+                for nodeid, properties in self.tests.items()
+            },
+        }
+
+    def pytest_sessionfinish(self, session):
+        if not self.tests:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.json_path)), exist_ok=True)
+        with open(self.json_path, "w") as json_file:
+            json.dump(self.to_json(), json_file, indent=2)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix):
+        if not self.tests:
+            return
+        from py.xml import html
+
+        stats = sorted(self.command_stats().items(), key=lambda item: -item[1]["total"])
+        postfix.extend([
+            html.h2("WebDriver commands"),
+            html.p(f"{sum(properties['roundtrips'] for properties in self.tests.values())} round trips "
+                   f"in {len(self.tests)} tests, details in {os.path.basename(self.json_path)}"),
+            html.table(
+                html.tr([html.th(name) for name in ("command", "count", "p50", "p95", "total")]),
+                [html.tr(
+                    html.td(command), html.td(values["count"]),
+                    html.td(f"{values['p50'] * 1000:.1f}ms"), html.td(f"{values['p95'] * 1000:.1f}ms"),
+                    html.td(f"{values['total']:.2f}s"),
+                ) for command, values in stats],
+            ),
+            html.h3("Slowest calls"),
+            html.table(
+                [html.tr(
+                    html.td(call["test"]), html.td(call["command"]), html.td(call["issuer"]),
+                    html.td(f"{call['seconds'] * 1000:.1f}ms"),
+                ) for call in self.slowest_commands()],
+            ),
+        ])
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.tests:
+            return
+        terminalreporter.section("webdriver commands")
+        for command, values in sorted(self.command_stats().items(), key=lambda item: -item[1]["total"])[:10]:
+            terminalreporter.write_line(
+                f"{command:<28} {values['count']:>5}x p50 {values['p50'] * 1000:7.1f}ms "
+                f"p95 {values['p95'] * 1000:7.1f}ms total {values['total']:.2f}s"
+            )
+        terminalreporter.write_line(f"Details written to {self.json_path}")
@@ -0,0 +1,63 @@
+import importlib
+from time import perf_counter
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utilities.launch_profiles import LaunchProfile
+
+# Seconds spent importing each browser backend, filled in by the first launch of that browser
+backend_import_seconds = {}
+_backends = {}
+
+
+def _backend(browser: str) -> tuple:
+    """(WebDriver, Service, Options) classes of a browser, imported on its first launch"""
+    if browser not in _backends:
+        started = perf_counter()
+        modules = [importlib.import_module(f"selenium.webdriver.{browser}.{module}")
+                   for module in ("webdriver", "service", "options")]
+        _backends[browser] = (modules[0].WebDriver, modules[1].Service, modules[2].Options)
+        backend_import_seconds[browser] = perf_counter() - started
+    return _backends[browser]
+
+
+def create_driver(browser: str, driver_path: str, profile: LaunchProfile = None, proxy: str = None) -> WebDriver:
+    """Launch a new browser session using an already resolved driver binary
+
+    ``proxy`` is a host:port that all browser traffic, including localhost, is sent through.
+    """
+    profile = profile or LaunchProfile("default")
+    print(f"Creating driver for {browser} ({profile.name} profile)")
+
+    if browser in ("edge", "firefox", "chrome"):
+        driver_class, service_class, options_class = _backend(browser)
+        options = _use_proxy(browser, profile.apply(browser, options_class()), proxy)
+        driver = driver_class(
+            service=service_class(driver_path),
+            options=options
+        )
+    elif browser == "fake":
+        # In-process driver over test_assets/pages, there is no binary and no network to proxy
+        from utilities.fake_driver import FakeWebDriver
+        driver = FakeWebDriver(profile)
+    else:
+        raise TypeError(f"Automation does not support browser {browser}")
+
+    return driver
+
+
+def _use_proxy(browser: str, options, proxy: str):
+    if not proxy:
+        return options
+    host, port = proxy.rsplit(":", 1)
+    if browser == "firefox":
+        options.set_preference("network.proxy.type", 1)
+        for scheme in ("http", "ssl"):
+            options.set_preference(f"network.proxy.{scheme}", host)
+            options.set_preference(f"network.proxy.{scheme}_port", int(port))
+        options.set_preference("network.proxy.no_proxies_on", "")
+        options.set_preference("network.proxy.allow_hijacking_localhost", True)
+    else:
+        options.add_argument(f"--proxy-server=http://{proxy}")
+        options.add_argument("--proxy-bypass-list=<-loopback>")
+    return options
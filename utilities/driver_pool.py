@@ -0,0 +1,107 @@
+from urllib.parse import urlsplit
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Clears storage for the current origin. about:blank and data: pages throw on access.
+_CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def _origin(url: str) -> str | None:
+    """scheme://host[:port] of an http(s) url, None for about:blank, data: and the like"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") else None
+
+
+class PooledSession:
+    """A warm browser session plus the state needed to reset it between tests"""
+
+    def __init__(self, browser: str, driver: WebDriver):
+        self.browser = browser
+        self.driver = driver
+        self.uses = 0
+        self.main_window = driver.current_window_handle
+        self.window_size = driver.get_window_size()
+
+
+class DriverPool:
+    """Hands out warm browser sessions, one per browser type, for the lifetime of a worker
+
+    Sessions are reset between tests and recycled after ``max_uses`` tests or
+    as soon as a reset fails. ``max_uses=1`` gives a fresh browser per test.
+
+    WebDriver can only clear cookies and storage of the origin that is loaded, so the
+    reset clears every origin a window of the session ends the test on (Chromium also
+    drops all cookies through CDP). An origin a test navigated away from is not seen;
+    tests that depend on a clean cookie jar across origins need ``max_uses=1``.
+    """
+
+    def __init__(self, factory, max_uses: int = 20):
+        self._factory = factory
+        self._max_uses = max(1, max_uses)
+        self._idle = {}
+        self._active = {}
+
+    def acquire(self, browser: str) -> WebDriver:
+        session = self._idle.pop(browser, None)
+        if session is None:
+            session = PooledSession(browser, self._factory(browser))
+        session.uses += 1
+        self._active[id(session.driver)] = session
+        return session.driver
+
+    def release(self, driver: WebDriver, recycle: bool = False):
+        session = self._active.pop(id(driver), None)
+        if session is None:
+            return
+        if recycle or session.uses >= self._max_uses or not self._reset(session):
+            self._quit(session)
+            return
+        self._idle[session.browser] = session
+
+    def close(self):
+        for session in list(self._idle.values()) + list(self._active.values()):
+            self._quit(session)
+        self._idle.clear()
+        self._active.clear()
+
+    def _reset(self, session: PooledSession) -> bool:
+        driver = session.driver
+        try:
+            # Note the origin of every window, closing those left behind by BasePage._switch_tab
+            origins = {}
+            for handle in driver.window_handles:
+                driver.switch_to.window(handle)
+                origins[_origin(driver.current_url)] = handle
+                if handle != session.main_window:
+                    driver.close()
+            driver.switch_to.window(session.main_window)
+
+            if hasattr(driver, "execute_cdp_cmd"):
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            # The main window's origin is still loaded, any other one has to be loaded to be cleared
+            loaded = _origin(driver.current_url)
+            for origin in sorted(origins.keys() - {None}, key=lambda origin: origin != loaded):
+                if origin != loaded:
+                    driver.get(origin + "/")
+                driver.delete_all_cookies()
+                driver.execute_script(_CLEAR_STORAGE_JS)
+            driver.get("about:blank")
+
+            if driver.get_window_size() != session.window_size:
+                driver.set_window_size(session.window_size["width"], session.window_size["height"])
+        except Exception as error:
+            # A crashed browser surfaces as a transport error rather than a WebDriverException
+            print(f"Reset failed for {session.browser} session, recycling it: {error}")
+            return False
+        return True
+
+    @staticmethod
+    def _quit(session: PooledSession):
+        print(f"Closing driver for {session.browser}")
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,150 @@
+import importlib
+import json
+import os
+import platform
+import shutil
+import time
+
+# WebDriver Manager config for Mac ARM 64
+os.environ["WDM_ARCHITECTURE"] = "arm64" if platform.processor() == "arm" else "x64"
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOCKFILE = os.path.join(PROJECT_ROOT, "config", "webdriver.lock.json")
+# Driver binaries are cached inside the project (.wdm/) so the lockfile paths stay relative
+CACHE_ROOT = os.path.join(PROJECT_ROOT, ".wdm")
+
+# webdriver_manager module and class per browser, imported only when that browser's driver is resolved online
+_MANAGERS = {
+    "chrome": ("webdriver_manager.chrome", "ChromeDriverManager", "driver_version"),
+    "firefox": ("webdriver_manager.firefox", "GeckoDriverManager", "version"),
+    "edge": ("webdriver_manager.microsoft", "EdgeChromiumDriverManager", "version"),
+}
+
+# Executable names and default install locations of the browsers themselves
+_BROWSER_BINARIES = {
+    "chrome": [
+        "google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    ],
+    "firefox": [
+        "firefox",
+        "/Applications/Firefox.app/Contents/MacOS/firefox",
+        r"C:\Program Files\Mozilla Firefox\firefox.exe",
+    ],
+    "edge": [
+        "microsoft-edge", "microsoft-edge-stable", "msedge",
+        "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",
+        r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+    ],
+}
+
+
+class DriverResolutionError(Exception):
+    pass
+
+
+class ResolvedDriver:
+    """Location of a webdriver binary and how long it took to find it"""
+
+    def __init__(self, browser: str, path: str, version: str, source: str, seconds: float):
+        self.browser = browser
+        self.path = path
+        self.version = version
+        self.source = source
+        self.seconds = seconds
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ResolvedDriver":
+        return cls(**data)
+
+
+def browser_installed(browser: str) -> bool:
+    """Whether the browser itself can be found locally; browsers without a binary (fake) always can"""
+    candidates = _BROWSER_BINARIES.get(browser)
+    return candidates is None or any(shutil.which(candidate) for candidate in candidates)
+
+
+def platform_key() -> str:
+    from webdriver_manager.core.os_manager import OperationSystemManager
+    return OperationSystemManager().get_os_type()
+
+
+def load_lockfile(path: str = LOCKFILE) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as lockfile:
+        return json.load(lockfile)
+
+
+def save_lockfile(lock: dict, path: str = LOCKFILE):
+    with open(path, "w") as lockfile:
+        json.dump(lock, lockfile, indent=4, sort_keys=True)
+        lockfile.write("\n")
+
+
+def resolve_drivers(browsers, offline: bool = False, update_lock: bool = False) -> dict:
+    """Resolve the driver binary for each browser once and pin the result in the lockfile
+
+    Online, the version pinned in the lockfile is installed (or the latest one when
+    ``update_lock`` is set or nothing is pinned yet). Offline, the pinned binary must
+    already be in the project cache and the network is never touched.
+    """
+    browsers = [browser for browser in browsers if browser in _MANAGERS]
+    if not browsers:
+        # Nothing to resolve (fake only), so webdriver_manager is never imported
+        return {}
+    lock = load_lockfile()
+    pinned = lock.setdefault(platform_key(), {})
+    resolved = {}
+
+    for browser in browsers:
+        started = time.perf_counter()
+        entry = pinned.get(browser)
+        if offline:
+            path, version, source = _resolve_offline(browser, entry)
+        else:
+            path, version, source = _resolve_online(browser, None if update_lock else entry)
+            pinned[browser] = {
+                "version": version,
+                "path": os.path.relpath(path, CACHE_ROOT).replace(os.sep, "/"),
+            }
+        resolved[browser] = ResolvedDriver(browser, path, version, source, time.perf_counter() - started)
+
+    if not offline and resolved:
+        save_lockfile(lock)
+    return resolved
+
+
+def _resolve_offline(browser: str, entry: dict):
+    if not entry:
+        raise DriverResolutionError(
+            f"No {browser} driver pinned for {platform_key()} in {LOCKFILE}, run once without --offline"
+        )
+    path = os.path.join(CACHE_ROOT, *entry["path"].split("/"))
+    if not os.path.isfile(path):
+        raise DriverResolutionError(
+            f"Pinned {browser} driver {entry['version']} is not cached at {path}, run once without --offline"
+        )
+    return path, entry["version"], "lockfile"
+
+
+def _resolve_online(browser: str, entry: dict):
+    from webdriver_manager.core.driver_cache import DriverCacheManager
+
+    module, class_name, version_argument = _MANAGERS[browser]
+    manager_class = getattr(importlib.import_module(module), class_name)
+    manager = manager_class(
+        **{version_argument: entry["version"] if entry else None},
+        cache_manager=DriverCacheManager(root_dir=PROJECT_ROOT),
+    )
+    try:
+        path = manager.install()
+    except Exception as error:
+        raise DriverResolutionError(f"Could not resolve the {browser} driver: {error}") from error
+    # Cached binaries live at .wdm/drivers/<driver>/<os>/<version>/...
+    version = os.path.relpath(path, CACHE_ROOT).split(os.sep)[3]
+    return path, version, "pinned" if entry else "latest"
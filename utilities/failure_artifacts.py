@@ -0,0 +1,154 @@
+import base64
+import gzip
+import json
+import os
+import queue
+import re
+import threading
+from time import perf_counter
+
+import pytest
+
+from utilities.lazy_driver import LazyDriver
+
+try:
+    from pytest_html import extras as html_extras
+except ImportError:
+    html_extras = None
+
+# Most characters of a test id kept in its artifact directory name
+_MAX_NAME = 120
+
+
+def artifact_name(nodeid: str) -> str:
+    """Directory name for the artifacts of a test, e.g. test_cases/test_a.py::test_b[x] -> test_a.py-test_b-x"""
+    name = re.sub(r"[^\w.]+", "-", nodeid.split("/")[-1]).strip("-")
+    return name[-_MAX_NAME:]
+
+
+def capture(driver) -> dict:
+    """What a failed test's browser shows right now: screenshot (base64 PNG), page source, url and console log
+
+    Only the WebDriver calls happen here, every artifact the session cannot provide
+    (console logs outside Chromium, screenshots on the fake driver) is left out.
+    """
+    artifacts = {}
+    for name, read in (
+        ("url", lambda: driver.current_url),
+        ("screenshot", lambda: driver.get_screenshot_as_base64()),
+        ("page_source", lambda: driver.page_source),
+        ("console", lambda: driver.get_log("browser")),
+    ):
+        try:
+            artifacts[name] = read()
+        except Exception:
+            continue
+    return artifacts
+
+
+class ArtifactWriter:
+    """Decodes, compresses and writes captured artifacts on a background thread"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self.errors = []
+        self._thread = threading.Thread(target=self._run, name="failure-artifacts", daemon=True)
+        self._thread.start()
+
+    def submit(self, directory: str, artifacts: dict, details: dict):
+        self._queue.put((directory, artifacts, details))
+
+    def close(self):
+        """Wait for everything submitted so far to be written and stop the thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                self._write(*job)
+            except Exception as error:
+                # One bad artifact (undecodable screenshot, unserialisable log entry) must not stop the thread
+                self.errors.append(f"{job[0]}: {type(error).__name__}: {error}")
+
+    @staticmethod
+    def _write(directory: str, artifacts: dict, details: dict):
+        os.makedirs(directory, exist_ok=True)
+        if "screenshot" in artifacts:
+            with open(os.path.join(directory, "screenshot.png"), "wb") as screenshot_file:
+                screenshot_file.write(base64.b64decode(artifacts["screenshot"]))
+        if "page_source" in artifacts:
+            with gzip.open(os.path.join(directory, "page.html.gz"), "wt", encoding="utf-8") as source_file:
+                source_file.write(artifacts["page_source"])
+        if "console" in artifacts:
+            with open(os.path.join(directory, "console.json"), "w") as console_file:
+                json.dump(artifacts["console"], console_file, indent=2)
+        with open(os.path.join(directory, "failure.json"), "w") as details_file:
+            json.dump(dict(details, url=artifacts.get("url")), details_file, indent=2)
+
+
+class FailureArtifacts:
+    """Captures the browser state of failing tests and links it from the report
+
+    The capture runs in the report hook, before teardown hands the session back
+    to the pool and resets it. Writing the files is left to an ArtifactWriter so
+    neither the teardown nor the next test waits for the disk.
+    """
+
+    # Files an artifact is written to, in the order the report links them
+    files = {"screenshot": "screenshot.png", "page_source": "page.html.gz", "console": "console.json"}
+
+    def __init__(self, directory: str, report_path: str | None = None):
+        self.directory = directory
+        # Links are relative to the html report, which may live somewhere else
+        self.link_root = os.path.dirname(os.path.abspath(report_path)) if report_path else os.getcwd()
+        self.writer = ArtifactWriter()
+        self.captures = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        driver = item.funcargs.get("driver") if hasattr(item, "funcargs") else None
+        if not report.failed or call.when == "teardown" or driver is None:
+            return
+        if isinstance(driver, LazyDriver) and not driver.started:
+            # The test failed before its first command, there is no browser to capture
+            return
+        started = perf_counter()
+        artifacts = capture(driver)
+        attempt = self.captures[item.nodeid] = self.captures.get(item.nodeid, 0) + 1
+        directory = os.path.join(
+            self.directory, artifact_name(item.nodeid) + (f"-{attempt}" if attempt > 1 else "")
+        )
+        self.writer.submit(directory, artifacts, {"test": item.nodeid, "when": call.when})
+
+        paths = {name: os.path.join(directory, file) for name, file in self.files.items() if name in artifacts}
+        report.user_properties.append(("failure_artifacts", {
+            "directory": directory, "url": artifacts.get("url"), "files": paths,
+            "capture_seconds": round(perf_counter() - started, 4),
+        }))
+        if html_extras is not None:
+            links = [html_extras.url(os.path.relpath(path, self.link_root), name=name) for name, path in paths.items()]
+            if artifacts.get("url"):
+                links.append(html_extras.url(artifacts["url"], name="page url"))
+            report.extra = getattr(report, "extra", []) + links
+
+    def pytest_sessionfinish(self, session):
+        self.writer.close()
+        if hasattr(session.config, "workerinput"):
+            session.config.workeroutput["failure_artifact_errors"] = self.writer.errors
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        self.writer.errors.extend(getattr(node, "workeroutput", {}).get("failure_artifact_errors", []))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if hasattr(terminalreporter.config, "workerinput") or not self.writer.errors:
+            return
+        terminalreporter.section("failure artifacts")
+        for error in self.writer.errors:
+            terminalreporter.write_line(f"Could not write failure artifacts to {error}", yellow=True)
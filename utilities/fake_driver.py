@@ -0,0 +1,816 @@
+import itertools
+import os
+import re
+import uuid
+from html import escape
+from html.parser import HTMLParser
+from time import perf_counter
+from urllib.parse import urljoin, urlsplit
+
+from selenium.common import (
+    ElementNotInteractableException,
+    InvalidArgumentException,
+    InvalidSelectorException,
+    JavascriptException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    UnknownMethodException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.script_key import ScriptKey
+from selenium.webdriver.remote.webelement import WebElement
+
+from page_objects.base_page import QUERY_ELEMENTS_JS
+from utilities.launch_profiles import LaunchProfile
+from utilities.locator_profiler import LOCATOR_TIMING_JS
+from utilities.script_registry import HELPERS_GLOBAL, INVOKE_ASYNC_JS, INVOKE_JS
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES_DIR = os.path.join(PROJECT_ROOT, "test_assets", "pages")
+# Fixture directory used for every host that has no directory of its own, i.e. the site under test
+SITE_DIR = "the-internet"
+
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_HIDDEN_TAGS = {"head", "script", "style", "template", "title", "noscript"}
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "div", "dl", "dt", "dd", "fieldset", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "section", "table",
+    "tr", "ul",
+}
+_DEFAULT_WINDOW_SIZE = (1280, 800)
+# Real drivers answer is_displayed() with a JavaScript atom, the fake one has its own command for it
+IS_ELEMENT_DISPLAYED = "isElementDisplayed"
+# Commands that still work after the current window was closed
+_WINDOWLESS_COMMANDS = {Command.QUIT, Command.SWITCH_TO_WINDOW, Command.W3C_GET_WINDOW_HANDLES}
+
+
+class Node:
+    """An element of a parsed fixture page; text content is kept as plain strings among the children"""
+
+    def __init__(self, tag: str, attrs: dict, parent: "Node" = None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+        self.element_id = None
+        # Form state that the page changes without touching the markup
+        self.checked = "checked" in attrs
+        self.value = attrs.get("value", "")
+
+    def elements(self):
+        """Descendant elements in document order"""
+        for child in self.children:
+            if isinstance(child, Node):
+                yield child
+                yield from child.elements()
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def string_value(self) -> str:
+        """All descendant text, visible or not, like XPath's string(.)"""
+        return "".join(child if isinstance(child, str) else child.string_value() for child in self.children)
+
+    def own_text(self) -> list:
+        return [child for child in self.children if isinstance(child, str)]
+
+    def is_displayed(self) -> bool:
+        return all(_renders(node) for node in itertools.chain([self], self.ancestors()))
+
+    def rendered_text(self) -> str:
+        """Visible text with whitespace collapsed per line, roughly what innerText gives"""
+        if not self.is_displayed():
+            return ""
+        parts = []
+        self._collect_text(parts)
+        lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def _collect_text(self, parts: list):
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag == "br":
+                parts.append("\n")
+            elif _renders(child):
+                block = child.tag in _BLOCK_TAGS
+                if block:
+                    parts.append("\n")
+                child._collect_text(parts)
+                if block:
+                    parts.append("\n")
+
+
+def _renders(node: Node) -> bool:
+    style = node.attrs.get("style", "").replace(" ", "").lower()
+    return not (
+        node.tag in _HIDDEN_TAGS
+        or "hidden" in node.attrs
+        or (node.tag == "input" and node.attrs.get("type") == "hidden")
+        or "display:none" in style
+        or "visibility:hidden" in style
+    )
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {})
+        self._open = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: "" if value is None else value for name, value in attrs}, self._open[-1])
+        self._open[-1].children.append(node)
+        if tag not in _VOID_TAGS:
+            self._open.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self._open.pop()
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open element and ignore stray end tags
+        for depth in range(len(self._open) - 1, 0, -1):
+            if self._open[depth].tag == tag:
+                del self._open[depth:]
+                return
+
+    def handle_data(self, data):
+        self._open[-1].children.append(data)
+
+
+class Document:
+    def __init__(self, url: str, source: str):
+        self.url = url
+        self.source = source
+        builder = _TreeBuilder()
+        builder.feed(source)
+        builder.close()
+        self.root = builder.root
+        # False once the window navigated away; its elements are stale from then on
+        self.alive = True
+        # Whether the script registry bundle was installed into this document
+        self.helpers_installed = False
+
+    @property
+    def title(self) -> str:
+        title = next((node for node in self.root.elements() if node.tag == "title"), None)
+        return " ".join(title.string_value().split()) if title is not None else ""
+
+
+# CSS selectors: compound selectors of tag, #id, .class and [attribute] parts joined by descendant
+# or child combinators, in comma separated groups. Enough for the locators page objects use.
+_CSS_TOKEN = re.compile(r"""
+    \s*(?P<combinator>[>+~,])\s*
+  | (?P<space>\s+)
+  | (?P<tag>\*|[a-zA-Z][\w-]*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<cls>[\w-]+)
+  | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[~^$*|]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[\w-]+))\s*)?\]
+  | :(?P<pseudo>checked|first-child|last-child)
+""", re.VERBOSE)
+
+
+def _parse_css(selector: str) -> list:
+    """[[(combinator, compound), ...], ...] per comma separated group, compounds are dicts of conditions"""
+    groups, steps, compound, combinator = [], [], None, " "
+    position = 0
+    selector = selector.strip()
+    while position < len(selector):
+        match = _CSS_TOKEN.match(selector, position)
+        if match is None or match.end() == position:
+            raise InvalidSelectorException(f"The fake driver cannot parse css selector {selector!r}")
+        position = match.end()
+        kind = match.lastgroup if match.lastgroup in ("combinator", "space") else None
+        if kind == "space" or (kind == "combinator" and match.group("combinator") in ">,"):
+            if compound is None:
+                if kind == "space":
+                    continue
+                raise InvalidSelectorException(f"The fake driver cannot parse css selector {selector!r}")
+            steps.append((combinator, compound))
+            compound = None
+            token = match.group("combinator") if kind == "combinator" else " "
+            if token == ",":
+                groups.append(steps)
+                steps, combinator = [], " "
+            else:
+                combinator = token
+            continue
+        if kind == "combinator":
+            raise InvalidSelectorException(f"The fake driver does not support the {match.group('combinator')!r} combinator")
+        compound = compound or {"tag": None, "ids": [], "classes": [], "attrs": [], "pseudos": []}
+        if match.group("tag"):
+            compound["tag"] = match.group("tag").lower()
+        elif match.group("id"):
+            compound["ids"].append(match.group("id"))
+        elif match.group("cls"):
+            compound["classes"].append(match.group("cls"))
+        elif match.group("attr"):
+            value = next((match.group(name) for name in ("dq", "sq", "bare") if match.group(name) is not None), None)
+            compound["attrs"].append((match.group("attr").lower(), match.group("op"), value))
+        else:
+            compound["pseudos"].append(match.group("pseudo"))
+    if compound is None:
+        raise InvalidSelectorException(f"The fake driver cannot parse css selector {selector!r}")
+    steps.append((combinator, compound))
+    groups.append(steps)
+    return groups
+
+
+def _attribute_matches(node: Node, name: str, op: str, expected: str) -> bool:
+    if name not in node.attrs:
+        return False
+    actual = node.attrs[name]
+    if op is None:
+        return True
+    return {
+        "=": actual == expected,
+        "~=": expected in actual.split(),
+        "^=": bool(expected) and actual.startswith(expected),
+        "$=": bool(expected) and actual.endswith(expected),
+        "*=": bool(expected) and expected in actual,
+        "|=": actual == expected or actual.startswith(expected + "-"),
+    }[op]
+
+
+def _compound_matches(node: Node, compound: dict) -> bool:
+    if compound["tag"] not in (None, "*") and node.tag != compound["tag"]:
+        return False
+    if any(node.attrs.get("id") != element_id for element_id in compound["ids"]):
+        return False
+    classes = node.attrs.get("class", "").split()
+    if any(name not in classes for name in compound["classes"]):
+        return False
+    if not all(_attribute_matches(node, *attribute) for attribute in compound["attrs"]):
+        return False
+    siblings = [child for child in node.parent.children if isinstance(child, Node)] if node.parent else [node]
+    checks = {
+        "checked": lambda: node.checked,
+        "first-child": lambda: siblings[0] is node,
+        "last-child": lambda: siblings[-1] is node,
+    }
+    return all(checks[pseudo]() for pseudo in compound["pseudos"])
+
+
+def _css_matches(node: Node, steps: list) -> bool:
+    """Match the steps right to left, backtracking over ancestors for descendant combinators"""
+    combinator, compound = steps[-1]
+    if node.tag == "#document" or not _compound_matches(node, compound):
+        return False
+    if len(steps) == 1:
+        return True
+    if combinator == ">":
+        return node.parent is not None and _css_matches(node.parent, steps[:-1])
+    return any(_css_matches(ancestor, steps[:-1]) for ancestor in node.ancestors())
+
+
+# XPath: location paths of tag or * steps with a few common predicates, e.g.
+# //a[contains(., 'Checkboxes')], //div[@id='content']//h3, (//input)[2] is not supported
+_XPATH_STEP = re.compile(r"(?P<axis>//|/)(?P<name>\*|[a-zA-Z][\w-]*)(?P<predicates>(?:\[(?:[^\]'\"]|'[^']*'|\"[^\"]*\")*\])*)")
+_XPATH_PREDICATE = re.compile(r"\[((?:[^\]'\"]|'[^']*'|\"[^\"]*\")*)\]")
+_XPATH_LITERAL = r"(?:'(?P<sq>[^']*)'|\"(?P<dq>[^\"]*)\")"
+_XPATH_FUNCTION = re.compile(
+    rf"^(?P<function>contains|starts-with)\(\s*(?P<subject>\.|text\(\)|@[\w-]+|normalize-space\((?:\.)?\))\s*,\s*{_XPATH_LITERAL}\s*\)$"
+)
+_XPATH_EQUALS = re.compile(rf"^(?P<subject>\.|text\(\)|@[\w-]+|normalize-space\((?:\.)?\))\s*=\s*{_XPATH_LITERAL}$")
+
+
+def _parse_xpath(expression: str) -> list:
+    unsupported = InvalidSelectorException(f"The fake driver does not support xpath {expression!r}")
+    expression = expression.strip()
+    if expression.startswith("."):
+        expression = expression[1:]
+    steps, position = [], 0
+    while position < len(expression):
+        match = _XPATH_STEP.match(expression, position)
+        if match is None:
+            raise unsupported
+        predicates = []
+        for predicate in _XPATH_PREDICATE.findall(match.group("predicates")):
+            predicate = predicate.strip()
+            if predicate.isdigit():
+                predicates.append(("position", int(predicate)))
+            elif re.fullmatch(r"@[\w-]+", predicate):
+                predicates.append(("has", predicate[1:]))
+            elif _XPATH_FUNCTION.match(predicate):
+                found = _XPATH_FUNCTION.match(predicate)
+                predicates.append((found.group("function"), found.group("subject"), _literal(found)))
+            elif _XPATH_EQUALS.match(predicate):
+                found = _XPATH_EQUALS.match(predicate)
+                predicates.append(("equals", found.group("subject"), _literal(found)))
+            else:
+                raise unsupported
+        steps.append((match.group("axis"), match.group("name").lower(), predicates))
+        position = match.end()
+    if not steps:
+        raise unsupported
+    return steps
+
+
+def _literal(match) -> str:
+    return match.group("sq") if match.group("sq") is not None else match.group("dq")
+
+
+def _xpath_strings(node: Node, subject: str) -> list:
+    if subject == ".":
+        return [node.string_value()]
+    if subject == "text()":
+        return node.own_text()
+    if subject.startswith("normalize-space"):
+        return [" ".join(node.string_value().split())]
+    value = node.attrs.get(subject[1:])
+    return [] if value is None else [value]
+
+
+def _xpath_predicate(node: Node, predicate: tuple) -> bool:
+    kind = predicate[0]
+    if kind == "has":
+        return predicate[1] in node.attrs
+    strings = _xpath_strings(node, predicate[1])
+    if kind == "contains":
+        return any(predicate[2] in string for string in strings)
+    if kind == "starts-with":
+        return any(string.startswith(predicate[2]) for string in strings)
+    return any(string == predicate[2] for string in strings)
+
+
+def _xpath_select(scope: Node, steps: list) -> list:
+    context = [scope]
+    for axis, name, predicates in steps:
+        selected = []
+        for node in context:
+            candidates = list(node.elements()) if axis == "//" else [c for c in node.children if isinstance(c, Node)]
+            candidates = [candidate for candidate in candidates if name == "*" or candidate.tag == name]
+            for predicate in predicates:
+                if predicate[0] == "position":
+                    candidates = candidates[predicate[1] - 1:predicate[1]]
+                else:
+                    candidates = [candidate for candidate in candidates if _xpath_predicate(candidate, predicate)]
+            selected.extend(candidate for candidate in candidates if candidate not in selected)
+        context = selected
+    order = {id(node): index for index, node in enumerate(scope.elements())}
+    return sorted(context, key=lambda node: order.get(id(node), -1))
+
+
+def select(scope: Node, by: str, value: str) -> list:
+    """Every element under scope matching the locator, in document order"""
+    if by == By.ID:
+        return [node for node in scope.elements() if node.attrs.get("id") == value]
+    if by == By.NAME:
+        return [node for node in scope.elements() if node.attrs.get("name") == value]
+    if by == By.TAG_NAME:
+        return [node for node in scope.elements() if node.tag == value.lower()]
+    if by == By.CLASS_NAME:
+        return [node for node in scope.elements() if value in node.attrs.get("class", "").split()]
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        links = [node for node in scope.elements() if node.tag == "a" and "href" in node.attrs]
+        if by == By.LINK_TEXT:
+            return [node for node in links if node.rendered_text().strip() == value]
+        return [node for node in links if value in node.rendered_text()]
+    if by == By.CSS_SELECTOR:
+        groups = _parse_css(value)
+        return [node for node in scope.elements() if any(_css_matches(node, steps) for steps in groups)]
+    if by == By.XPATH:
+        return _xpath_select(scope, _parse_xpath(value))
+    raise InvalidSelectorException(f"Unsupported locator strategy {by}")
+
+
+class FakeWebElement(WebElement):
+    """Element handle of the fake driver; every call goes through FakeWebDriver.execute like a real one
+
+    Only the methods whose Selenium implementation runs JavaScript atoms or uploads
+    files are overridden, the rest are Selenium's own.
+    """
+
+    def is_displayed(self) -> bool:
+        return self._execute(IS_ELEMENT_DISPLAYED)["value"]
+
+    def get_attribute(self, name) -> str | None:
+        return self._execute(Command.GET_ELEMENT_ATTRIBUTE, {"name": name})["value"]
+
+    def send_keys(self, *value) -> None:
+        self._execute(Command.SEND_KEYS_TO_ELEMENT, {"text": "".join(str(part) for part in value)})
+
+
+class FakeSwitchTo:
+    def __init__(self, driver: "FakeWebDriver"):
+        self._driver = driver
+
+    def window(self, window_name: str):
+        self._driver.execute(Command.SWITCH_TO_WINDOW, {"handle": window_name})
+
+
+class _Window:
+    def __init__(self, handle: str):
+        self.handle = handle
+        self.history = []
+        self.position = -1
+        self.document = Document("about:blank", "")
+
+
+class FakeWebDriver:
+    """In-process stand-in for a WebDriver session that serves static pages from test_assets/pages
+
+    Pages are looked up as ``<host>/<path>.html`` and then ``the-internet/<path>.html``
+    (``index.html`` for the root). Links, checkboxes, radio buttons, text and file
+    inputs and form submission behave like a browser; a submitted form loads
+    ``<action>.post.html`` with ``{field}`` placeholders filled in, or ``500.html``
+    when a placeholder has no value. There is no JavaScript: ``execute_script``
+    runs Python stubs for the scripts page objects send and returns None for
+    anything else. Every command goes through ``execute()`` so instrumentation
+    and budgets see the same commands as with a real browser.
+    """
+
+    # Python stand-ins for the helpers page objects register with utilities.script_registry
+    helpers = {}
+
+    def __init__(self, profile: LaunchProfile = None, pages_dir: str = PAGES_DIR):
+        self.pages_dir = pages_dir
+        self.session_id = uuid.uuid4().hex
+        self.caps = {"browserName": "fake"}
+        self.pinned_scripts = {}
+        self.switch_to = FakeSwitchTo(self)
+        width, height = (profile.window_size if profile and profile.window_size else None) or _DEFAULT_WINDOW_SIZE
+        self._window_size = {"width": width, "height": height}
+        self._window_ids = itertools.count(1)
+        self._windows = {}
+        self._current = self._open_window()
+        self._elements = {}
+        self._scripts = {
+            QUERY_ELEMENTS_JS: self._query_elements,
+            LOCATOR_TIMING_JS: self._time_locator,
+            INVOKE_JS: self._invoke_helper,
+            INVOKE_ASYNC_JS: self._invoke_helper,
+        }
+        self._handlers = {
+            Command.GET: lambda params: self._navigate(params["url"]),
+            Command.GET_CURRENT_URL: lambda params: self._window().document.url,
+            Command.GET_TITLE: lambda params: self._window().document.title,
+            Command.GET_PAGE_SOURCE: lambda params: self._window().document.source,
+            Command.GO_BACK: lambda params: self._traverse(-1),
+            Command.GO_FORWARD: lambda params: self._traverse(1),
+            Command.REFRESH: lambda params: self._traverse(0),
+            Command.W3C_GET_WINDOW_HANDLES: lambda params: list(self._windows),
+            Command.W3C_GET_CURRENT_WINDOW_HANDLE: lambda params: self._window().handle,
+            Command.SWITCH_TO_WINDOW: self._switch_to_window,
+            Command.CLOSE: self._close_window,
+            Command.QUIT: self._quit,
+            Command.FIND_ELEMENT: lambda params: self._find(self._window().document.root, params, single=True),
+            Command.FIND_ELEMENTS: lambda params: self._find(self._window().document.root, params, single=False),
+            Command.FIND_CHILD_ELEMENT: lambda params: self._find(self._node(params["id"]), params, single=True),
+            Command.FIND_CHILD_ELEMENTS: lambda params: self._find(self._node(params["id"]), params, single=False),
+            Command.CLICK_ELEMENT: lambda params: self._click(self._node(params["id"])),
+            Command.SEND_KEYS_TO_ELEMENT: lambda params: self._send_keys(self._node(params["id"]), params["text"]),
+            Command.CLEAR_ELEMENT: lambda params: setattr(self._node(params["id"]), "value", ""),
+            Command.GET_ELEMENT_TEXT: lambda params: self._node(params["id"]).rendered_text(),
+            Command.GET_ELEMENT_TAG_NAME: lambda params: self._node(params["id"]).tag,
+            Command.IS_ELEMENT_SELECTED: lambda params: self._node(params["id"]).checked,
+            Command.IS_ELEMENT_ENABLED: lambda params: "disabled" not in self._node(params["id"]).attrs,
+            IS_ELEMENT_DISPLAYED: lambda params: self._node(params["id"]).is_displayed(),
+            Command.GET_ELEMENT_ATTRIBUTE: lambda params: self._attribute(self._node(params["id"]), params["name"]),
+            Command.W3C_EXECUTE_SCRIPT: self._execute_script,
+            Command.W3C_EXECUTE_SCRIPT_ASYNC: self._execute_script,
+            Command.GET_ALL_COOKIES: lambda params: [],
+            Command.DELETE_ALL_COOKIES: lambda params: None,
+            Command.SET_TIMEOUTS: lambda params: None,
+            Command.GET_WINDOW_RECT: lambda params: dict(self._window_size, x=0, y=0),
+            Command.SET_WINDOW_RECT: self._set_window_rect,
+        }
+
+    # Public WebDriver surface
+
+    def execute(self, driver_command: str, params: dict = None) -> dict:
+        handler = self._handlers.get(driver_command)
+        if handler is None:
+            raise UnknownMethodException(f"The fake driver does not implement {driver_command}")
+        if self._current is None and driver_command not in _WINDOWLESS_COMMANDS:
+            raise NoSuchWindowException("No window is open")
+        return {"value": handler(params or {})}
+
+    @property
+    def name(self) -> str:
+        return "fake"
+
+    @property
+    def capabilities(self) -> dict:
+        return self.caps
+
+    @property
+    def current_url(self) -> str:
+        return self.execute(Command.GET_CURRENT_URL)["value"]
+
+    @property
+    def title(self) -> str:
+        return self.execute(Command.GET_TITLE)["value"]
+
+    @property
+    def page_source(self) -> str:
+        return self.execute(Command.GET_PAGE_SOURCE)["value"]
+
+    @property
+    def window_handles(self) -> list:
+        return self.execute(Command.W3C_GET_WINDOW_HANDLES)["value"]
+
+    @property
+    def current_window_handle(self) -> str:
+        return self.execute(Command.W3C_GET_CURRENT_WINDOW_HANDLE)["value"]
+
+    def get(self, url: str):
+        self.execute(Command.GET, {"url": url})
+
+    def back(self):
+        self.execute(Command.GO_BACK)
+
+    def forward(self):
+        self.execute(Command.GO_FORWARD)
+
+    def refresh(self):
+        self.execute(Command.REFRESH)
+
+    def close(self):
+        self.execute(Command.CLOSE)
+
+    def quit(self):
+        self.execute(Command.QUIT)
+
+    def find_element(self, by=By.ID, value: str = None) -> FakeWebElement:
+        return self.execute(Command.FIND_ELEMENT, {"using": by, "value": value})["value"]
+
+    def find_elements(self, by=By.ID, value: str = None) -> list:
+        return self.execute(Command.FIND_ELEMENTS, {"using": by, "value": value})["value"]
+
+    def execute_script(self, script, *args):
+        return self.execute(Command.W3C_EXECUTE_SCRIPT, {"script": self._pinned(script), "args": list(args)})["value"]
+
+    def execute_async_script(self, script, *args):
+        return self.execute(Command.W3C_EXECUTE_SCRIPT_ASYNC, {"script": self._pinned(script), "args": list(args)})["value"]
+
+    def pin_script(self, script: str, script_key=None) -> ScriptKey:
+        script_key_instance = ScriptKey(script_key)
+        self.pinned_scripts[script_key_instance.id] = script
+        return script_key_instance
+
+    def unpin(self, script_key: ScriptKey):
+        try:
+            self.pinned_scripts.pop(script_key.id)
+        except KeyError:
+            raise KeyError(f"No script with key: {script_key} existed in {self.pinned_scripts}") from None
+
+    def get_cookies(self) -> list:
+        return self.execute(Command.GET_ALL_COOKIES)["value"]
+
+    def delete_all_cookies(self):
+        self.execute(Command.DELETE_ALL_COOKIES)
+
+    def implicitly_wait(self, time_to_wait: float):
+        self.execute(Command.SET_TIMEOUTS, {"implicit": int(float(time_to_wait) * 1000)})
+
+    def get_window_size(self) -> dict:
+        rect = self.execute(Command.GET_WINDOW_RECT)["value"]
+        return {"width": rect["width"], "height": rect["height"]}
+
+    def set_window_size(self, width: int, height: int):
+        self.execute(Command.SET_WINDOW_RECT, {"width": int(width), "height": int(height)})
+
+    # Windows and navigation
+
+    def _window(self) -> _Window:
+        return self._windows[self._current]
+
+    def _open_window(self) -> str:
+        handle = f"fake-window-{next(self._window_ids)}"
+        self._windows[handle] = _Window(handle)
+        return handle
+
+    def _switch_to_window(self, params: dict):
+        if params["handle"] not in self._windows:
+            raise NoSuchWindowException(f"No window with handle {params['handle']}")
+        self._current = params["handle"]
+
+    def _close_window(self, params: dict):
+        self._window().document.alive = False
+        del self._windows[self._current]
+        # Like a browser, the session is left without a current window until the test switches
+        self._current = None
+
+    def _quit(self, params: dict):
+        for window in self._windows.values():
+            window.document.alive = False
+        self._windows.clear()
+        self._current = None
+
+    def _navigate(self, url: str, window: _Window = None, form: dict = None):
+        window = window or self._window()
+        del window.history[window.position + 1:]
+        window.history.append(url)
+        window.position += 1
+        self._load(window, url, form)
+
+    def _traverse(self, offset: int):
+        window = self._window()
+        position = min(max(window.position + offset, 0), len(window.history) - 1)
+        if position < 0:
+            return
+        window.position = position
+        self._load(window, window.history[position])
+
+    def _load(self, window: _Window, url: str, form: dict = None):
+        window.document.alive = False
+        window.document = Document(url, self._page_source(url, form))
+
+    def _page_source(self, url: str, form: dict = None) -> str:
+        if url == "about:blank":
+            return ""
+        path = urlsplit(url).path.strip("/") or "index"
+        if form is not None:
+            template = self._fixture(url, f"{path}.post.html")
+            fields = {name: escape(os.path.basename(value)) for name, value in form.items()}
+            # A field the response needs but the form left empty is a server error, as on the real site
+            if template is None or any(not fields.get(name) for name in re.findall(r"\{(\w+)\}", template)):
+                return self._fixture(url, "500.html") or ""
+            return re.sub(r"\{(\w+)\}", lambda match: fields[match.group(1)], template)
+        source = self._fixture(url, f"{path}.html")
+        return source if source is not None else (self._fixture(url, "404.html") or "")
+
+    def _fixture(self, url: str, filename: str) -> str | None:
+        for directory in (urlsplit(url).hostname or "", SITE_DIR):
+            path = os.path.join(self.pages_dir, directory, filename)
+            if directory and os.path.isfile(path):
+                return _read_fixture(path)
+        return None
+
+    def _set_window_rect(self, params: dict):
+        self._window_size = {"width": params["width"], "height": params["height"]}
+
+    # Elements
+
+    def _wrap(self, node: Node) -> FakeWebElement:
+        if node.element_id is None:
+            node.element_id = uuid.uuid4().hex
+            self._elements[node.element_id] = (self._window().document, node)
+        return FakeWebElement(self, node.element_id)
+
+    def _node(self, element_id: str) -> Node:
+        document, node = self._elements[element_id]
+        if not document.alive:
+            raise StaleElementReferenceException(f"The element {element_id} belongs to a page that was navigated away from")
+        return node
+
+    def _find(self, scope: Node, params: dict, single: bool):
+        nodes = select(scope, params["using"], params["value"])
+        if single:
+            if not nodes:
+                raise NoSuchElementException(f"Unable to locate element: {params['using']}={params['value']}")
+            return self._wrap(nodes[0])
+        return [self._wrap(node) for node in nodes]
+
+    def _click(self, node: Node):
+        if not node.is_displayed():
+            raise ElementNotInteractableException(f"<{node.tag}> is not visible and cannot be clicked")
+        link = next((n for n in itertools.chain([node], node.ancestors()) if n.tag == "a" and "href" in n.attrs), None)
+        input_type = node.attrs.get("type", "text" if node.tag == "input" else "submit").lower()
+        if link is not None:
+            url = urljoin(self._window().document.url, link.attrs["href"])
+            if link.attrs.get("target") == "_blank":
+                self._navigate(url, self._windows[self._open_window()])
+            else:
+                self._navigate(url)
+        elif node.tag == "input" and input_type == "checkbox":
+            node.checked = not node.checked
+        elif node.tag == "input" and input_type == "radio":
+            form = next((n for n in node.ancestors() if n.tag == "form"), self._window().document.root)
+            for other in form.elements():
+                if other.tag == "input" and other.attrs.get("name") == node.attrs.get("name"):
+                    other.checked = False
+            node.checked = True
+        elif node.tag in ("input", "button") and input_type == "submit":
+            form = next((n for n in node.ancestors() if n.tag == "form"), None)
+            if form is not None:
+                self._submit(form)
+
+    def _submit(self, form: Node):
+        url = urljoin(self._window().document.url, form.attrs.get("action", ""))
+        fields = {
+            node.attrs["name"]: node.value for node in form.elements()
+            if "name" in node.attrs and node.tag in ("input", "textarea", "select")
+            and (node.attrs.get("type") not in ("checkbox", "radio") or node.checked)
+        }
+        if form.attrs.get("method", "get").lower() == "post":
+            self._navigate(url, form=fields)
+        else:
+            self._navigate(url)
+
+    def _send_keys(self, node: Node, text: str):
+        if not node.is_displayed() or "disabled" in node.attrs:
+            raise ElementNotInteractableException(f"<{node.tag}> is not reachable by keyboard")
+        if node.tag == "input" and node.attrs.get("type") == "file":
+            if not os.path.isfile(text):
+                raise InvalidArgumentException(f"File not found: {text}")
+            node.value = text
+        else:
+            node.value += text
+
+    @staticmethod
+    def _attribute(node: Node, name: str):
+        if name == "value":
+            return node.value
+        if name in ("checked", "selected"):
+            return "true" if node.checked else None
+        return node.attrs.get(name)
+
+    # Scripts
+
+    def _pinned(self, script):
+        if isinstance(script, ScriptKey):
+            try:
+                return self.pinned_scripts[script.id]
+            except KeyError:
+                raise JavascriptException("Pinned script could not be found")
+        return script
+
+    def _execute_script(self, params: dict):
+        script, args = params["script"], [self._unwrap(arg) for arg in params["args"]]
+        if script.lstrip().startswith(f"window.{HELPERS_GLOBAL} ="):
+            self._window().document.helpers_installed = True
+            return None
+        # Selenium's remote WebElement sends JavaScript atoms for these, e.g. over the fake W3C server
+        if script.startswith("/* isDisplayed */"):
+            return args[0].is_displayed()
+        if script.startswith("/* getAttribute */"):
+            return self._attribute(*args)
+        stub = self._scripts.get(script)
+        return stub(*args) if stub is not None else None
+
+    def _unwrap(self, value):
+        if isinstance(value, WebElement):
+            return self._node(value.id)
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+
+    def _query_elements(self, queries: list) -> dict:
+        root = self._window().document.root
+        return {
+            name: [{field: self._read(node, field) for field in fields} for node in select(root, by, value)]
+            for name, by, value, fields in queries
+        }
+
+    def _time_locator(self, by: str, value: str, samples: int, iterations: int) -> dict:
+        root = self._window().document.root
+        timings = []
+        for _ in range(samples):
+            started = perf_counter()
+            for _ in range(iterations):
+                select(root, by, value)
+            timings.append((perf_counter() - started) * 1000 / iterations)
+        return {"matches": len(select(root, by, value)), "ms": timings}
+
+    @staticmethod
+    def _read(node: Node, field: str):
+        if field == "text":
+            return node.rendered_text()
+        if field == "selected":
+            return node.checked
+        if field == "displayed":
+            return node.is_displayed()
+        if field == "value":
+            return node.value if node.tag in ("input", "textarea", "select", "option", "button") else None
+        if field.startswith("@"):
+            return node.attrs.get(field[1:])
+        raise JavascriptException(f"Unsupported field {field}")
+
+    def _invoke_helper(self, name: str, args: list):
+        if not self._window().document.helpers_installed:
+            return {"__missing__": True}
+        if name not in self.helpers:
+            raise JavascriptException(f"The fake driver has no stand-in for the {name} helper")
+        return self.helpers[name](self, *args)
+
+
+_fixture_cache = {}
+
+
+def _read_fixture(path: str) -> str:
+    if path not in _fixture_cache:
+        with open(path, encoding="utf-8") as fixture:
+            _fixture_cache[path] = fixture.read()
+    return _fixture_cache[path]
+
+
+def _drag_and_drop(driver: FakeWebDriver, source: Node, destination: Node, timeout_ms: int) -> bool:
+    """What the-internet's drop handler does: the two columns swap their content"""
+    source.children, destination.children = destination.children, source.children
+    for node in (source, destination):
+        for child in node.children:
+            if isinstance(child, Node):
+                child.parent = node
+    return True
+
+
+FakeWebDriver.helpers["dragAndDrop"] = _drag_and_drop
@@ -0,0 +1,185 @@
+import argparse
+import json
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from selenium.common import (
+    ElementNotInteractableException,
+    InvalidArgumentException,
+    InvalidSelectorException,
+    InvalidSessionIdException,
+    JavascriptException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    UnknownMethodException,
+)
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import remote_commands
+from selenium.webdriver.remote.webelement import WebElement
+
+from utilities.async_webdriver import W3C_ELEMENT
+from utilities.fake_driver import IS_ELEMENT_DISPLAYED, PAGES_DIR, FakeWebDriver, FakeWebElement
+
+# HTTP status and W3C error code of the exceptions the fake driver raises
+_W3C_ERRORS = {
+    NoSuchElementException: (404, "no such element"),
+    NoSuchWindowException: (404, "no such window"),
+    StaleElementReferenceException: (404, "stale element reference"),
+    ElementNotInteractableException: (400, "element not interactable"),
+    InvalidArgumentException: (400, "invalid argument"),
+    InvalidSelectorException: (400, "invalid selector"),
+    InvalidSessionIdException: (404, "invalid session id"),
+    JavascriptException: (500, "javascript error"),
+    UnknownMethodException: (405, "unknown method"),
+}
+
+
+def _routes() -> list:
+    """(method, path pattern, command) for every session command, from Selenium's own endpoint table"""
+    endpoints = {
+        command: endpoint for command, endpoint in remote_commands.items()
+        if command not in (Command.NEW_SESSION, Command.QUIT)
+    }
+    # The fake driver answers is_displayed() itself, real drivers have the same endpoint
+    endpoints[IS_ELEMENT_DISPLAYED] = ("GET", "/session/$sessionId/element/$id/displayed")
+    routes = []
+    for command, (method, path) in endpoints.items():
+        pattern = re.sub(r"\\\$(\w+)", r"(?P<\1>[^/]+)", re.escape(path))
+        routes.append((method, re.compile(f"^{pattern}$"), command))
+    return routes
+
+
+class FakeW3CServer:
+    """Serves FakeWebDriver sessions over the W3C WebDriver HTTP protocol, like a local driver binary
+
+    Anything that talks to chromedriver or geckodriver (selenium's Remote WebDriver,
+    the asyncio client in utilities.async_webdriver) can run against the fixture
+    pages without a browser. Each session handles one command at a time.
+    """
+
+    _routes = _routes()
+
+    def __init__(self, port: int = 0, pages_dir: str = PAGES_DIR):
+        self.pages_dir = pages_dir
+        self.sessions = {}
+        self._locks = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeW3CServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so clients can reuse one connection per session
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self)
+
+            def do_POST(self):
+                server._handle(self)
+
+            def do_DELETE(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        length = int(request.headers.get("Content-Length", 0))
+        body = json.loads(request.rfile.read(length) or b"{}") if length else {}
+        try:
+            status, value = 200, self._dispatch(request.command, request.path.split("?")[0], body)
+        except Exception as error:
+            status, code = next(
+                (_W3C_ERRORS[cls] for cls in type(error).__mro__ if cls in _W3C_ERRORS), (500, "unknown error")
+            )
+            value = {"error": code, "message": getattr(error, "msg", None) or str(error), "stacktrace": ""}
+        content = json.dumps({"value": value}).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json; charset=utf-8")
+        request.send_header("Content-Length", str(len(content)))
+        request.end_headers()
+        request.wfile.write(content)
+
+    def _dispatch(self, method: str, path: str, body: dict):
+        if path == "/status":
+            return {"ready": True, "message": "fake driver ready"}
+        if method == "POST" and path == "/session":
+            driver = FakeWebDriver(pages_dir=self.pages_dir)
+            driver.session_id = uuid.uuid4().hex
+            self.sessions[driver.session_id] = driver
+            self._locks[driver.session_id] = threading.Lock()
+            return {"sessionId": driver.session_id, "capabilities": driver.capabilities}
+        quit_session = re.fullmatch(r"/session/([^/]+)", path)
+        if method == "DELETE" and quit_session:
+            driver = self._session(quit_session.group(1))
+            with self._locks[driver.session_id]:
+                driver.quit()
+            del self.sessions[driver.session_id], self._locks[driver.session_id]
+            return None
+        for route_method, pattern, command in self._routes:
+            match = pattern.match(path) if route_method == method else None
+            if match:
+                driver = self._session(match.group("sessionId"))
+                params = dict(self._unwrap(driver, body), **match.groupdict())
+                with self._locks[driver.session_id]:
+                    return self._wrap(driver.execute(command, params)["value"])
+        raise UnknownMethodException(f"No command matches {method} {path}")
+
+    def _session(self, session_id: str) -> FakeWebDriver:
+        if session_id not in self.sessions:
+            raise InvalidSessionIdException(f"No session {session_id}")
+        return self.sessions[session_id]
+
+    def _wrap(self, value):
+        if isinstance(value, WebElement):
+            return {W3C_ELEMENT: value.id}
+        if isinstance(value, list):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+
+    def _unwrap(self, driver: FakeWebDriver, value):
+        if isinstance(value, dict):
+            if W3C_ELEMENT in value:
+                return FakeWebElement(driver, value[W3C_ELEMENT])
+            return {key: self._unwrap(driver, item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(driver, item) for item in value]
+        return value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve fake driver sessions over the W3C WebDriver protocol")
+    parser.add_argument("--port", type=int, default=4444)
+    parser.add_argument("--pages-dir", default=PAGES_DIR)
+    arguments = parser.parse_args()
+
+    server = FakeW3CServer(arguments.port, arguments.pages_dir)
+    print(f"Fake WebDriver server at {server.url}", flush=True)
+    server.serve_forever()
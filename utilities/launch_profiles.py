@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+import statistics
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_FILE = os.path.join(PROJECT_ROOT, "config", "config.json")
+
+
+class LaunchProfile:
+    """Named set of browser launch settings from config/config.json
+
+    Supported settings: headless, page_load_strategy (normal/eager/none),
+    block_images, block_fonts, window_size [width, height] and disable_gpu.
+    """
+
+    def __init__(self, name: str, headless: bool = False, page_load_strategy: str = "normal",
+                 block_images: bool = False, block_fonts: bool = False, window_size=None,
+                 disable_gpu: bool = False):
+        self.name = name
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.block_images = block_images
+        self.block_fonts = block_fonts
+        self.window_size = window_size
+        self.disable_gpu = disable_gpu
+
+    def apply(self, browser: str, options):
+        """Configure FirefoxOptions/ChromeOptions/EdgeOptions for this profile"""
+        options.page_load_strategy = self.page_load_strategy
+        if browser == "firefox":
+            self._apply_firefox(options)
+        else:
+            self._apply_chromium(options)
+        return options
+
+    def _apply_firefox(self, options):
+        if self.headless:
+            options.add_argument("-headless")
+        if self.window_size:
+            options.add_argument(f"--width={self.window_size[0]}")
+            options.add_argument(f"--height={self.window_size[1]}")
+        if self.block_images:
+            options.set_preference("permissions.default.image", 2)
+        if self.block_fonts:
+            options.set_preference("gfx.downloadable_fonts.enabled", False)
+        if self.disable_gpu:
+            options.set_preference("layers.acceleration.disabled", True)
+            options.set_preference("gfx.webrender.software", True)
+
+    def _apply_chromium(self, options):
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.window_size:
+            options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        if self.block_images:
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if self.block_fonts:
+            options.add_argument("--disable-remote-fonts")
+        if self.disable_gpu:
+            options.add_argument("--disable-gpu")
+
+
+def load_config(path: str = CONFIG_FILE) -> dict:
+    with open(path) as config_file:
+        return json.load(config_file)
+
+
+def default_profile_name(config: dict) -> str:
+    """The CI profile when running under CI (the CI environment variable is set), the local one otherwise"""
+    if os.environ.get("CI") and config.get("ci_launch_profile"):
+        return config["ci_launch_profile"]
+    return config.get("launch_profile", "default")
+
+
+def get_profile(name: str, config: dict = None) -> LaunchProfile:
+    profiles = (config or load_config()).get("launch_profiles", {})
+    if name not in profiles:
+        raise ValueError(f"Unknown launch profile {name}, available: {', '.join(sorted(profiles))}")
+    return LaunchProfile(name, **profiles[name])
+
+
+class LaunchStats:
+    """Browser startup times per launch profile for the terminal summary"""
+
+    def __init__(self):
+        self.startups = {}
+
+    def record_startup(self, profile: str, seconds: float):
+        self.startups.setdefault(profile, []).append(seconds)
+
+    def summary_lines(self):
+        for profile, samples in sorted(self.startups.items()):
+            yield (f"{profile}: {len(samples)} session(s), "
+                   f"startup mean {statistics.mean(samples):.2f}s max {max(samples):.2f}s")
+
+
+def compare_profiles(browser: str, profile_names, url: str, samples: int = 3, offline: bool = False):
+    """Launch each profile a few times and time the startup and a navigation to ``url``"""
+    from utilities.driver_factory import create_driver
+    from utilities.driver_resolver import resolve_drivers
+
+    driver_path = resolve_drivers([browser], offline=offline)[browser].path
+    config = load_config()
+    results = {}
+    for name in profile_names:
+        profile = get_profile(name, config)
+        startups, navigations = [], []
+        for _ in range(samples):
+            started = time.perf_counter()
+            driver = create_driver(browser, driver_path, profile)
+            startups.append(time.perf_counter() - started)
+            try:
+                started = time.perf_counter()
+                driver.get(url)
+                navigations.append(time.perf_counter() - started)
+            finally:
+                driver.quit()
+        results[name] = {
+            "startup_mean": statistics.mean(startups),
+            "navigation_mean": statistics.mean(navigations),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the startup and navigation cost of launch profiles")
+    parser.add_argument("--browser", default="firefox")
+    parser.add_argument("--profiles", default=",".join(load_config().get("launch_profiles", {})))
+    parser.add_argument("--url", default="https://the-internet.herokuapp.com/")
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--offline", action="store_true")
+    arguments = parser.parse_args()
+
+    results = compare_profiles(
+        arguments.browser, arguments.profiles.split(","), arguments.url, arguments.samples, arguments.offline
+    )
+    print(f"{'profile':<12}{'startup (s)':>14}{'navigation (s)':>16}")
+    for name, result in sorted(results.items(), key=lambda item: item[1]["startup_mean"]):
+        print(f"{name:<12}{result['startup_mean']:>14.2f}{result['navigation_mean']:>16.2f}")
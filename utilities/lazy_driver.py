@@ -0,0 +1,44 @@
+from time import perf_counter
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+class LazyDriver:
+    """Stand-in for a WebDriver that only gets the real session on its first use
+
+    ``start()`` is called when a test first touches the driver, so tests that skip or
+    fail before sending a command never launch or check out a browser. Everything
+    else is delegated to the real driver, which ``wrapped_driver`` returns.
+    """
+
+    def __init__(self, start):
+        object.__setattr__(self, "_start", start)
+        object.__setattr__(self, "_driver", None)
+        object.__setattr__(self, "start_seconds", None)
+
+    @property
+    def started(self) -> bool:
+        return self._driver is not None
+
+    @property
+    def wrapped_driver(self) -> WebDriver:
+        if self._driver is None:
+            started = perf_counter()
+            driver = self._start()
+            object.__setattr__(self, "start_seconds", perf_counter() - started)
+            object.__setattr__(self, "_driver", driver)
+        return self._driver
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped_driver, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.wrapped_driver, name, value)
+
+    def __repr__(self) -> str:
+        return f"<LazyDriver {self._driver!r}>" if self.started else "<LazyDriver (not started)>"
+
+
+def unwrap(driver) -> WebDriver:
+    """The real driver behind a LazyDriver, starting it if needed, or ``driver`` itself"""
+    return driver.wrapped_driver if isinstance(driver, LazyDriver) else driver
@@ -0,0 +1,275 @@
+import argparse
+import importlib
+import json
+import os
+import re
+import statistics
+import sys
+from time import perf_counter
+from urllib.parse import urljoin
+
+from selenium.common import WebDriverException
+from selenium.webdriver.common.by import By
+
+from page_objects.base_page import FIND_ALL_JS, BasePage
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE_OBJECTS_DIR = os.path.join(PROJECT_ROOT, "page_objects")
+DEFAULT_REPORT = os.path.join(PROJECT_ROOT, "reports", "locator_profile.json")
+
+_STRATEGIES = {value for name, value in vars(By).items() if name.isupper()}
+# No native DOM query behind these: XPath is evaluated over the document, link text reads every link's rendered text
+_SLOW_STRATEGIES = {By.XPATH, By.LINK_TEXT, By.PARTIAL_LINK_TEXT}
+_CSS_IDENTIFIER = re.compile(r"-?[A-Za-z_][\w-]*")
+
+# Times ``arguments[3]`` lookups per sample inside the page, a single one is below performance.now()'s resolution
+LOCATOR_TIMING_JS = FIND_ALL_JS + """
+var samples = [];
+for (var sample = 0; sample < arguments[2]; sample++) {
+    var started = performance.now();
+    for (var i = 0; i < arguments[3]; i++) { findAll(arguments[0], arguments[1]); }
+    samples.push((performance.now() - started) / arguments[3]);
+}
+return {"matches": findAll(arguments[0], arguments[1]).length, "ms": samples};
+"""
+
+
+class DeclaredLocator:
+    """A (By, value) tuple declared as a class attribute of a page object"""
+
+    def __init__(self, owner: str, name: str, path: str | None, locator: tuple):
+        self.owner = owner
+        self.name = name
+        self.path = path
+        self.locator = locator
+
+    @property
+    def label(self) -> str:
+        return f"{self.owner}.{self.name}"
+
+
+class LocatorProfile:
+    """Lookup times and matches of one locator on one page, with a cheaper equivalent if there is one"""
+
+    def __init__(self, path: str, locator: tuple, declared: list):
+        self.path = path
+        self.locator = locator
+        self.declared = declared
+        self.matches = 0
+        self.round_trip_ms = []
+        self.in_page_ms = None
+        self.error = None
+        self.suggestion = None
+
+    @property
+    def latency_ms(self) -> float:
+        """Median time of one find_elements round trip, what a test waits for the lookup"""
+        return statistics.median(self.round_trip_ms) if self.round_trip_ms else 0.0
+
+    @property
+    def cost_ms(self) -> float:
+        """Median time of the DOM query itself when the browser could time it, the round trip otherwise"""
+        return statistics.median(self.in_page_ms) if self.in_page_ms else self.latency_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "locator": list(self.locator),
+            "declared": self.declared,
+            "matches": self.matches,
+            "latency_ms": round(self.latency_ms, 3),
+            "max_ms": round(max(self.round_trip_ms), 3) if self.round_trip_ms else None,
+            "in_page_ms": round(statistics.median(self.in_page_ms), 4) if self.in_page_ms else None,
+            "error": self.error,
+            "suggestion": self.suggestion,
+        }
+
+
+def _page_modules(directory: str) -> list:
+    modules = []
+    for root, directories, files in os.walk(directory):
+        directories[:] = sorted(name for name in directories if name != "__pycache__")
+        package = os.path.relpath(root, PROJECT_ROOT).replace(os.sep, ".")
+        modules.extend(f"{package}.{file[:-3]}" for file in sorted(files)
+                       if file.endswith(".py") and file != "__init__.py")
+    return modules
+
+
+def _is_locator(value) -> bool:
+    return isinstance(value, tuple) and len(value) == 2 and value[0] in _STRATEGIES and isinstance(value[1], str)
+
+
+def _unmangle(cls: type, attribute: str) -> str:
+    prefix = f"_{cls.__name__.lstrip('_')}"
+    return attribute[len(prefix):] if attribute.startswith(prefix + "__") else attribute
+
+
+def discover_locators(directory: str = PAGE_OBJECTS_DIR) -> list:
+    """Every (By, value) class attribute of the classes defined in page_objects/, page_objects/aio included"""
+    declared = []
+    for module_name in _page_modules(directory):
+        module = importlib.import_module(module_name)
+        owner_prefix = module_name.split(".", 1)[1]
+        for cls in vars(module).values():
+            if not isinstance(cls, type) or cls.__module__ != module_name:
+                continue
+            for attribute, value in vars(cls).items():
+                if _is_locator(value):
+                    declared.append(DeclaredLocator(
+                        f"{owner_prefix}.{cls.__qualname__}", _unmangle(cls, attribute), getattr(cls, "path", None), value
+                    ))
+    return declared
+
+
+def time_lookup(driver, locator: tuple, samples: int, iterations: int) -> tuple:
+    """(elements, round trip times, in-page times or None) of ``samples`` lookups of the locator, in ms"""
+    round_trips = []
+    for _ in range(samples):
+        started = perf_counter()
+        elements = driver.find_elements(*locator)
+        round_trips.append((perf_counter() - started) * 1000)
+    try:
+        in_page = driver.execute_script(LOCATOR_TIMING_JS, locator[0], locator[1], samples, iterations)
+    except WebDriverException:
+        in_page = None
+    return elements, round_trips, in_page["ms"] if in_page else None
+
+
+def _css_string(value: str) -> str | None:
+    return f"'{value}'" if "'" not in value and "\\" not in value else None
+
+
+def _candidates(element):
+    """ID and CSS locators for an element, most specific first"""
+    tag = element.tag_name.lower()
+    element_id = element.get_dom_attribute("id")
+    if element_id:
+        yield By.ID, element_id
+    for attribute in ("name", "href", "data-testid", "data-test", "type"):
+        value = element.get_dom_attribute(attribute)
+        if value and _css_string(value):
+            yield By.CSS_SELECTOR, f"{tag}[{attribute}={_css_string(value)}]"
+    classes = [name for name in (element.get_dom_attribute("class") or "").split() if _CSS_IDENTIFIER.fullmatch(name)]
+    if classes:
+        yield By.CSS_SELECTOR, tag + "".join(f".{name}" for name in classes)
+
+
+def suggest(driver, locator: tuple, elements: list) -> tuple | None:
+    """An ID or CSS locator matching exactly the same elements that is cheaper to look up, or None
+
+    Tag name and CSS locators are already native DOM queries, so only an ID improves on them.
+    """
+    if locator[0] == By.ID or not elements:
+        return None
+    for candidate in _candidates(elements[0]):
+        if candidate[0] == By.CSS_SELECTOR and locator[0] not in _SLOW_STRATEGIES:
+            continue
+        try:
+            found = driver.find_elements(*candidate)
+        except WebDriverException:
+            continue
+        if [element.id for element in found] == [element.id for element in elements]:
+            return candidate
+    return None
+
+
+def profile_locators(driver, declared: list, samples: int = 10, iterations: int = 20, base_url: str = None) -> list:
+    """Time every distinct locator on its page's path and return the profiles, slowest first
+
+    Locators of a page object without a path are looked up on the landing page.
+    """
+    by_page = {}
+    for item in declared:
+        by_page.setdefault((item.path or "", item.locator), []).append(item.label)
+    profiles = []
+    for path in sorted({path for path, _ in by_page}):
+        driver.get(urljoin(base_url or BasePage.base_url, path))
+        for (page, locator), labels in sorted(by_page.items()):
+            if page != path:
+                continue
+            profile = LocatorProfile(path, locator, labels)
+            try:
+                elements, profile.round_trip_ms, profile.in_page_ms = time_lookup(driver, locator, samples, iterations)
+            except WebDriverException as error:
+                profile.error = error.msg or type(error).__name__
+                profiles.append(profile)
+                continue
+            profile.matches = len(elements)
+            candidate = suggest(driver, locator, elements)
+            if candidate is not None:
+                _, round_trips, in_page = time_lookup(driver, candidate, samples, iterations)
+                profile.suggestion = {
+                    "locator": list(candidate),
+                    "latency_ms": round(statistics.median(round_trips), 3),
+                    "in_page_ms": round(statistics.median(in_page), 4) if in_page else None,
+                }
+            profiles.append(profile)
+    return sorted(profiles, key=lambda profile: (profile.error is None, -profile.cost_ms))
+
+
+def over_threshold(profiles: list, max_ms: float) -> list:
+    return [profile for profile in profiles if profile.latency_ms > max_ms]
+
+
+def report_lines(profiles: list) -> list:
+    lines = [f"{'rank':>4}  {'in page':>9}  {'latency':>9}  {'max':>9}  {'matches':>7}  locator"]
+    for rank, profile in enumerate(profiles, 1):
+        data = profile.to_dict()
+        in_page = f"{data['in_page_ms']:.4f}ms" if data["in_page_ms"] is not None else "-"
+        locator = f"{profile.locator[0]} {profile.locator[1]!r} on /{profile.path}"
+        if profile.error:
+            lines.append(f"{rank:>4}  {'-':>9}  {'-':>9}  {'-':>9}  {'-':>7}  {locator}: {profile.error}")
+        else:
+            lines.append(f"{rank:>4}  {in_page:>9}  {data['latency_ms']:>7.3f}ms  {data['max_ms']:>7.3f}ms  "
+                         f"{profile.matches:>7}  {locator}")
+        if profile.suggestion:
+            by, value = profile.suggestion["locator"]
+            in_page = profile.suggestion["in_page_ms"]
+            lines.append(f"{'':>45}try ({by}, {value!r})" + (f", {in_page:.4f}ms in page" if in_page is not None else ""))
+        lines.append(f"{'':>45}declared as {', '.join(profile.declared)}")
+    return lines
+
+
+def save_report(profiles: list, path: str = DEFAULT_REPORT, **run):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as report:
+        json.dump({**run, "locators": [profile.to_dict() for profile in profiles]}, report, indent=2)
+        report.write("\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time every locator declared in page_objects/ in a live browser and suggest cheaper ones"
+    )
+    parser.add_argument("--browser", default="fake")
+    parser.add_argument("--samples", type=int, default=10, help="Lookups timed per locator")
+    parser.add_argument("--iterations", type=int, default=20, help="In-page lookups per sample")
+    parser.add_argument("--base-url", default=BasePage.base_url)
+    parser.add_argument("--launch-profile")
+    parser.add_argument("--offline", action="store_true")
+    parser.add_argument("--json", default=DEFAULT_REPORT, help="Where to write the ranked report")
+    parser.add_argument("--max-ms", type=float, help="Exit with 1 when a lookup's median latency exceeds this")
+    arguments = parser.parse_args()
+
+    from utilities.driver_factory import create_driver
+    from utilities.driver_resolver import resolve_drivers
+    from utilities.launch_profiles import get_profile, load_config
+
+    profile = get_profile(arguments.launch_profile, load_config()) if arguments.launch_profile else None
+    resolved = resolve_drivers([arguments.browser], offline=arguments.offline).get(arguments.browser)
+    driver = create_driver(arguments.browser, resolved.path if resolved else None, profile)
+    try:
+        results = profile_locators(driver, discover_locators(), arguments.samples, arguments.iterations,
+                                   arguments.base_url)
+    finally:
+        driver.quit()
+    save_report(results, arguments.json, browser=arguments.browser, samples=arguments.samples,
+                iterations=arguments.iterations)
+    print("\n".join(report_lines(results)))
+    print(f"Ranked report written to {arguments.json}")
+    if arguments.max_ms is not None:
+        slow = over_threshold(results, arguments.max_ms)
+        for result in slow:
+            print(f"{result.locator[0]} {result.locator[1]!r} on /{result.path} took {result.latency_ms:.3f}ms, "
+                  f"over --max-ms {arguments.max_ms}")
+        sys.exit(1 if slow else 0)
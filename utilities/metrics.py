@@ -0,0 +1,172 @@
+import html
+import math
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile, e.g. percentile(durations, 0.95)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class TestMetrics:
+    """Performance numbers collected while a single test runs"""
+
+    __test__ = False
+
+    def __init__(self, nodeid: str = ""):
+        self.nodeid = nodeid
+        self.waits = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.stale_refetches = 0
+        self.commands = []
+        self.requests = 0
+        self.blocked_requests = {}
+        self.network_bytes = 0
+        self.page_classes = set()
+        self.locators = set()
+        # Time the lazy driver fixture spent acquiring a browser session for this test
+        self.driver_start_seconds = 0.0
+
+    def record_wait(self, description: str, seconds: float, timed_out: bool):
+        self.waits.append({"wait": description, "seconds": seconds, "timed_out": timed_out})
+
+    def record_command(self, command: str, seconds: float, issuer: str):
+        self.commands.append({"command": command, "seconds": seconds, "issuer": issuer})
+
+    def command_durations(self) -> dict:
+        durations = {}
+        for command in self.commands:
+            durations.setdefault(command["command"], []).append(command["seconds"])
+        return durations
+
+    def command_stats(self) -> dict:
+        return {
+            command: {
+                "count": len(samples),
+                "p50": percentile(samples, 0.5),
+                "p95": percentile(samples, 0.95),
+                "total": sum(samples),
+            }
+            for command, samples in self.command_durations().items()
+        }
+
+    def slowest_commands(self, count: int = 5) -> list:
+        return sorted(self.commands, key=lambda command: command["seconds"], reverse=True)[:count]
+
+    def record_request(self, host: str, size: int, blocked: bool):
+        self.requests += 1
+        self.network_bytes += size
+        if blocked:
+            self.blocked_requests[host] = self.blocked_requests.get(host, 0) + 1
+
+    def record_cache(self, hit: bool):
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    def record_driver_start(self, seconds: float):
+        self.driver_start_seconds += seconds
+
+    def record_stale(self):
+        self.stale_refetches += 1
+
+    def record_page(self, class_names):
+        self.page_classes.update(class_names)
+
+    def record_locator(self, locator: tuple):
+        self.locators.add(tuple(locator))
+
+    @property
+    def cache_hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    @property
+    def wait_seconds(self) -> float:
+        return sum(wait["seconds"] for wait in self.waits)
+
+    def slowest_waits(self, count: int = 3) -> list:
+        return sorted(self.waits, key=lambda wait: wait["seconds"], reverse=True)[:count]
+
+    def to_properties(self) -> list:
+        """(name, value) pairs for report.user_properties, which xdist ships back to the controller"""
+        return [
+            ("wait_count", len(self.waits)),
+            ("wait_seconds", round(self.wait_seconds, 4)),
+            ("slowest_waits", self.slowest_waits()),
+            ("cache_hits", self.cache_hits),
+            ("cache_misses", self.cache_misses),
+            ("cache_hit_rate", round(self.cache_hit_rate, 3)),
+            ("stale_refetches", self.stale_refetches),
+            ("roundtrips", len(self.commands)),
+            ("command_durations", self.command_durations()),
+            ("slowest_commands", self.slowest_commands()),
+            ("network_requests", self.requests),
+            ("network_bytes", self.network_bytes),
+            ("blocked_requests", self.blocked_requests),
+            ("page_objects", {
+                "classes": sorted(self.page_classes),
+                "locators": sorted(list(locator) for locator in self.locators),
+            }),
+        ]
+
+    def to_html(self) -> str:
+        rows = "".join(
+            f"<tr><td>{html.escape(wait['wait'])}</td><td>{wait['seconds']:.3f}s</td>"
+            f"<td>{'timed out' if wait['timed_out'] else ''}</td></tr>"
+            for wait in self.slowest_waits()
+        )
+        commands = ""
+        if self.commands:
+            command_rows = "".join(
+                f"<tr><td>{html.escape(command)}</td><td>{stats['count']}</td>"
+                f"<td>{stats['p50'] * 1000:.1f}ms</td><td>{stats['p95'] * 1000:.1f}ms</td></tr>"
+                for command, stats in sorted(self.command_stats().items(), key=lambda item: -item[1]["total"])
+            )
+            slow_rows = "".join(
+                f"<tr><td>{html.escape(command['command'])}</td><td>{html.escape(command['issuer'])}</td>"
+                f"<td>{command['seconds'] * 1000:.1f}ms</td></tr>"
+                for command in self.slowest_commands()
+            )
+            commands = (
+                f"<p>WebDriver round trips: {len(self.commands)}</p>"
+                f"<table><tr><th>command</th><th>count</th><th>p50</th><th>p95</th></tr>{command_rows}</table>"
+                f"<p>Slowest calls</p><table>{slow_rows}</table>"
+            )
+        network = ""
+        if self.requests:
+            blocked = ", ".join(f"{html.escape(host)} x{count}" for host, count in sorted(self.blocked_requests.items()))
+            network = (
+                f"<p>Network: {self.requests} requests, {self.network_bytes / 1024:.1f} KiB transferred, "
+                f"{sum(self.blocked_requests.values())} blocked{': ' + blocked if blocked else ''}</p>"
+            )
+        return (
+            f"<div><p>Waits: {len(self.waits)}, total {self.wait_seconds:.3f}s</p>"
+            f"<p>Element cache: {self.cache_hits} hits, {self.cache_misses} misses "
+            f"({self.cache_hit_rate:.0%}), {self.stale_refetches} stale refetches</p>"
+            f"<table>{rows}</table>{network}{commands}</div>"
+        )
+
+
+_current = TestMetrics()
+
+
+def current() -> TestMetrics:
+    """Metrics of the test that is running now (a throwaway instance outside of tests)"""
+    return _current
+
+
+def start(nodeid: str) -> TestMetrics:
+    global _current
+    _current = TestMetrics(nodeid)
+    return _current
+
+
+def stop() -> TestMetrics:
+    global _current
+    finished, _current = _current, TestMetrics()
+    return finished
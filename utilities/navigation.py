@@ -0,0 +1,45 @@
+import weakref
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Commands after which a handle found earlier may belong to another document, window or frame
+NAVIGATION_COMMANDS = frozenset({
+    Command.GET, Command.GO_BACK, Command.GO_FORWARD, Command.REFRESH, Command.NEW_WINDOW,
+    Command.SWITCH_TO_WINDOW, Command.CLOSE, Command.SWITCH_TO_FRAME, Command.SWITCH_TO_PARENT_FRAME,
+})
+
+# Bumped whenever a driver navigates; element handles cached in an older epoch are not reused
+_epochs = weakref.WeakKeyDictionary()
+_watched = weakref.WeakSet()
+
+
+def epoch(driver: WebDriver) -> int:
+    return _epochs.get(driver, 0)
+
+
+def navigated(driver: WebDriver):
+    """Start a new epoch, for navigation the driver cannot see such as a click on a link"""
+    _epochs[driver] = epoch(driver) + 1
+
+
+def watch(driver: WebDriver) -> WebDriver:
+    """Start a new epoch on every navigating command the driver sends, whoever sends it
+
+    Like command_timing.instrument this wraps driver.execute, so a driver.get(), back()
+    or window switch made outside the page objects is seen as well.
+    """
+    if driver in _watched:
+        return driver
+    execute = driver.execute
+
+    def watched_execute(driver_command, params=None):
+        try:
+            return execute(driver_command, params)
+        finally:
+            if driver_command in NAVIGATION_COMMANDS:
+                navigated(driver)
+
+    driver.execute = watched_execute
+    _watched.add(driver)
+    return driver
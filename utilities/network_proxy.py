@@ -0,0 +1,205 @@
+import http.client
+import select
+import socket
+import threading
+import time
+from fnmatch import fnmatch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from utilities import metrics
+
+_CHUNK_SIZE = 64 * 1024
+_HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "proxy-authorization", "te", "trailer", "upgrade"}
+
+
+class ThrottleProfile:
+    """Simulated network conditions: added latency per request and a download bandwidth cap"""
+
+    def __init__(self, name: str, latency_ms: int = 0, download_kbps: int = 0):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.download_kbps = download_kbps
+
+    def delay(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def pace(self, size: int):
+        if self.download_kbps:
+            time.sleep(size * 8 / (self.download_kbps * 1000))
+
+
+class NetworkPolicy:
+    """Which requests the browser may make
+
+    Patterns are fnmatch globs matched against the host (``*.github.com``) or, for
+    plain http requests, the full url. With an allowlist only matching hosts pass;
+    the blocklist is applied on top of it.
+    """
+
+    def __init__(self, name: str, block=(), allow=(), throttle: ThrottleProfile = None):
+        self.name = name
+        self.block = list(block)
+        self.allow = list(allow)
+        self.throttle = throttle
+
+    def allows(self, host: str, url: str = None) -> bool:
+        def matches(patterns):
+            return any(fnmatch(host, pattern) or (url and fnmatch(url, pattern)) for pattern in patterns)
+
+        if self.allow and not matches(self.allow):
+            return False
+        return not matches(self.block)
+
+
+class FilteringProxy:
+    """Local HTTP(S) proxy that enforces a NetworkPolicy and applies its throttle profile
+
+    HTTPS is tunnelled with CONNECT, so only the host is known for those requests.
+    Every request is recorded on the running test's metrics.
+    """
+
+    def __init__(self, policy: NetworkPolicy, port: int = 0):
+        self.policy = policy
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> "FilteringProxy":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_CONNECT(self):
+                proxy._tunnel(self)
+
+            def do_GET(self):
+                proxy._forward(self)
+
+            do_POST = do_PUT = do_DELETE = do_HEAD = do_OPTIONS = do_PATCH = do_GET
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _tunnel(self, request: BaseHTTPRequestHandler):
+        host, _, port = request.path.rpartition(":")
+        if not self.policy.allows(host):
+            metrics.current().record_request(host, 0, blocked=True)
+            request.send_error(403, "Blocked by network policy")
+            return
+
+        throttle = self.policy.throttle
+        if throttle:
+            throttle.delay()
+        try:
+            upstream = socket.create_connection((host, int(port)), timeout=30)
+        except OSError:
+            request.send_error(502, "Upstream unreachable")
+            return
+        request.send_response(200, "Connection Established")
+        request.end_headers()
+
+        transferred = 0
+        client = request.connection
+        sockets = [client, upstream]
+        try:
+            while True:
+                readable, _, errored = select.select(sockets, [], sockets, 30)
+                if errored or not readable:
+                    break
+                for source in readable:
+                    data = source.recv(_CHUNK_SIZE)
+                    if not data:
+                        return
+                    if source is upstream and throttle:
+                        throttle.pace(len(data))
+                    (client if source is upstream else upstream).sendall(data)
+                    transferred += len(data)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+            metrics.current().record_request(host, transferred, blocked=False)
+
+    def _forward(self, request: BaseHTTPRequestHandler):
+        url = urlsplit(request.path)
+        host = url.hostname or ""
+        if not self.policy.allows(host, request.path):
+            metrics.current().record_request(host, 0, blocked=True)
+            request.send_response(204)
+            request.send_header("Content-Length", "0")
+            request.end_headers()
+            return
+
+        throttle = self.policy.throttle
+        if throttle:
+            throttle.delay()
+        length = int(request.headers.get("Content-Length", 0))
+        body = request.rfile.read(length) if length else None
+        headers = {name: value for name, value in request.headers.items() if name.lower() not in _HOP_BY_HOP_HEADERS}
+        path = url.path or "/"
+        if url.query:
+            path += "?" + url.query
+        connection = http.client.HTTPConnection(host, url.port or 80, timeout=30)
+        try:
+            connection.request(request.command, path, body=body, headers=headers)
+            response = connection.getresponse()
+        except OSError:
+            request.send_error(502, "Upstream unreachable")
+            return
+
+        transferred = 0
+        try:
+            request.send_response(response.status, response.reason)
+            for name, value in response.getheaders():
+                if name.lower() not in _HOP_BY_HOP_HEADERS and name.lower() != "transfer-encoding":
+                    request.send_header(name, value)
+            request.send_header("Connection", "close")
+            request.end_headers()
+            while True:
+                data = response.read(_CHUNK_SIZE)
+                if not data:
+                    break
+                if throttle:
+                    throttle.pace(len(data))
+                request.wfile.write(data)
+                transferred += len(data)
+        except OSError:
+            pass
+        finally:
+            connection.close()
+            metrics.current().record_request(host, transferred, blocked=False)
+
+
+def load_policy(name: str, config: dict, base_url: str, throttle_name: str = None) -> NetworkPolicy:
+    """Build a policy from config/config.json; "$BASE_HOST" in a pattern is the host of --base-url"""
+    policies = config.get("network_policies", {})
+    if name not in policies:
+        raise ValueError(f"Unknown network policy {name}, available: {', '.join(sorted(policies))}")
+    base_host = urlsplit(base_url).hostname or ""
+
+    def expand(patterns):
+        return [pattern.replace("$BASE_HOST", base_host) for pattern in patterns]
+
+    throttle = None
+    if throttle_name:
+        profiles = config.get("throttle_profiles", {})
+        if throttle_name not in profiles:
+            raise ValueError(f"Unknown throttle profile {throttle_name}, available: {', '.join(sorted(profiles))}")
+        throttle = ThrottleProfile(throttle_name, **profiles[throttle_name])
+    settings = policies[name]
+    return NetworkPolicy(name, expand(settings.get("block", [])), expand(settings.get("allow", [])), throttle)
@@ -0,0 +1,188 @@
+import json
+import math
+import os
+import re
+from time import perf_counter
+
+import pytest
+from _pytest.runner import runtestprotocol
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    InvalidSessionIdException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from urllib3.exceptions import HTTPError as TransportError
+
+# Set on a test whose session must be quit instead of reset when the driver fixture releases it
+RECYCLE_SESSION = pytest.StashKey[bool]()
+
+# Timing and session errors that say nothing about the page under test
+_TRANSIENT_ERRORS = (
+    TimeoutException,
+    StaleElementReferenceException,
+    NoSuchWindowException,
+    ElementClickInterceptedException,
+    InvalidSessionIdException,
+    TransportError,
+    ConnectionError,
+)
+# Messages of plain WebDriverExceptions raised when the browser or its driver went away
+_TRANSPORT_MESSAGES = re.compile(
+    r"disconnected|not reachable|session deleted|no such session|connection refused|browsing context has been discarded",
+    re.IGNORECASE,
+)
+# Page object methods whose IndexError means a window handle was not there yet
+_WINDOW_RACES = {"_switch_tab"}
+
+
+def _page_object_frame(traceback) -> str | None:
+    """Class.method of the innermost page object frame of a traceback"""
+    frame = None
+    for entry in traceback:
+        if f"{os.sep}page_objects{os.sep}" in str(entry.path):
+            instance = entry.frame.f_locals.get("self")
+            frame = f"{type(instance).__name__}.{entry.name}" if instance is not None else entry.name
+    return frame
+
+
+def classify_failure(excinfo) -> str | None:
+    """Why a failure is transient, e.g. "TimeoutException in FileUploadPage.click_upload_button", None when it is real
+
+    Assertions are always real failures, even when a timeout led to them.
+    """
+    if excinfo is None or excinfo.errisinstance(AssertionError):
+        return None
+    error = excinfo.value
+    where = _page_object_frame(excinfo.traceback)
+    transient = isinstance(error, _TRANSIENT_ERRORS) or (
+        type(error) is WebDriverException and _TRANSPORT_MESSAGES.search(error.msg or "")
+    ) or (
+        isinstance(error, IndexError) and any(entry.name in _WINDOW_RACES for entry in excinfo.traceback)
+    )
+    if not transient:
+        return None
+    return f"{type(error).__name__} in {where}" if where else type(error).__name__
+
+
+class FlakeHistory:
+    """How often each test ran and how often it only passed on a rerun, over earlier runs"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tests = {}
+        if os.path.exists(path):
+            with open(path) as history_file:
+                self.tests = json.load(history_file)
+
+    def record(self, nodeid: str, retried: bool, flaky: bool):
+        entry = self.tests.setdefault(nodeid, {"runs": 0, "retried": 0, "flaky": 0})
+        entry["runs"] += 1
+        entry["retried"] += retried
+        entry["flaky"] += flaky
+
+    def flake_rate(self, nodeid: str) -> float:
+        entry = self.tests.get(nodeid)
+        return entry["flaky"] / entry["runs"] if entry and entry["runs"] else 0.0
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as history_file:
+            json.dump(self.tests, history_file, indent=2, sort_keys=True)
+
+
+class TransientReruns:
+    """Reruns tests that failed on a transient WebDriver error, right away and on a new session
+
+    A test gets up to ``reruns`` extra attempts, and the run as a whole ``budget``
+    of them (split evenly over the xdist workers). Failed attempts are reported
+    with the outcome "rerun". The controller keeps a flake history per test and
+    reports the tests that were rerun and the time the reruns took.
+    """
+
+    def __init__(self, config, reruns: int, budget: int, history: FlakeHistory):
+        self.reruns = reruns
+        workers = config.workerinput.get("workercount", 1) if hasattr(config, "workerinput") else 1
+        self.budget = math.ceil(budget / workers)
+        self.history = history
+        self.results = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.failed and call.excinfo is not None:
+            report.transient = classify_failure(call.excinfo)
+            if report.transient:
+                # The session may be what broke, the driver fixture quits it instead of resetting it
+                item.stash[RECYCLE_SESSION] = True
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if not self.reruns:
+            return None
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        causes, retry_seconds = [], 0.0
+        while True:
+            item.stash[RECYCLE_SESSION] = False
+            started = perf_counter()
+            reports = runtestprotocol(item, nextitem=nextitem, log=False)
+            failed = [report for report in reports if report.failed]
+            # Rerun only when everything that failed failed transiently
+            transient = failed and all(getattr(report, "transient", None) for report in failed)
+            cause = failed[0].transient if transient else None
+            if causes:
+                retry_seconds += perf_counter() - started
+            if cause is None or len(causes) >= self.reruns or self.budget <= 0:
+                break
+            self.budget -= 1
+            causes.append(cause)
+            for report in failed:
+                report.outcome = "rerun"
+                item.ihook.pytest_runtest_logreport(report=report)
+
+        if causes:
+            deciding = failed[0] if failed else next((report for report in reports if report.when == "call"), reports[0])
+            deciding.user_properties.append(("reruns", {
+                "attempts": len(causes) + 1, "causes": causes, "retry_seconds": round(retry_seconds, 3),
+            }))
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    @staticmethod
+    def pytest_report_teststatus(report):
+        if report.outcome == "rerun":
+            return "rerun", "R", ("RERUN", {"yellow": True})
+        return None
+
+    def pytest_runtest_logreport(self, report):
+        if report.outcome == "rerun" or not (report.when == "call" or (report.when == "setup" and not report.passed)):
+            return
+        reruns = dict(report.user_properties).get("reruns")
+        self.history.record(report.nodeid, retried=reruns is not None, flaky=reruns is not None and report.passed)
+        if reruns is not None:
+            self.results[report.nodeid] = dict(reruns, outcome=report.outcome)
+
+    def pytest_sessionfinish(self, session):
+        if not hasattr(session.config, "workerinput"):
+            self.history.save()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        terminalreporter.section("reruns")
+        for nodeid, result in sorted(self.results.items(), key=lambda item: -item[1]["retry_seconds"]):
+            verdict = "flaky, passed on rerun" if result["outcome"] == "passed" else "failed on every attempt"
+            terminalreporter.write_line(
+                f"{nodeid} {verdict} after {result['attempts']} attempts, {result['retry_seconds']:.2f}s rerunning, "
+                f"flake rate {self.history.flake_rate(nodeid):.0%} ({'; '.join(result['causes'])})"
+            )
+        flaky = sum(result["outcome"] == "passed" for result in self.results.values())
+        terminalreporter.write_line(
+            f"{len(self.results)} tests rerun, {flaky} flaky, "
+            f"{sum(result['retry_seconds'] for result in self.results.values()):.2f}s spent on reruns"
+        )
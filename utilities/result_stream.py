@@ -0,0 +1,325 @@
+import argparse
+import functools
+import glob
+import http.server
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_STREAM = os.path.join("reports", "results.jsonl")
+
+# Self-contained viewer written next to the stream. It polls the stream while the
+# run is going (no "summary" record yet) and filters and pages through the tests.
+VIEWER_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Test results</title>
+<style>
+body { font-family: Helvetica, Arial, sans-serif; font-size: 13px; margin: 16px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #e6e6e6; padding: 4px 6px; text-align: left; vertical-align: top; }
+tr.failed td.outcome, tr.error td.outcome { color: #c00; font-weight: bold; }
+tr.passed td.outcome { color: #080; }
+tr.skipped td.outcome { color: #a60; }
+pre { margin: 4px 0 0; max-height: 300px; overflow: auto; white-space: pre-wrap; }
+#controls > * { margin-right: 8px; }
+</style>
+</head>
+<body>
+<h1>Test results</h1>
+<p id="status">Loading __STREAM__ ...</p>
+<div id="controls">
+  <select id="outcome">
+    <option value="">all outcomes</option><option>failed</option><option>error</option>
+    <option>passed</option><option>skipped</option>
+  </select>
+  <input id="search" placeholder="filter by test id" size="40">
+  <button id="previous">&lt;</button><span id="page"></span><button id="next">&gt;</button>
+  <input type="file" id="file" accept=".jsonl" title="open a stream from disk (file:// pages cannot fetch it)">
+</div>
+<table>
+  <thead><tr><th>test</th><th>outcome</th><th>duration</th><th>worker</th><th>details</th></tr></thead>
+  <tbody id="rows"></tbody>
+</table>
+<script>
+var STREAM = "__STREAM__", PAGE_SIZE = 200;
+var tests = {}, order = [], session = null, summary = null, consumed = 0, page = 0;
+
+function outcomeOf(record) {
+  return record.when !== "call" && record.outcome === "failed" ? "error" : record.outcome;
+}
+
+function ingest(text) {
+  // Only complete lines; a line that is still being written is read on the next poll
+  var end = text.lastIndexOf("\\n") + 1;
+  text.substring(consumed, end).split("\\n").forEach(function (line) {
+    if (!line) { return; }
+    var record = JSON.parse(line);
+    if (record.type === "session") { session = record; }
+    else if (record.type === "summary") { summary = record; }
+    else if (record.type === "test") {
+      if (!(record.nodeid in tests)) { order.push(record.nodeid); tests[record.nodeid] = record; }
+      else if (record.when === "call" || record.outcome !== "passed") { tests[record.nodeid] = record; }
+    }
+  });
+  consumed = end;
+  render();
+}
+
+function escapeHtml(text) {
+  return String(text).replace(/[&<>"]/g, function (c) { return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]; });
+}
+
+function details(record) {
+  var parts = [];
+  Object.keys(record.artifacts || {}).forEach(function (name) {
+    parts.push('<a href="' + escapeHtml(record.artifacts[name]) + '">' + name + "</a>");
+  });
+  if (record.longrepr) { parts.push("<pre>" + escapeHtml(record.longrepr) + "</pre>"); }
+  return parts.join(" ");
+}
+
+function render() {
+  var outcome = document.getElementById("outcome").value;
+  var search = document.getElementById("search").value.toLowerCase();
+  var shown = order.map(function (nodeid) { return tests[nodeid]; }).filter(function (record) {
+    return (!outcome || outcomeOf(record) === outcome) && record.nodeid.toLowerCase().indexOf(search) !== -1;
+  });
+  var pages = Math.max(1, Math.ceil(shown.length / PAGE_SIZE));
+  page = Math.min(page, pages - 1);
+  document.getElementById("page").textContent = " page " + (page + 1) + " of " + pages + " ";
+  document.getElementById("rows").innerHTML = shown.slice(page * PAGE_SIZE, (page + 1) * PAGE_SIZE).map(function (record) {
+    return '<tr class="' + outcomeOf(record) + '"><td>' + escapeHtml(record.nodeid) + '</td><td class="outcome">'
+      + outcomeOf(record) + "</td><td>" + record.duration.toFixed(2) + "s</td><td>" + escapeHtml(record.worker)
+      + "</td><td>" + details(record) + "</td></tr>";
+  }).join("");
+  var counts = {};
+  order.forEach(function (nodeid) { var o = outcomeOf(tests[nodeid]); counts[o] = (counts[o] || 0) + 1; });
+  document.getElementById("status").textContent = (summary ? "Finished" : "Running") + (session ? " (started " + session.started + ")" : "")
+    + ": " + order.length + " tests, " + Object.keys(counts).map(function (o) { return counts[o] + " " + o; }).join(", ")
+    + (shown.length !== order.length ? ", " + shown.length + " shown" : "");
+}
+
+function poll() {
+  fetch(STREAM, {cache: "no-store"}).then(function (response) { return response.text(); }).then(function (text) {
+    if (text.length < consumed) { tests = {}; order = []; consumed = 0; summary = null; }
+    ingest(text);
+    if (!summary) { setTimeout(poll, 2000); }
+  }).catch(function () {
+    document.getElementById("status").textContent = "Cannot fetch " + STREAM + ", serve this directory "
+      + "(python -m utilities.result_stream serve) or open the stream with the file input";
+  });
+}
+
+document.getElementById("outcome").onchange = function () { page = 0; render(); };
+document.getElementById("search").oninput = function () { page = 0; render(); };
+document.getElementById("previous").onclick = function () { page = Math.max(0, page - 1); render(); };
+document.getElementById("next").onclick = function () { page += 1; render(); };
+document.getElementById("file").onchange = function (event) {
+  event.target.files[0].text().then(function (text) { tests = {}; order = []; consumed = 0; ingest(text); });
+};
+poll();
+</script>
+</body>
+</html>
+"""
+
+
+def report_record(report, worker: str, link_root: str) -> dict:
+    """Stream record of a test report, failure details only for failures and artifact links relative to link_root"""
+    properties = dict(report.user_properties)
+    record = {
+        "type": "test",
+        "nodeid": report.nodeid,
+        "when": report.when,
+        "outcome": report.outcome,
+        "duration": report.duration,
+        "start": getattr(report, "start", None),
+        "worker": worker,
+        "properties": properties,
+    }
+    if "failure_artifacts" in properties:
+        record["artifacts"] = {
+            name: os.path.relpath(path, link_root) for name, path in properties["failure_artifacts"]["files"].items()
+        }
+    if report.failed:
+        record["longrepr"] = str(report.longrepr)
+    elif report.skipped and isinstance(report.longrepr, tuple):
+        record["longrepr"] = report.longrepr[2]
+    return record
+
+
+class JsonlWriter:
+    """Appends records to a JSON lines file from a background thread
+
+    The file is flushed whenever the queue runs dry, so a crashed run still
+    leaves every record that was written before the crash.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="result-stream", daemon=True)
+        self._thread.start()
+
+    def write(self, record: dict):
+        self._queue.put(record)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                self._file.flush()
+                return
+            self._file.write(json.dumps(record, default=str) + "\n")
+            if self._queue.empty():
+                self._file.flush()
+
+
+def read_records(path: str) -> list:
+    """Records of a stream, ignoring a last line that was cut off by a crash"""
+    records = []
+    with open(path, encoding="utf-8") as stream_file:
+        for line in stream_file:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return records
+
+
+def merge(paths, output: str) -> int:
+    """Merge the streams of several xdist workers into one, tests in the order they started"""
+    sessions, tests, summaries = [], [], []
+    for path in paths:
+        for record in read_records(path):
+            {"session": sessions, "test": tests, "summary": summaries}[record["type"]].append(record)
+    tests.sort(key=lambda record: record.get("start") or 0)
+    merged = []
+    if sessions:
+        merged.append(dict(min(sessions, key=lambda record: record["started"]), workers=len(sessions)))
+    merged.extend(tests)
+    if summaries:
+        outcomes = {}
+        for summary in summaries:
+            for outcome, count in summary["outcomes"].items():
+                outcomes[outcome] = outcomes.get(outcome, 0) + count
+        merged.append({
+            "type": "summary",
+            "outcomes": outcomes,
+            "seconds": max(summary["seconds"] for summary in summaries),
+            "exitstatus": max(summary["exitstatus"] for summary in summaries),
+        })
+    partial = output + ".partial"
+    with open(partial, "w", encoding="utf-8") as output_file:
+        for record in merged:
+            output_file.write(json.dumps(record, default=str) + "\n")
+    os.replace(partial, output)
+    return len(tests)
+
+
+def worker_stream(path: str, worker: str) -> str:
+    """reports/results.jsonl -> reports/results.gw0.jsonl"""
+    stem, extension = os.path.splitext(path)
+    return f"{stem}.{worker}{extension}"
+
+
+def write_viewer(path: str) -> str:
+    """Write the viewer for the stream at path next to it, e.g. reports/results.html"""
+    viewer_path = os.path.splitext(path)[0] + ".html"
+    os.makedirs(os.path.dirname(os.path.abspath(viewer_path)), exist_ok=True)
+    with open(viewer_path, "w", encoding="utf-8") as viewer_file:
+        viewer_file.write(VIEWER_HTML.replace("__STREAM__", os.path.basename(path)))
+    return viewer_path
+
+
+class ResultStream:
+    """Streams every test result to a JSON lines file while the run goes on
+
+    Each process that runs tests writes its own stream (xdist workers add their id
+    to the file name), and the controller merges them into the one at ``path``
+    when the run ends. Reports only pass through a queue on the way, serialising
+    and writing happen on a JsonlWriter thread.
+    """
+
+    def __init__(self, config, path: str):
+        self.path = path
+        self.worker = config.workerinput["workerid"] if hasattr(config, "workerinput") else "main"
+        # An xdist controller runs no tests, it only merges what its workers stream
+        self.merging = not hasattr(config, "workerinput") and config.getoption("dist", "no") != "no"
+        self.started = time.time()
+        self.outcomes = {}
+        self.writer = None
+        if self.merging:
+            for stale in glob.glob(worker_stream(path, "gw*")):
+                os.remove(stale)
+            return
+        self.writer = JsonlWriter(worker_stream(path, self.worker) if self.worker != "main" else path)
+        self.writer.write({
+            "type": "session", "started": datetime.now().isoformat(timespec="seconds"), "worker": self.worker,
+            "args": list(config.invocation_params.args),
+        })
+
+    def pytest_runtest_logreport(self, report):
+        if self.writer is None or (report.passed and report.when != "call"):
+            return
+        outcome = "error" if report.failed and report.when != "call" else report.outcome
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.writer.write(report_record(report, self.worker, os.path.dirname(os.path.abspath(self.path))))
+
+    def pytest_sessionstart(self, session):
+        if self.worker == "main":
+            write_viewer(self.path)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self.writer is not None:
+            self.writer.write({
+                "type": "summary", "outcomes": self.outcomes,
+                "seconds": time.time() - self.started, "exitstatus": int(exitstatus),
+            })
+            self.writer.close()
+        elif self.merging:
+            parts = sorted(glob.glob(worker_stream(self.path, "gw*")))
+            if parts:
+                merge(parts, self.path)
+                for part in parts:
+                    os.remove(part)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.worker == "main":
+            viewer = os.path.splitext(self.path)[0] + ".html"
+            terminalreporter.write_sep("-", f"results streamed to {self.path}, view them with {viewer}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge streamed test results or serve them with their viewer")
+    commands = parser.add_subparsers(dest="command", required=True)
+    merge_parser = commands.add_parser("merge", help="merge the streams of xdist workers (or of several runs)")
+    merge_parser.add_argument("output")
+    merge_parser.add_argument("streams", nargs="+")
+    serve_parser = commands.add_parser("serve", help="serve the viewer, it follows the stream while tests run")
+    serve_parser.add_argument("--stream", default=DEFAULT_STREAM)
+    serve_parser.add_argument("--port", type=int, default=8001)
+    arguments = parser.parse_args()
+
+    if arguments.command == "merge":
+        print(f"Merged {merge(arguments.streams, arguments.output)} results into {arguments.output}")
+        write_viewer(arguments.output)
+    else:
+        viewer = write_viewer(arguments.stream)
+        handler = functools.partial(
+            http.server.SimpleHTTPRequestHandler, directory=os.path.dirname(os.path.abspath(arguments.stream))
+        )
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", arguments.port), handler)
+        print(f"Viewer at http://127.0.0.1:{arguments.port}/{os.path.basename(viewer)}")
+        server.serve_forever()
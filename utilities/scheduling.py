@@ -0,0 +1,228 @@
+import json
+import os
+import re
+import statistics
+import time
+from collections import Counter
+
+import pytest
+from xdist.scheduler import LoadScheduling
+
+# Weight of the latest run when a recorded duration is updated
+_SMOOTHING = 0.5
+# Estimate for tests the history has never seen when it is empty as well
+_DEFAULT_ESTIMATE = 1.0
+
+
+class DurationHistory:
+    """Smoothed per-test durations (setup, call and teardown) of earlier runs"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.durations = {}
+        if os.path.exists(path):
+            with open(path) as history_file:
+                self.durations = json.load(history_file)
+        self._default = statistics.median(self.durations.values()) if self.durations else _DEFAULT_ESTIMATE
+
+    def estimate(self, nodeid: str) -> float:
+        return self.durations.get(nodeid, self._default)
+
+    def record(self, nodeid: str, seconds: float):
+        previous = self.durations.get(nodeid)
+        self.durations[nodeid] = seconds if previous is None else previous + _SMOOTHING * (seconds - previous)
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as history_file:
+            json.dump(self.durations, history_file, indent=2, sort_keys=True)
+
+
+def browser_of(nodeid: str, browsers) -> str:
+    """Browser a test runs on: its browser parameter, or the first (only) --browser value"""
+    params = re.search(r"\[(.*)\]$", nodeid)
+    if params:
+        for param in params.group(1).split("-"):
+            if param in browsers:
+                return param
+    return browsers[0]
+
+
+class LongestFirstScheduling(LoadScheduling):
+    """xdist scheduler that hands out the longest tests first and keeps workers on one browser
+
+    Pending tests are ordered by their estimated duration, so the slow ones start
+    early instead of being the tail of the run (LPT). A worker takes the longest
+    test for the browser it already has a warm session of, and only moves to
+    another browser when its own has no work left. ``limits`` caps how many workers
+    a browser may have at once, a worker that may not take any browser is shut down.
+    """
+
+    def __init__(self, config, log, history: DurationHistory, browsers, limits=None):
+        super().__init__(config, log)
+        self.history = history
+        self.browsers = list(browsers)
+        self.limits = limits or {}
+        self.node2browser = {}
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+        self.pending[:] = range(len(self.collection))
+        self._sort_pending()
+        # One test per worker first, so each worker starts on one of the longest tests
+        for depth in (1, 2):
+            for node in self.nodes:
+                self._fill(node, depth)
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+        self._fill(node, 2)
+        if not self.pending:
+            node.shutdown()
+
+    def mark_test_pending(self, item):
+        self.pending.append(self.collection.index(item))
+        self._sort_pending()
+        for node in self.node2pending:
+            self.check_schedule(node)
+
+    def remove_node(self, node):
+        pending = self.node2pending.pop(node)
+        self.node2browser.pop(node, None)
+        if not pending:
+            return None
+        crashitem = self.collection[pending.pop(0)]
+        self.pending.extend(pending)
+        self._sort_pending()
+        for other in self.node2pending:
+            self.check_schedule(other)
+        return crashitem
+
+    def _fill(self, node, depth: int):
+        if node.shutting_down:
+            return
+        # xdist runs a test only once the next one is known, so a worker holds the running test and one more
+        while self.pending and len(self.node2pending[node]) < depth:
+            index = self._pick(node)
+            if index is None:
+                # Every browser with work left is at its limit, the worker finishes what it has and stops
+                self.node2browser.pop(node, None)
+                node.shutdown()
+                return
+            self.pending.remove(index)
+            self.node2pending[node].append(index)
+            node.send_runtest_some([index])
+
+    def _sort_pending(self):
+        self.pending.sort(key=lambda index: -self.history.estimate(self.collection[index]))
+
+    def _browser(self, index: int) -> str:
+        return browser_of(self.collection[index], self.browsers)
+
+    def _pick(self, node) -> int | None:
+        browser = self.node2browser.get(node)
+        for index in self.pending:
+            if self._browser(index) == browser:
+                return index
+        browser = self._neediest_browser(exclude=node)
+        if browser is None:
+            return None
+        self.node2browser[node] = browser
+        return next(index for index in self.pending if self._browser(index) == browser)
+
+    def _neediest_browser(self, exclude=None) -> str | None:
+        """Browser with the most pending work per worker already running it, None when all are at their limit"""
+        work = Counter()
+        for index in self.pending:
+            work[self._browser(index)] += self.history.estimate(self.collection[index])
+        workers = Counter(browser for node, browser in self.node2browser.items() if node is not exclude)
+        open_browsers = [browser for browser in work if workers[browser] < self.limits.get(browser, len(self.nodes))]
+        if not open_browsers:
+            return None
+        return max(open_browsers, key=lambda browser: work[browser] / (workers[browser] + 1))
+
+
+class WorkerUtilisation:
+    """Records test durations into the history, installs the scheduler and reports how busy each worker was
+
+    A worker's utilisation is the time it spent in tests over the wall time of the
+    run; its idle tail is how long it sat idle at the end while others still ran.
+    """
+
+    def __init__(self, history: DurationHistory, browsers, longest_first: bool, limits=None):
+        self.history = history
+        self.browsers = list(browsers)
+        self.longest_first = longest_first
+        self.limits = limits or {}
+        self.durations = {}
+        self.workers = {}
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if not self.longest_first or config.getvalue("dist") != "load":
+            return None
+        return LongestFirstScheduling(config, log, self.history, self.browsers, self.limits)
+
+    def pytest_runtest_logreport(self, report):
+        node = getattr(report, "node", None)
+        worker = self.workers.setdefault(node.gateway.id if node is not None else "main", {
+            "busy": 0.0, "tests": set(), "first_start": None, "last_finish": None, "browsers": set(),
+        })
+        finished = time.perf_counter()
+        started = finished - report.duration
+        worker["busy"] += report.duration
+        worker["tests"].add(report.nodeid)
+        worker["browsers"].add(browser_of(report.nodeid, self.browsers))
+        worker["first_start"] = min(started, worker["first_start"] or started)
+        worker["last_finish"] = max(finished, worker["last_finish"] or finished)
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        if not self.durations:
+            return
+        for nodeid, seconds in self.durations.items():
+            self.history.record(nodeid, seconds)
+        self.history.save()
+
+    def utilisation(self) -> dict:
+        run_start = min(worker["first_start"] for worker in self.workers.values())
+        run_end = max(worker["last_finish"] for worker in self.workers.values())
+        wall = (run_end - run_start) or 1e-9
+        return {
+            name: {
+                "tests": len(worker["tests"]),
+                "busy": worker["busy"],
+                "utilisation": worker["busy"] / wall,
+                "idle_tail": run_end - worker["last_finish"],
+                "browsers": sorted(worker["browsers"]),
+            }
+            for name, worker in sorted(self.workers.items())
+        }
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if len(self.workers) < 2:
+            return
+        workers = self.utilisation()
+        terminalreporter.section("worker utilisation")
+        for name, worker in workers.items():
+            terminalreporter.write_line(
+                f"{name:<6}{worker['tests']:>4} tests {worker['busy']:>8.2f}s busy {worker['utilisation']:>5.0%} "
+                f"utilised {worker['idle_tail']:>7.2f}s idle tail  {','.join(worker['browsers'])}"
+            )
+        terminalreporter.write_line(
+            f"mean utilisation {statistics.mean(worker['utilisation'] for worker in workers.values()):.0%}, "
+            f"idle tail {sum(worker['idle_tail'] for worker in workers.values()):.2f}s in total"
+        )
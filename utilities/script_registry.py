@@ -0,0 +1,103 @@
+import weakref
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utilities.lazy_driver import unwrap
+
+HELPERS_GLOBAL = "__pageObjectHelpers"
+
+# Small per-call scripts: arguments are [name, args]. They report a missing helper instead of
+# failing so the registry can install the bundle into the current document and call again.
+INVOKE_JS = f"""
+var helpers = window.{HELPERS_GLOBAL};
+if (!helpers || !helpers[arguments[0]]) {{ return {{"__missing__": true}}; }}
+return helpers[arguments[0]].apply(null, arguments[1]);
+"""
+
+INVOKE_ASYNC_JS = f"""
+var done = arguments[arguments.length - 1];
+var helpers = window.{HELPERS_GLOBAL};
+if (!helpers || !helpers[arguments[0]]) {{ done({{"__missing__": true}}); return; }}
+helpers[arguments[0]].apply(null, arguments[1].concat([done]));
+"""
+
+
+class ScriptRegistry:
+    """Named JavaScript helpers that are installed into the page once and then invoked by name
+
+    The helper bundle is pinned per driver session with ``WebDriver.pin_script``. Chromium
+    sessions also get it through ``Page.addScriptToEvaluateOnNewDocument`` so every new
+    document already has it; other browsers get it installed on the first call per document.
+    Either way the helper source is not sent on every call.
+    """
+
+    def __init__(self):
+        self._helpers = {}
+        self._version = 0
+        self._pinned = weakref.WeakKeyDictionary()
+
+    def register(self, name: str, source: str, is_async: bool = False):
+        """Register a helper written as a JavaScript function expression
+
+        Async helpers receive a ``done`` callback as their last argument.
+        """
+        self._helpers[name] = (source.strip(), is_async)
+        self._version += 1
+
+    def call(self, driver: WebDriver, name: str, *args):
+        if name not in self._helpers:
+            raise KeyError(f"No script helper registered as {name}")
+        # Pinned per browser session, not per test's LazyDriver around it
+        driver = unwrap(driver)
+        is_async = self._helpers[name][1]
+        execute = driver.execute_async_script if is_async else driver.execute_script
+        invoke = INVOKE_ASYNC_JS if is_async else INVOKE_JS
+
+        self._pin(driver)
+        result = execute(invoke, name, list(args))
+        if _is_missing(result):
+            driver.execute_script(self._pinned[driver][1])
+            result = execute(invoke, name, list(args))
+        return result
+
+    async def call_async(self, driver, name: str, *args):
+        """call() for an AsyncWebDriver, which sends the bundle instead of pinning it"""
+        if name not in self._helpers:
+            raise KeyError(f"No script helper registered as {name}")
+        is_async = self._helpers[name][1]
+        execute = driver.execute_async_script if is_async else driver.execute_script
+        invoke = INVOKE_ASYNC_JS if is_async else INVOKE_JS
+
+        result = await execute(invoke, name, list(args))
+        if _is_missing(result):
+            await driver.execute_script(self.bundle())
+            result = await execute(invoke, name, list(args))
+        return result
+
+    def bundle(self) -> str:
+        helpers = ",\n".join(f"{name!r}: {source}" for name, (source, _) in self._helpers.items())
+        return f"window.{HELPERS_GLOBAL} = {{\n{helpers}\n}};"
+
+    def _pin(self, driver: WebDriver):
+        """Pin the current bundle for this session, again whenever new helpers were registered"""
+        pinned = self._pinned.get(driver)
+        if pinned is not None and pinned[0] == self._version:
+            return
+        if pinned is not None:
+            driver.unpin(pinned[1])
+            if pinned[2] is not None:
+                driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": pinned[2]})
+        bundle = self.bundle()
+        script_key = driver.pin_script(bundle)
+        identifier = None
+        if hasattr(driver, "execute_cdp_cmd"):
+            identifier = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": bundle})["identifier"]
+        # (helpers version, pinned script key, CDP identifier of the new-document script on Chromium)
+        self._pinned[driver] = (self._version, script_key, identifier)
+
+
+def _is_missing(result) -> bool:
+    return isinstance(result, dict) and result.get("__missing__") is True
+
+
+scripts = ScriptRegistry()
@@ -0,0 +1,488 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from urllib import error as urllib_error, request as urllib_request
+from urllib.parse import urlsplit
+
+from selenium.common import WebDriverException
+from selenium.webdriver.common.options import ArgOptions
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utilities.async_webdriver import DriverService, capabilities, w3c_command
+from utilities.launch_profiles import LaunchProfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Drivers that serve any number of sessions from one process; geckodriver runs one session per process
+_SHARED_SERVICE_BROWSERS = ("chrome", "edge", "fake")
+
+
+class BrokerError(WebDriverException):
+    pass
+
+
+class BrokeredSession:
+    """A browser session the broker started, and the driver it runs on"""
+
+    def __init__(self, browser: str, session_id: str, executor_url: str, capabilities: dict, service=None):
+        self.browser = browser
+        self.session_id = session_id
+        self.executor_url = executor_url
+        self.capabilities = capabilities
+        # Set when the session has a driver process of its own (geckodriver), stopped with the session
+        self.service = service
+
+    def to_dict(self) -> dict:
+        return {
+            "browser": self.browser, "session_id": self.session_id,
+            "executor_url": self.executor_url, "capabilities": self.capabilities,
+        }
+
+
+class SessionLauncher:
+    """Starts, checks and quits sessions straight on the driver binaries resolved for the run
+
+    The fake browser is served by a FakeW3CServer inside the broker, so brokered
+    fake sessions go through the same HTTP path as real ones.
+    """
+
+    def __init__(self, driver_paths: dict, profile: LaunchProfile = None):
+        self.driver_paths = dict(driver_paths)
+        self.profile = profile
+        self._services = {}
+        self._lock = threading.Lock()
+
+    def _service(self, browser: str):
+        """(service, owned by the session)"""
+        if browser not in _SHARED_SERVICE_BROWSERS:
+            return DriverService(self._driver_path(browser)), True
+        with self._lock:
+            if browser not in self._services:
+                if browser == "fake":
+                    from utilities.fake_w3c_server import FakeW3CServer
+                    self._services[browser] = FakeW3CServer().start()
+                else:
+                    self._services[browser] = DriverService(self._driver_path(browser))
+            return self._services[browser], False
+
+    def _driver_path(self, browser: str) -> str:
+        if not self.driver_paths.get(browser):
+            raise BrokerError(f"The broker has no driver binary for {browser}")
+        return self.driver_paths[browser]
+
+    def launch(self, browser: str) -> BrokeredSession:
+        service, owned = self._service(browser)
+        try:
+            value = w3c_command(service.url, "POST", "/session", {
+                "capabilities": {"alwaysMatch": capabilities(browser, self.profile)},
+            })
+        except BaseException:
+            if owned:
+                service.stop()
+            raise
+        return BrokeredSession(
+            browser, value["sessionId"], service.url, value.get("capabilities", {}), service if owned else None
+        )
+
+    @staticmethod
+    def alive(session: BrokeredSession) -> bool:
+        try:
+            w3c_command(session.executor_url, "GET", f"/session/{session.session_id}/window", timeout=10)
+        except (OSError, WebDriverException):
+            return False
+        return True
+
+    @staticmethod
+    def quit(session: BrokeredSession):
+        try:
+            w3c_command(session.executor_url, "DELETE", f"/session/{session.session_id}", timeout=30)
+        except (OSError, WebDriverException):
+            pass
+        finally:
+            if session.service is not None:
+                session.service.stop()
+
+    def close(self):
+        for service in self._services.values():
+            service.stop()
+        self._services.clear()
+
+
+class SessionBroker:
+    """Keeps ``sizes[browser]`` ready sessions per browser and hands them out
+
+    Every checkout starts a launch in the background to top the pool up again. A
+    checkout that finds the pool empty waits for the next session that comes up
+    and counts as a miss; waiting checkouts add to the number being launched, so a
+    burst of workers does not queue behind a small pool. Sessions are checked
+    before they are handed out, and quit for good when a worker discards them.
+    """
+
+    def __init__(self, launcher: SessionLauncher, sizes: dict):
+        self.launcher = launcher
+        self.sizes = dict(sizes)
+        self._condition = threading.Condition()
+        self._ready = {browser: deque() for browser in self.sizes}
+        self._launching = dict.fromkeys(self.sizes, 0)
+        self._waiting = dict.fromkeys(self.sizes, 0)
+        self._errors = {}
+        self._leased = {}
+        self._closed = False
+        self.stats = {browser: {
+            "hits": 0, "misses": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0,
+            "launches": 0, "launch_seconds": 0.0, "failures": 0, "dead": 0,
+        } for browser in self.sizes}
+
+    def start(self) -> "SessionBroker":
+        with self._condition:
+            for browser in self.sizes:
+                self._refill(browser)
+        return self
+
+    def _refill(self, browser: str):
+        """Launch sessions until ready plus launching covers the pool size and every waiting checkout"""
+        wanted = self.sizes[browser] + self._waiting[browser] - len(self._ready[browser]) - self._launching[browser]
+        for _ in range(wanted if not self._closed else 0):
+            self._launching[browser] += 1
+            threading.Thread(target=self._launch, args=(browser,), name=f"broker-{browser}", daemon=True).start()
+
+    def _launch(self, browser: str):
+        started = perf_counter()
+        try:
+            session = self.launcher.launch(browser)
+        except Exception as error:
+            with self._condition:
+                self._launching[browser] -= 1
+                self.stats[browser]["failures"] += 1
+                self._errors[browser] = f"{type(error).__name__}: {error}"
+                self._condition.notify_all()
+            return
+        with self._condition:
+            self._launching[browser] -= 1
+            self.stats[browser]["launches"] += 1
+            self.stats[browser]["launch_seconds"] += perf_counter() - started
+            closed = self._closed
+            if not closed:
+                self._ready[browser].append(session)
+                self._condition.notify_all()
+        if closed:
+            self.launcher.quit(session)
+
+    def checkout(self, browser: str, timeout: float = 120) -> BrokeredSession:
+        if browser not in self.sizes:
+            raise BrokerError(f"The broker keeps no {browser} sessions, only {', '.join(self.sizes)}")
+        started = perf_counter()
+        hit = True
+        while True:
+            session, waited = self._take(browser, started + timeout)
+            hit = hit and not waited
+            if self.launcher.alive(session):
+                break
+            # Died while it sat in the pool, e.g. the browser crashed
+            hit = False
+            with self._condition:
+                self.stats[browser]["dead"] += 1
+            self.launcher.quit(session)
+        waited_seconds = perf_counter() - started
+        with self._condition:
+            stats = self.stats[browser]
+            stats["hits" if hit else "misses"] += 1
+            stats["wait_seconds"] += waited_seconds
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited_seconds)
+            self._leased[session.session_id] = session
+            self._refill(browser)
+        return session
+
+    def _take(self, browser: str, deadline: float) -> tuple:
+        """(next ready session, whether it had to be waited for)"""
+        with self._condition:
+            self._errors.pop(browser, None)
+            self._waiting[browser] += 1
+            waited = False
+            try:
+                while not self._ready[browser]:
+                    waited = True
+                    # A launch for this checkout failed and nothing else is coming up
+                    if self._errors.get(browser) and not self._launching[browser]:
+                        raise BrokerError(f"The broker could not start a {browser} session: {self._errors[browser]}")
+                    self._refill(browser)
+                    remaining = deadline - perf_counter()
+                    if remaining <= 0 or self._closed:
+                        raise BrokerError(f"No {browser} session became ready in time")
+                    self._condition.wait(remaining)
+                return self._ready[browser].popleft(), waited
+            finally:
+                self._waiting[browser] -= 1
+
+    def discard(self, session_id: str):
+        """Quit a session a worker is done with"""
+        with self._condition:
+            session = self._leased.pop(session_id, None)
+        if session is not None:
+            self.launcher.quit(session)
+
+    def snapshot(self) -> dict:
+        """Stats per browser, with the current number of ready, launching and leased sessions"""
+        with self._condition:
+            return {browser: dict(
+                stats,
+                wait_seconds=round(stats["wait_seconds"], 3),
+                max_wait_seconds=round(stats["max_wait_seconds"], 3),
+                launch_seconds=round(stats["launch_seconds"], 3),
+                pool_size=self.sizes[browser],
+                ready=len(self._ready[browser]),
+                launching=self._launching[browser],
+                leased=sum(session.browser == browser for session in self._leased.values()),
+            ) for browser, stats in self.stats.items()}
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            sessions = [session for ready in self._ready.values() for session in ready] + list(self._leased.values())
+            for ready in self._ready.values():
+                ready.clear()
+            self._leased.clear()
+            self._condition.notify_all()
+        for session in sessions:
+            self.launcher.quit(session)
+        self.launcher.close()
+
+
+class BrokerServer:
+    """JSON over HTTP front of a SessionBroker: POST /checkout, /discard and /shutdown, GET /stats"""
+
+    def __init__(self, broker: SessionBroker, port: int = 0):
+        self.broker = broker
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "BrokerServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self.broker.close()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def do_POST(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        length = int(request.headers.get("Content-Length", 0))
+        body = json.loads(request.rfile.read(length)) if length else {}
+        status, value = 200, None
+        try:
+            if request.path == "/stats":
+                value = self.broker.snapshot()
+            elif request.path == "/checkout":
+                value = self.broker.checkout(body["browser"], body.get("timeout", 120)).to_dict()
+            elif request.path == "/discard":
+                self.broker.discard(body["session_id"])
+            elif request.path == "/shutdown":
+                # Answered first, the broker shuts down once the response is out
+                threading.Thread(target=self.stop, daemon=True).start()
+            else:
+                status, value = 404, {"error": f"Unknown broker endpoint {request.path}"}
+        except Exception as error:
+            status, value = 503, {"error": getattr(error, "msg", None) or f"{type(error).__name__}: {error}"}
+        content = json.dumps({"value": value}).encode()
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(content)))
+        request.end_headers()
+        request.wfile.write(content)
+
+
+class BrokerClient:
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+
+    def _call(self, path: str, body=None, timeout: float = 30):
+        data = json.dumps(body).encode() if body is not None else None
+        try:
+            with urllib_request.urlopen(urllib_request.Request(self.url + path, data=data), timeout=timeout) as response:
+                return json.load(response)["value"]
+        except urllib_error.HTTPError as error:
+            raise BrokerError(json.load(error)["value"]["error"]) from None
+        except OSError as error:
+            raise BrokerError(f"The session broker at {self.url} is not reachable: {error}") from None
+
+    def checkout(self, browser: str, timeout: float = 120) -> "BrokeredWebDriver":
+        lease = self._call("/checkout", {"browser": browser, "timeout": timeout}, timeout=timeout + 30)
+        return BrokeredWebDriver(self, lease)
+
+    def discard(self, session_id: str):
+        self._call("/discard", {"session_id": session_id})
+
+    def stats(self) -> dict:
+        return self._call("/stats")
+
+    def shutdown(self):
+        self._call("/shutdown", {})
+
+
+class BrokeredWebDriver(WebDriver):
+    """Remote WebDriver attached to a session the broker already started; quit() hands it back to be quit"""
+
+    def __init__(self, broker: BrokerClient, lease: dict):
+        self._broker = broker
+        self._lease = lease
+        super().__init__(command_executor=lease["executor_url"], options=ArgOptions())
+        # A broker on this machine runs its drivers here too, files are typed as local paths
+        self._is_remote = urlsplit(lease["executor_url"]).hostname not in ("127.0.0.1", "localhost")
+
+    def start_session(self, capabilities: dict) -> None:
+        self.session_id = self._lease["session_id"]
+        self.caps = self._lease["capabilities"]
+
+    def quit(self) -> None:
+        try:
+            self._broker.discard(self.session_id)
+        finally:
+            self.command_executor.close()
+
+
+class BrokerProcess:
+    """A broker started for one test run (--broker-sessions), shut down when pytest exits"""
+
+    def __init__(self, sizes: dict, driver_paths: dict, profile_name: str = None):
+        command = [sys.executable, "-m", "utilities.session_broker", "serve", "--port", "0", "--exit-with-parent"]
+        command += [argument for browser, size in sizes.items() for argument in ("--pool", f"{browser}={size}")]
+        command += [argument for browser, path in driver_paths.items() for argument in ("--driver", f"{browser}={path}")]
+        if profile_name:
+            command += ["--launch-profile", profile_name]
+        self.process = subprocess.Popen(command, cwd=PROJECT_ROOT, stdout=subprocess.PIPE, text=True)
+        line = self.process.stdout.readline()
+        self.process.stdout.close()
+        if not line:
+            raise BrokerError(f"The session broker exited with {self.process.wait()} before it was ready")
+        self.url = line.split()[-1]
+
+    def stop(self):
+        try:
+            BrokerClient(self.url).shutdown()
+            self.process.wait(timeout=60)
+        except (BrokerError, subprocess.TimeoutExpired):
+            self.process.terminate()
+            self.process.wait()
+
+    def pytest_unconfigure(self, config):
+        self.stop()
+
+
+class BrokerReport:
+    """Shows the pool hits, misses and checkout waits of the session broker at the end of the run"""
+
+    def __init__(self, url: str):
+        self.client = BrokerClient(url)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.section("session broker")
+        try:
+            stats = self.client.stats()
+        except BrokerError as error:
+            terminalreporter.write_line(str(error.msg), red=True)
+            return
+        for browser, browser_stats in stats.items():
+            for line in summary_lines(browser, browser_stats):
+                terminalreporter.write_line(line)
+
+
+def summary_lines(browser: str, stats: dict) -> list:
+    checkouts = stats["hits"] + stats["misses"]
+    launch_mean = stats["launch_seconds"] / stats["launches"] if stats["launches"] else 0.0
+    lines = [
+        f"{browser}: {checkouts} checkouts, {stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['wait_seconds']:.2f}s waiting (max {stats['max_wait_seconds']:.2f}s), "
+        f"{stats['launches']} sessions launched in {launch_mean:.2f}s on average"
+    ]
+    if stats["hits"] and launch_mean:
+        lines.append(f"{browser}: about {stats['hits'] * launch_mean:.1f}s of browser startup kept out of the tests")
+    if stats["failures"] or stats["dead"]:
+        lines.append(f"{browser}: {stats['failures']} launches failed, {stats['dead']} pooled sessions had died")
+    return lines
+
+
+def _pairs(values) -> dict:
+    pairs = {}
+    for value in values or []:
+        name, _, setting = value.partition("=")
+        if not setting:
+            raise SystemExit(f"Expected browser=value, got {value!r}")
+        pairs[name.strip().lower()] = setting
+    return pairs
+
+
+def _exit_with_parent(server: BrokerServer):
+    """Shut the broker down when the process that started it is gone, e.g. a killed pytest run"""
+    parent = os.getppid()
+    while os.getppid() == parent:
+        time.sleep(1)
+    server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep ready browser sessions that test runs attach to")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subcommands.add_parser("serve", help="Run a broker until it is shut down")
+    serve_parser.add_argument("--port", type=int, default=4445)
+    serve_parser.add_argument("--pool", action="append", required=True,
+                              help="ready sessions to keep for a browser e.g. chrome=2, repeat for more browsers")
+    serve_parser.add_argument("--driver", action="append",
+                              help="driver binary of a browser e.g. chrome=/path/to/chromedriver")
+    serve_parser.add_argument("--launch-profile")
+    serve_parser.add_argument("--exit-with-parent", action="store_true", help=argparse.SUPPRESS)
+    stats_parser = subcommands.add_parser("stats", help="Show the stats of a running broker")
+    stats_parser.add_argument("--url", default="http://127.0.0.1:4445")
+    arguments = parser.parse_args()
+
+    if arguments.command == "stats":
+        for browser, browser_stats in BrokerClient(arguments.url).stats().items():
+            print("\n".join(summary_lines(browser, browser_stats)))
+        sys.exit(0)
+
+    from utilities.launch_profiles import get_profile, load_config
+
+    profile = get_profile(arguments.launch_profile, load_config()) if arguments.launch_profile else None
+    sizes = {browser: int(size) for browser, size in _pairs(arguments.pool).items()}
+    driver_paths = _pairs(arguments.driver)
+    if any(browser not in ("fake", *driver_paths) for browser in sizes):
+        from utilities.driver_resolver import resolve_drivers
+        driver_paths.update({
+            browser: resolved.path
+            for browser, resolved in resolve_drivers([b for b in sizes if b not in ("fake", *driver_paths)]).items()
+        })
+    broker_server = BrokerServer(SessionBroker(SessionLauncher(driver_paths, profile), sizes).start(), arguments.port)
+    if arguments.exit_with_parent:
+        threading.Thread(target=_exit_with_parent, args=(broker_server,), daemon=True).start()
+    print(f"Session broker at {broker_server.url}", flush=True)
+    broker_server.serve_forever()
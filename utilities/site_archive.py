@@ -0,0 +1,298 @@
+import argparse
+import hashlib
+import html
+import io
+import json
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ARCHIVE = os.path.join(PROJECT_ROOT, "test_assets", "site_archive")
+DEFAULT_UPSTREAM = "https://the-internet.herokuapp.com/"
+# Where SiteServer listens, so the browser sees the site on this host whatever the upstream is
+SITE_HOST = "127.0.0.1"
+
+# Headers that describe the upstream connection rather than the content
+_HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "transfer-encoding", "content-encoding", "content-length",
+    "proxy-authenticate", "proxy-authorization", "te", "trailer", "upgrade", "set-cookie",
+}
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Served for GET /upload when the archive has no recording of it, so an empty archive is a local upload endpoint
+_UPLOAD_FORM_PAGE = """<html><head><title>The Internet</title></head><body>
+<div class="example"><h3>File Uploader</h3>
+<form method="POST" enctype="multipart/form-data" action="/upload">
+<input id="file-upload" type="file" name="file"><br>
+<input id="file-submit" class="button" type="submit" value="Upload">
+</form></div>
+</body></html>"""
+
+_UPLOAD_SUCCESS_PAGE = """<html><head><title>The Internet</title></head><body>
+<div class="example"><h3>File Uploaded!</h3>
+<div id="uploaded-files" class="panel text-center">{filename}</div></div>
+</body></html>"""
+
+_UPLOAD_ERROR_PAGE = """<html><head><title>Internal Server Error</title></head><body>
+<h1>Internal Server Error</h1>
+</body></html>"""
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Record redirects as they are instead of following them"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class SiteArchive:
+    """Responses captured from the target site, stored as index.json plus one file per body"""
+
+    def __init__(self, directory: str = DEFAULT_ARCHIVE):
+        self.directory = directory
+        self._index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        self._index = {}
+        if os.path.exists(self._index_path):
+            with open(self._index_path) as index_file:
+                self._index = json.load(index_file)
+
+    @staticmethod
+    def key(method: str, path: str) -> str:
+        return f"{method} {path}"
+
+    def get(self, method: str, path: str):
+        entry = self._index.get(self.key(method, path))
+        if entry is None:
+            return None
+        with open(os.path.join(self.directory, entry["body"]), "rb") as body_file:
+            return entry, body_file.read()
+
+    def put(self, method: str, path: str, status: int, headers: dict, body: bytes, **extra):
+        body_name = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, body_name), "wb") as body_file:
+                body_file.write(body)
+            self._index[self.key(method, path)] = dict(status=status, headers=headers, body=body_name, **extra)
+            with open(self._index_path, "w") as index_file:
+                json.dump(self._index, index_file, indent=4, sort_keys=True)
+
+
+class SiteServer:
+    """Local HTTP server that records the target site into a SiteArchive or replays it back
+
+    In ``record`` mode every request is forwarded to ``upstream`` and the response
+    is stored before it is returned. In ``replay`` mode only the archive is used and
+    the /upload form is answered locally, so no network is needed. Uploads are
+    streamed and discarded rather than read into memory, and the last one is kept
+    in ``last_upload`` for benchmarks.
+    """
+
+    def __init__(self, mode: str, archive: SiteArchive, upstream: str = DEFAULT_UPSTREAM, port: int = 0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported site mode {mode}")
+        self.mode = mode
+        self.archive = archive
+        self.upstream = upstream.rstrip("/")
+        self._server = ThreadingHTTPServer((SITE_HOST, port), self._handler_class())
+        self._thread = None
+        # Most recent replayed upload: {"filename", "bytes", "seconds"}
+        self.last_upload = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "SiteServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site._handle(self, None)
+
+            def do_POST(self):
+                if site.mode == "replay" and self.path.split("?")[0] == "/upload":
+                    # The body is consumed while it is parsed, see _replay_upload
+                    site._handle(self, None)
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                site._handle(self, self.rfile.read(length))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _handle(self, request: BaseHTTPRequestHandler, body):
+        if self.mode == "record":
+            status, headers, content = self._record(request, body)
+        elif request.command == "POST" and request.path.split("?")[0] == "/upload":
+            status, headers, content = self._replay_upload(request)
+        else:
+            status, headers, content = self._replay(request)
+
+        request.send_response(status)
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.send_header("Content-Length", str(len(content)))
+        request.end_headers()
+        request.wfile.write(content)
+
+    def _record(self, request: BaseHTTPRequestHandler, body):
+        upstream_request = urllib.request.Request(self.upstream + request.path, data=body, method=request.command)
+        for name in ("Content-Type", "Accept", "User-Agent"):
+            if request.headers.get(name):
+                upstream_request.add_header(name, request.headers[name])
+        opener = urllib.request.build_opener(_NoRedirect)
+        try:
+            response = opener.open(upstream_request, timeout=30)
+        except urllib.error.HTTPError as error:
+            # 4xx/5xx and unfollowed redirects are still responses worth keeping
+            response = error
+        except urllib.error.URLError as error:
+            print(f"Could not record {request.command} {request.path}: {error.reason}")
+            return 502, {"Content-Type": "text/plain"}, b"Upstream unreachable"
+        content = response.read()
+        headers = {
+            name: _relative_to(self.upstream, value)
+            for name, value in response.headers.items()
+            if name.lower() not in _HOP_BY_HOP_HEADERS
+        }
+        extra = {}
+        if request.command == "POST" and request.path.split("?")[0] == "/upload":
+            extra["upload_filename"] = _uploaded_file(request.headers, io.BytesIO(body or b""), len(body or b""))[0]
+        self.archive.put(request.command, request.path, response.status, headers, content, **extra)
+        return response.status, headers, content
+
+    def _replay(self, request: BaseHTTPRequestHandler):
+        recorded = self.archive.get(request.command, request.path)
+        if recorded is None and request.command == "GET" and request.path.split("?")[0] == "/upload":
+            return 200, {"Content-Type": "text/html"}, _UPLOAD_FORM_PAGE.encode()
+        if recorded is None:
+            print(f"No recorded response for {request.command} {request.path}")
+            return 404, {"Content-Type": "text/plain"}, b"Not recorded"
+        entry, content = recorded
+        return entry["status"], entry["headers"], content
+
+    def _replay_upload(self, request: BaseHTTPRequestHandler):
+        started = time.perf_counter()
+        length = int(request.headers.get("Content-Length", 0))
+        filename, size = _uploaded_file(request.headers, request.rfile, length)
+        self.last_upload = {"filename": filename, "bytes": size, "seconds": time.perf_counter() - started}
+        if not filename:
+            return 500, {"Content-Type": "text/html"}, _UPLOAD_ERROR_PAGE.encode()
+
+        # Reuse the recorded result page when there is one, swapping in the new file name
+        recorded = self.archive.get("POST", "/upload")
+        if recorded is not None and recorded[0].get("upload_filename"):
+            entry, content = recorded
+            content = content.replace(
+                html.escape(entry["upload_filename"]).encode(), html.escape(filename).encode()
+            )
+            return 200, entry["headers"], content
+        return 200, {"Content-Type": "text/html"}, _UPLOAD_SUCCESS_PAGE.format(filename=html.escape(filename)).encode()
+
+
+def _relative_to(upstream: str, value: str) -> str:
+    """Header value with the upstream's urls made root-relative, so redirects replay on whatever port serves them"""
+    if value == upstream:
+        return "/"
+    return value.replace(upstream + "/", "/")
+
+
+def _uploaded_file(headers, stream, length: int) -> tuple:
+    """Name and size of the "file" field of a multipart/form-data body, read from stream in chunks
+
+    The file content is counted and discarded, so uploads of any size take constant memory.
+    Returns ("", 0) when no file was chosen.
+    """
+    boundary = re.search(r'boundary="?([^";]+)"?', headers.get("Content-Type", ""))
+    if "multipart/form-data" not in headers.get("Content-Type", "") or boundary is None or not length:
+        stream.read(length)
+        return "", 0
+
+    # A CRLF is put in front of the body so the first boundary looks like every other delimiter
+    delimiter = b"\r\n--" + boundary.group(1).encode()
+    buffer, remaining = b"\r\n", length
+    filename, size, part_name, part_filename, part_size = "", 0, None, "", 0
+    in_headers = False
+    while True:
+        if remaining:
+            chunk = stream.read(min(remaining, _CHUNK_SIZE))
+            remaining = remaining - len(chunk) if chunk else 0
+            buffer += chunk
+        if in_headers:
+            end = buffer.find(b"\r\n\r\n")
+            if end == -1:
+                if not remaining:
+                    break
+                continue
+            disposition = buffer[:end].decode("utf-8", "replace")
+            name = re.search(r'\bname="([^"]*)"', disposition)
+            file_name = re.search(r'\bfilename="([^"]*)"', disposition)
+            part_name = name.group(1) if name else None
+            part_filename = os.path.basename(file_name.group(1)) if file_name else ""
+            part_size, in_headers = 0, False
+            buffer = buffer[end + 4:]
+            continue
+        found = buffer.find(delimiter)
+        if found == -1:
+            # Keep enough of the tail to find a delimiter that straddles two chunks
+            keep = len(delimiter) + 1
+            part_size += max(len(buffer) - keep, 0)
+            buffer = buffer[-keep:]
+            if not remaining:
+                break
+            continue
+        part_size += found
+        if part_name == "file" and part_filename:
+            filename, size = part_filename, part_size
+        buffer = buffer[found + len(delimiter):]
+        while len(buffer) < 2 and remaining:
+            chunk = stream.read(min(remaining, _CHUNK_SIZE))
+            remaining = remaining - len(chunk) if chunk else 0
+            buffer += chunk
+        if buffer.startswith(b"--"):
+            break
+        buffer = buffer[2:]
+        part_name, in_headers = None, True
+    # Drain whatever follows the closing delimiter so the connection can be reused
+    while remaining:
+        chunk = stream.read(min(remaining, _CHUNK_SIZE))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+    return filename, size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record or replay the target site locally")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE)
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM)
+    parser.add_argument("--port", type=int, default=8000)
+    arguments = parser.parse_args()
+
+    server = SiteServer(arguments.mode, SiteArchive(arguments.archive), arguments.upstream, arguments.port)
+    print(f"{arguments.mode.capitalize()}ing {arguments.upstream} at {server.base_url}")
+    server.serve_forever()
@@ -0,0 +1,112 @@
+import statistics
+from time import perf_counter
+
+import pytest
+
+from utilities.driver_factory import backend_import_seconds
+from utilities.lazy_driver import LazyDriver
+
+# The driver fixture's LazyDriver, so its start time can go on the teardown report
+LAZY_DRIVER = pytest.StashKey[LazyDriver]()
+
+
+class StartupTiming:
+    """Shows what a run pays before its tests start and which browser startups it never made
+
+    Covers the conftest import, collection (with what -m/-k deselected), the first import of
+    each browser backend, and how many tests took the lazy ``driver`` fixture without ever
+    sending it a command, so the browser was never started for them.
+    """
+
+    def __init__(self, import_seconds: float):
+        # This process first, then every xdist worker as it finishes
+        self.import_seconds = [import_seconds]
+        # (seconds, collected, deselected) for every process that collected
+        self.collections = []
+        self.backend_imports = {}
+        self.start_seconds = []
+        self.unused_drivers = 0
+        self._collection_started = None
+        self._deselected = 0
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection(self, session):
+        self._collection_started = perf_counter()
+
+    def pytest_deselected(self, items):
+        self._deselected += len(items)
+
+    def pytest_collection_finish(self, session):
+        if self._collection_started is not None:
+            seconds = perf_counter() - self._collection_started
+            self.collections.append((seconds, len(session.items) + self._deselected, self._deselected))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        driver = item.stash.get(LAZY_DRIVER, None)
+        if call.when == "teardown" and driver is not None:
+            outcome.get_result().user_properties.append(("driver_start_seconds", driver.start_seconds))
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        properties = dict(report.user_properties)
+        if "driver_start_seconds" not in properties:
+            return
+        if properties["driver_start_seconds"] is None:
+            self.unused_drivers += 1
+        else:
+            self.start_seconds.append(properties["driver_start_seconds"])
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(session.config, "workerinput"):
+            session.config.workeroutput["startup_timing"] = {
+                "import_seconds": self.import_seconds[0],
+                "collections": self.collections,
+                "backend_imports": backend_import_seconds,
+            }
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        timing = getattr(node, "workeroutput", {}).get("startup_timing")
+        if timing is None:
+            return
+        self.import_seconds.append(timing["import_seconds"])
+        self.collections.extend(tuple(collection) for collection in timing["collections"])
+        self._merge_backend_imports(timing["backend_imports"])
+
+    def _merge_backend_imports(self, imports: dict):
+        for browser, seconds in imports.items():
+            self.backend_imports[browser] = max(seconds, self.backend_imports.get(browser, 0.0))
+
+    def summary_lines(self) -> list:
+        own_import, *worker_imports = self.import_seconds
+        lines = [f"conftest imported in {own_import:.3f}s" + (
+            f", {len(worker_imports)} workers took up to {max(worker_imports):.3f}s" if worker_imports else ""
+        )]
+        if self.collections:
+            seconds, collected, deselected = max(self.collections)
+            workers = f" (slowest of {len(self.collections)} workers)" if len(self.collections) > 1 else ""
+            lines.append(f"collected {collected} tests in {seconds:.3f}s{workers}, {deselected} deselected")
+        for browser, seconds in sorted(self.backend_imports.items()):
+            lines.append(f"{browser} backend imported in {seconds:.3f}s on its first launch")
+        asked = len(self.start_seconds) + self.unused_drivers
+        if asked:
+            line = f"{asked} tests took a driver, {len(self.start_seconds)} started it"
+            if self.start_seconds:
+                line += f" (mean {statistics.mean(self.start_seconds):.2f}s to start)"
+            lines.append(line)
+        if self.unused_drivers:
+            avoided = (f", about {self.unused_drivers * statistics.mean(self.start_seconds):.1f}s of startup avoided"
+                       if self.start_seconds else "")
+            lines.append(f"{self.unused_drivers} tests never sent a command, no browser was started for them{avoided}")
+        return lines
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if hasattr(terminalreporter.config, "workerinput"):
+            return
+        self._merge_backend_imports(backend_import_seconds)
+        terminalreporter.section("startup timing")
+        for line in self.summary_lines():
+            terminalreporter.write_line(line)
@@ -0,0 +1,307 @@
+import ast
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+
+from selenium.webdriver.common.by import By
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_DIR = "test_cases"
+PAGE_OBJECT_DIR = "page_objects"
+
+# Changes to these run the whole suite: every test goes through the fixtures and the base page object
+_FULL_SUITE_FILES = {"conftest.py", "pytest.ini", "requirements.txt", f"{PAGE_OBJECT_DIR}/base_page.py"}
+# Changes that cannot affect a test run
+_IGNORED_DIRS = ("reports/",)
+_IGNORED_EXTENSIONS = (".md",)
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class ImpactError(ValueError):
+    pass
+
+
+def _git(*args) -> str:
+    result = subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ImpactError(result.stderr.strip() or f"git {' '.join(args)} failed")
+    return result.stdout
+
+
+def _module_path(module: str) -> str:
+    return module.replace(".", "/") + ".py"
+
+
+def _path_module(path: str) -> str:
+    return path[:-len(".py")].replace("/", ".")
+
+
+def _line_range(start: str, count: str | None) -> set:
+    count = 1 if count is None else int(count)
+    return set(range(int(start), int(start) + count))
+
+
+def changed_lines(ref: str) -> dict:
+    """{path: (old lines, new lines)} of every file that differs from ref, untracked files included
+
+    Either side is None when the whole file counts as changed (new, binary or untracked files).
+    """
+    changes = {path: (None, None) for path in _git("diff", "--name-only", "--no-renames", ref, "--").splitlines()}
+    changes.update({path: (set(), None) for path in _git("ls-files", "--others", "--exclude-standard").splitlines()})
+    path, in_header = None, False
+    for line in _git("diff", "-U0", "--no-color", "--no-renames", ref, "--", "*.py").splitlines():
+        if line.startswith("diff --git "):
+            path, in_header = None, True
+        elif in_header and line.startswith("--- "):
+            path = line[len("--- a/"):] if line != "--- /dev/null" else None
+        elif in_header and line.startswith("+++ "):
+            # Deleted files have no "+++ b/" path, their lines are only on the old side
+            if line != "+++ /dev/null":
+                path = line[len("+++ b/"):]
+            changes[path] = (set(), set())
+        elif path is not None and (hunk := _HUNK.match(line)):
+            in_header = False
+            old_lines, new_lines = changes[path]
+            old_lines.update(_line_range(hunk.group(1), hunk.group(2)))
+            new_lines.update(_line_range(hunk.group(3), hunk.group(4)))
+    return changes
+
+
+def _locator(statement):
+    """(by, value) of a ``name = (By.X, "value")`` class attribute, None for anything else"""
+    if not isinstance(statement, ast.Assign) or not isinstance(statement.value, ast.Tuple):
+        return None
+    elements = statement.value.elts
+    if (len(elements) == 2 and isinstance(elements[0], ast.Attribute) and isinstance(elements[0].value, ast.Name)
+            and elements[0].value.id == "By" and isinstance(elements[1], ast.Constant)
+            and isinstance(elements[1].value, str) and hasattr(By, elements[0].attr)):
+        return getattr(By, elements[0].attr), elements[1].value
+    return None
+
+
+def _spans(node, line: int) -> bool:
+    start = min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+    return start <= line <= node.end_lineno
+
+
+def _symbol_at(tree, line: int) -> tuple:
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and _spans(node, line):
+            for statement in node.body:
+                if _spans(statement, line):
+                    locator = _locator(statement)
+                    return ("locator", node.name, locator) if locator else ("class", node.name)
+            return ("class", node.name)
+    return ("module",)
+
+
+def changed_symbols(source: str | None, lines) -> set:
+    """What the changed lines of a page object module touch
+
+    ("module",) for anything outside a class, ("class", name) for a class and
+    ("locator", class name, (by, value)) for a locator attribute of a class.
+    """
+    if source is None:
+        return set()
+    if lines is None:
+        return {("module",)}
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return {("module",)}
+    return {_symbol_at(tree, line) for line in lines}
+
+
+def _imported_page_modules(source: str) -> set:
+    modules = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module)
+            modules.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return {
+        module for module in modules
+        if module.startswith(f"{PAGE_OBJECT_DIR}.") and os.path.exists(os.path.join(PROJECT_ROOT, _module_path(module)))
+    }
+
+
+class ImpactMap:
+    """Which page object modules, classes and locators every test depends on
+
+    The static half is the page object modules each test module imports, directly
+    or through other page objects, cached per file content hash so only edited
+    files are parsed again. The runtime half is the page classes and locators each
+    test used the last time it ran, as recorded by BasePage.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files = {}
+        self.tests = {}
+        if os.path.exists(path):
+            with open(path) as map_file:
+                stored = json.load(map_file)
+            self.files, self.tests = stored["files"], stored["tests"]
+
+    def imports(self, path: str) -> set:
+        full_path = os.path.join(PROJECT_ROOT, path)
+        if not os.path.exists(full_path):
+            return set()
+        with open(full_path, "rb") as source_file:
+            content = source_file.read()
+        digest = hashlib.sha1(content).hexdigest()
+        entry = self.files.get(path)
+        if entry is None or entry["sha1"] != digest:
+            try:
+                imports = sorted(_imported_page_modules(content.decode()))
+            except SyntaxError:
+                imports = []
+            entry = self.files[path] = {"sha1": digest, "imports": imports}
+        return set(entry["imports"])
+
+    def page_modules(self, path: str) -> set:
+        """Page object modules a file imports, directly or through other page objects"""
+        seen, pending = set(), list(self.imports(path))
+        while pending:
+            module = pending.pop()
+            if module not in seen:
+                seen.add(module)
+                pending.extend(self.imports(_module_path(module)))
+        return seen
+
+    def record(self, nodeid: str, usage: dict, failed: bool):
+        self.tests[nodeid] = {
+            "classes": usage["classes"],
+            "locators": [list(locator) for locator in usage["locators"]],
+            "failed": failed,
+        }
+
+    def save(self):
+        # Refresh the static half for every test module and drop what no longer exists
+        for path in glob.glob(os.path.join(PROJECT_ROOT, TEST_DIR, "test_*.py")):
+            self.page_modules(os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "/"))
+        self.files = {path: entry for path, entry in self.files.items() if os.path.exists(os.path.join(PROJECT_ROOT, path))}
+        self.tests = {
+            nodeid: entry for nodeid, entry in self.tests.items()
+            if os.path.exists(os.path.join(PROJECT_ROOT, nodeid.split("::")[0]))
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w") as map_file:
+            json.dump({"files": self.files, "tests": self.tests}, map_file, indent=2, sort_keys=True)
+
+
+class Changes:
+    """The changes since a git ref, sorted into what they mean for test selection"""
+
+    def __init__(self, ref: str, impact_map: ImpactMap):
+        self.ref = ref
+        self.full_suite = None
+        self.test_files = set()
+        self.page_objects = {}
+        # The page objects conftest.py builds its fixtures on (the router) are behind every test
+        shared = {_module_path(module) for module in impact_map.imports("conftest.py")}
+        for path, (old_lines, new_lines) in sorted(changed_lines(ref).items()):
+            if path.startswith(_IGNORED_DIRS) or path.endswith(_IGNORED_EXTENSIONS):
+                continue
+            if path in _FULL_SUITE_FILES or path in shared or not path.endswith(".py"):
+                self.full_suite = self.full_suite or f"{path} changed"
+            elif path.startswith(f"{TEST_DIR}/"):
+                self.test_files.add(path)
+            elif path.startswith(f"{PAGE_OBJECT_DIR}/"):
+                symbols = changed_symbols(self._source_at_ref(path), old_lines)
+                symbols |= changed_symbols(self._source(path), new_lines)
+                self.page_objects[_path_module(path)] = symbols
+            else:
+                self.full_suite = self.full_suite or f"{path} changed"
+
+    def _source_at_ref(self, path: str) -> str | None:
+        try:
+            return _git("show", f"{self.ref}:{path}")
+        except ImpactError:
+            return None
+
+    @staticmethod
+    def _source(path: str) -> str | None:
+        full_path = os.path.join(PROJECT_ROOT, path)
+        if not os.path.exists(full_path):
+            return None
+        with open(full_path) as source_file:
+            return source_file.read()
+
+    def summary(self) -> str:
+        if self.full_suite:
+            return f"full suite, {self.full_suite}"
+        changed = sorted(self.test_files) + sorted(self.page_objects)
+        return f"changed since {self.ref}: {', '.join(changed) or 'nothing'}"
+
+
+class ImpactTracker:
+    """Records what every test used into the impact map, and with a git ref deselects the tests its changes cannot affect
+
+    A test is kept when its own module changed, when it failed last time, or when
+    it used a changed page class or locator. Tests the map has no runtime record of
+    fall back to the page object modules their module imports.
+    """
+
+    def __init__(self, impact_map: ImpactMap, ref: str | None = None):
+        self.map = impact_map
+        self.changes = Changes(ref, impact_map) if ref else None
+        self.selected = None
+        self.deselected = None
+
+    def is_impacted(self, nodeid: str) -> bool:
+        path = nodeid.split("::")[0]
+        if path in self.changes.test_files:
+            return True
+        recorded = self.map.tests.get(nodeid)
+        if recorded is not None and recorded["failed"]:
+            return True
+        imported = self.map.page_modules(path)
+        for module, symbols in self.changes.page_objects.items():
+            for symbol in symbols:
+                if recorded is None:
+                    if module in imported:
+                        return True
+                elif symbol[0] == "module":
+                    if module in imported or any(name.startswith(f"{module}.") for name in recorded["classes"]):
+                        return True
+                elif f"{module}.{symbol[1]}" in recorded["classes"]:
+                    if symbol[0] == "class" or list(symbol[2]) in recorded["locators"]:
+                        return True
+        return False
+
+    def pytest_collection_modifyitems(self, config, items):
+        if self.changes is None or self.changes.full_suite:
+            return
+        selected, deselected = [], []
+        for item in items:
+            (selected if self.is_impacted(item.nodeid) else deselected).append(item)
+        self.selected, self.deselected = len(selected), len(deselected)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    def pytest_runtest_logreport(self, report):
+        properties = dict(report.user_properties)
+        if report.when == "call" and "page_objects" in properties:
+            self.map.record(report.nodeid, properties["page_objects"], report.failed)
+        elif report.failed and report.nodeid in self.map.tests:
+            self.map.tests[report.nodeid]["failed"] = True
+
+    def pytest_sessionfinish(self, session):
+        if not hasattr(session.config, "workerinput"):
+            self.map.save()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.changes is None:
+            return
+        terminalreporter.section("test impact")
+        terminalreporter.write_line(self.changes.summary())
+        if self.selected is not None:
+            terminalreporter.write_line(
+                f"{self.selected} impacted tests selected, {self.deselected} deselected"
+            )
@@ -0,0 +1,233 @@
+import argparse
+import glob
+import json
+import os
+import threading
+from datetime import datetime
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "reports", "upload_benchmarks")
+
+# Benchmark matrix: file sizes, and file types as (extension, generated content kind)
+SIZES = {
+    "1KB": 1024,
+    "1MB": 1024 ** 2,
+    "10MB": 10 * 1024 ** 2,
+    "100MB": 100 * 1024 ** 2,
+    "1GB": 1024 ** 3,
+}
+FILE_TYPES = {
+    "text": ("txt", "text"),
+    "binary": ("bin", "random"),
+    "sparse": ("img", "sparse"),
+}
+PHASES = ("send_keys", "submit", "render")
+
+
+def generate_asset(registry, size_name: str, file_type: str):
+    """Register (but do not yet write) the generated upload asset of one benchmark case"""
+    extension, content = FILE_TYPES[file_type]
+    return registry.generate(
+        f"upload-{size_name.lower()}-{file_type}.{extension}", SIZES[size_name], content,
+        key=f"upload_{size_name}_{file_type}",
+    )
+
+
+def megabytes_per_second(size: int, seconds: float) -> float:
+    return size / 1_000_000 / seconds if seconds else 0.0
+
+
+def _children_by_parent() -> dict:
+    children = {}
+    for stat_path in glob.glob("/proc/[0-9]*/stat"):
+        try:
+            with open(stat_path) as stat_file:
+                # The command name is in parentheses and may contain spaces, the parent pid follows it
+                fields = stat_file.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        pid = int(stat_path.split("/")[2])
+        children.setdefault(int(fields[1]), []).append(pid)
+    return children
+
+
+def process_tree(pid: int) -> list:
+    """pid and all of its descendants; psutil when installed, /proc otherwise, [] where neither works"""
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            return [pid] + [child.pid for child in process.children(recursive=True)]
+        except psutil.Error:
+            return []
+    if not os.path.isdir("/proc"):
+        return []
+    children = _children_by_parent()
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(children.get(current, []))
+    return tree
+
+
+def process_rss(pid: int) -> int | None:
+    """Resident set size of a process in bytes, None when it cannot be read"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def driver_pid(driver) -> int | None:
+    """Pid of the local driver binary (geckodriver, chromedriver, msedgedriver) of a session"""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return process.pid if process is not None else None
+
+
+class RssSampler:
+    """Polls the RSS of the driver process and of the browser processes it started, keeping the peaks
+
+    Remote and in-process sessions have no local driver process, their peaks stay None.
+    """
+
+    def __init__(self, driver, interval: float = 0.1):
+        self._pid = driver_pid(driver)
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+        self.peaks = {"driver": None, "browser": None}
+
+    def start(self) -> "RssSampler":
+        if self._pid is not None:
+            self._sample()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> dict:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._sample()
+        return self.peaks
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            self._sample()
+
+    def _sample(self):
+        tree = process_tree(self._pid)
+        if not tree:
+            return
+        usage = {"driver": process_rss(self._pid) or 0, "browser": sum(process_rss(pid) or 0 for pid in tree[1:])}
+        for name, value in usage.items():
+            self.peaks[name] = max(self.peaks[name] or 0, value)
+
+
+def load_runs(directory: str = RESULTS_DIR) -> list:
+    """Stored benchmark runs, oldest first"""
+    runs = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path) as run_file:
+            runs.append(json.load(run_file))
+    return runs
+
+
+def _format_bytes(value) -> str:
+    return "-" if value is None else f"{value / 1024 ** 2:.0f}MiB"
+
+
+class UploadBenchmarkReport:
+    """Collects the upload benchmark results on the controller, stores them per run and browser and compares
+    each browser with its last run"""
+
+    def __init__(self, directory: str, browsers, profile: str):
+        self.directory = directory
+        self.browsers = list(browsers)
+        self.profile = profile
+        self.started = datetime.now()
+        self.results = {browser: {} for browser in self.browsers}
+        runs = load_runs(directory)
+        self.previous = {
+            browser: next(
+                (run for run in reversed(runs) if run["browser"] == browser and run["profile"] == profile), None
+            )
+            for browser in self.browsers
+        }
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call" and report.passed:
+            result = dict(report.user_properties).get("upload_benchmark")
+            if result:
+                self.results[result["browser"]][result["case"]] = result
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(session.config, "workerinput"):
+            return
+        for browser, results in self.results.items():
+            if not results:
+                continue
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{self.started:%Y%m%d-%H%M%S}-{browser}.json")
+            with open(path, "w") as run_file:
+                json.dump({
+                    "started": self.started.isoformat(timespec="seconds"),
+                    "browser": browser,
+                    "profile": self.profile,
+                    "results": results,
+                }, run_file, indent=2, sort_keys=True)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        for browser, results in self.results.items():
+            if results:
+                self._write_table(terminalreporter, browser, results)
+
+    def _write_table(self, terminalreporter, browser: str, results: dict):
+        terminalreporter.section(f"upload throughput ({browser})")
+        terminalreporter.write_line(
+            f"{'case':<18}{'MB/s':>9}{'vs last':>9}" + "".join(f"{phase:>11}" for phase in PHASES)
+            + f"{'driver':>9}{'browser':>9}"
+        )
+        last_run = self.previous[browser]
+        previous = last_run["results"] if last_run else {}
+        for case, result in sorted(results.items(), key=lambda item: (item[1]["bytes"], item[0])):
+            before = previous.get(case)
+            change = f"{result['mb_per_s'] / before['mb_per_s'] - 1:+.0%}" if before and before["mb_per_s"] else "-"
+            terminalreporter.write_line(
+                f"{case:<18}{result['mb_per_s']:>9.1f}{change:>9}"
+                + "".join(f"{result['seconds'][phase]:>10.3f}s" for phase in PHASES)
+                + f"{_format_bytes(result['rss']['driver']):>9}{_format_bytes(result['rss']['browser']):>9}"
+            )
+        if last_run:
+            terminalreporter.write_line(f"compared with the run of {last_run['started']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the upload throughput (MB/s) of the stored benchmark runs")
+    parser.add_argument("--directory", default=RESULTS_DIR)
+    parser.add_argument("--runs", type=int, default=5)
+    arguments = parser.parse_args()
+
+    runs = load_runs(arguments.directory)[-arguments.runs:]
+    cases = sorted({case for run in runs for case in run["results"]})
+    print(f"{'case':<18}" + "".join(f"{run['started'][5:16]:>14}" for run in runs))
+    for case in cases:
+        cells = []
+        for run in runs:
+            result = run["results"].get(case)
+            cells.append(f"{result['mb_per_s']:>14.1f}" if result else f"{'-':>14}")
+        print(f"{case:<18}" + "".join(cells))